@@ -0,0 +1,27 @@
+"""add (created_at, id) index to expenses for keyset pagination
+
+Revision ID: j2k3l4m5n6o7
+Revises: i1j2k3l4m5n6
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.core.config import settings
+
+revision: str = 'j2k3l4m5n6o7'
+down_revision: Union[str, Sequence[str], None] = 'i1j2k3l4m5n6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = settings.DATABASE_SCHEMA
+
+
+def upgrade() -> None:
+    op.create_index('ix_expenses_created_at_id', 'expenses', ['created_at', 'id'], unique=False, schema=SCHEMA)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_expenses_created_at_id', table_name='expenses', schema=SCHEMA)
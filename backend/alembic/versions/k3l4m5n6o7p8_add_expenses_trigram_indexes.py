@@ -0,0 +1,39 @@
+"""add pg_trgm GIN indexes for expense search
+
+Revision ID: k3l4m5n6o7p8
+Revises: j2k3l4m5n6o7
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+from app.core.config import settings
+
+revision: str = 'k3l4m5n6o7p8'
+down_revision: Union[str, Sequence[str], None] = 'j2k3l4m5n6o7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = settings.DATABASE_SCHEMA
+
+TRGM_COLUMNS = ('service_name', 'description', 'contracted_plan', 'code')
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # Em public para que word_similarity e o operador <% fiquem no search_path padrão da aplicação
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public"))
+    for column in TRGM_COLUMNS:
+        conn.execute(text(f"""
+            CREATE INDEX IF NOT EXISTS ix_expenses_{column}_trgm
+            ON {SCHEMA}.expenses USING gin ({column} gin_trgm_ops);
+        """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for column in TRGM_COLUMNS:
+        conn.execute(text(f"DROP INDEX IF EXISTS {SCHEMA}.ix_expenses_{column}_trgm"))
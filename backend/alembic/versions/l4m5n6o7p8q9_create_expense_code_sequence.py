@@ -0,0 +1,42 @@
+"""create expense_code_seq for DPnn code allocation
+
+Revision ID: l4m5n6o7p8q9
+Revises: k3l4m5n6o7p8
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+from app.core.config import settings
+
+revision: str = 'l4m5n6o7p8q9'
+down_revision: Union[str, Sequence[str], None] = 'k3l4m5n6o7p8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = settings.DATABASE_SCHEMA
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {SCHEMA}.expense_code_seq START WITH 1"))
+    # Semear a partir do maior código DPnn existente (próximo nextval = máximo + 1)
+    conn.execute(text(f"""
+        SELECT setval(
+            '{SCHEMA}.expense_code_seq',
+            GREATEST(max_number, 1),
+            max_number > 0
+        )
+        FROM (
+            SELECT COALESCE(MAX(substring(code FROM '^DP([0-9]+)$')::bigint), 0) AS max_number
+            FROM {SCHEMA}.expenses
+        ) AS existing;
+    """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text(f"DROP SEQUENCE IF EXISTS {SCHEMA}.expense_code_seq"))
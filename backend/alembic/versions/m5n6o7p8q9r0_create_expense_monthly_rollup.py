@@ -0,0 +1,63 @@
+"""create expense_monthly_rollup table
+
+Revision ID: m5n6o7p8q9r0
+Revises: l4m5n6o7p8q9
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+from app.core.config import settings
+
+revision: str = 'm5n6o7p8q9r0'
+down_revision: Union[str, Sequence[str], None] = 'l4m5n6o7p8q9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = settings.DATABASE_SCHEMA
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # SQL direto para reutilizar os enums existentes (expensestatus, expensetype)
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {SCHEMA}.expense_monthly_rollup (
+            month DATE NOT NULL,
+            company_id UUID NOT NULL REFERENCES {SCHEMA}.companies(id),
+            department_id UUID NOT NULL REFERENCES {SCHEMA}.departments(id),
+            category_id UUID NOT NULL REFERENCES {SCHEMA}.categories(id),
+            status expensestatus NOT NULL,
+            expense_type expensetype NOT NULL,
+            total_value_brl NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            expense_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, company_id, department_id, category_id, status, expense_type)
+        );
+    """))
+    conn.execute(text(f"""
+        CREATE INDEX IF NOT EXISTS idx_expense_rollup_company_month
+        ON {SCHEMA}.expense_monthly_rollup (company_id, month);
+    """))
+
+    # Backfill a partir das despesas existentes (mês de criação em UTC)
+    conn.execute(text(f"""
+        INSERT INTO {SCHEMA}.expense_monthly_rollup (
+            month, company_id, department_id, category_id, status, expense_type,
+            total_value_brl, expense_count
+        )
+        SELECT
+            date_trunc('month', created_at AT TIME ZONE 'UTC')::date,
+            company_id, department_id, category_id, status, expense_type,
+            SUM(value_brl), COUNT(*)
+        FROM {SCHEMA}.expenses
+        GROUP BY 1, 2, 3, 4, 5, 6
+        ON CONFLICT DO NOTHING;
+    """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text(f"DROP TABLE IF EXISTS {SCHEMA}.expense_monthly_rollup"))
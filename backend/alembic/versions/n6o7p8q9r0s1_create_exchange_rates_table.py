@@ -0,0 +1,50 @@
+"""create exchange_rates table
+
+Revision ID: n6o7p8q9r0s1
+Revises: m5n6o7p8q9r0
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+from app.core.config import settings
+
+revision: str = 'n6o7p8q9r0s1'
+down_revision: Union[str, Sequence[str], None] = 'm5n6o7p8q9r0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = settings.DATABASE_SCHEMA
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {SCHEMA}.exchange_rates (
+            currency VARCHAR(3) NOT NULL,
+            rate_date DATE NOT NULL,
+            rate NUMERIC(10, 4) NOT NULL,
+            source VARCHAR(50) NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (currency, rate_date)
+        );
+    """))
+
+    # Semear com as cotações já capturadas nas despesas (última do dia)
+    conn.execute(text(f"""
+        INSERT INTO {SCHEMA}.exchange_rates (currency, rate_date, rate, source)
+        SELECT DISTINCT ON ((exchange_rate_date AT TIME ZONE 'UTC')::date)
+            'USD', (exchange_rate_date AT TIME ZONE 'UTC')::date, exchange_rate, 'expenses'
+        FROM {SCHEMA}.expenses
+        WHERE currency = 'USD' AND exchange_rate IS NOT NULL AND exchange_rate_date IS NOT NULL
+        ORDER BY (exchange_rate_date AT TIME ZONE 'UTC')::date, exchange_rate_date DESC
+        ON CONFLICT DO NOTHING;
+    """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text(f"DROP TABLE IF EXISTS {SCHEMA}.exchange_rates"))
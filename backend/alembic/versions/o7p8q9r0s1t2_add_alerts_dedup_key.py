@@ -0,0 +1,61 @@
+"""add alerts.dedup_key with unique index
+
+Revision ID: o7p8q9r0s1t2
+Revises: n6o7p8q9r0s1
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+from app.core.config import settings
+
+revision: str = 'o7p8q9r0s1t2'
+down_revision: Union[str, Sequence[str], None] = 'n6o7p8q9r0s1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = settings.DATABASE_SCHEMA
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.alerts ADD COLUMN IF NOT EXISTS dedup_key VARCHAR(255)"))
+
+    # Chave dos alertas de renovação já existentes: data de renovação = dia de criação + N dias
+    # do título ("Renovação em N dias"); em duplicados, só o mais antigo recebe a chave
+    conn.execute(text(f"""
+        UPDATE {SCHEMA}.alerts a
+        SET dedup_key = keyed.dedup_key
+        FROM (
+            SELECT DISTINCT ON (dedup_key) id, dedup_key
+            FROM (
+                SELECT id, created_at,
+                       'renewal_upcoming:' || expense_id || ':'
+                       || to_char(created_at::date + days, 'YYYY-MM-DD') || ':' || days AS dedup_key
+                FROM (
+                    SELECT id, expense_id, created_at,
+                           substring(title from '(\\d+) dia')::int AS days
+                    FROM {SCHEMA}.alerts
+                    WHERE alert_type::text IN ('renewal_upcoming', 'RENEWAL_UPCOMING')
+                      AND expense_id IS NOT NULL
+                ) parsed
+                WHERE days IS NOT NULL
+            ) candidates
+            ORDER BY dedup_key, created_at
+        ) keyed
+        WHERE a.id = keyed.id AND a.dedup_key IS NULL
+    """))
+
+    conn.execute(text(f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_alert_dedup_key
+        ON {SCHEMA}.alerts (dedup_key)
+    """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text(f"DROP INDEX IF EXISTS {SCHEMA}.uq_alert_dedup_key"))
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.alerts DROP COLUMN IF EXISTS dedup_key"))
@@ -0,0 +1,39 @@
+"""add alerts outbox columns (attempts, next_attempt_at)
+
+Revision ID: p8q9r0s1t2u3
+Revises: o7p8q9r0s1t2
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+from app.core.config import settings
+
+revision: str = 'p8q9r0s1t2u3'
+down_revision: Union[str, Sequence[str], None] = 'o7p8q9r0s1t2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = settings.DATABASE_SCHEMA
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.alerts ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0"))
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.alerts ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP WITH TIME ZONE"))
+
+    # Reivindicação de lotes pelo worker: status = 'pending' e next_attempt_at vencido, por created_at
+    conn.execute(text(f"""
+        CREATE INDEX IF NOT EXISTS idx_alert_outbox
+        ON {SCHEMA}.alerts (status, next_attempt_at, created_at)
+    """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text(f"DROP INDEX IF EXISTS {SCHEMA}.idx_alert_outbox"))
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.alerts DROP COLUMN IF EXISTS next_attempt_at"))
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.alerts DROP COLUMN IF EXISTS attempts"))
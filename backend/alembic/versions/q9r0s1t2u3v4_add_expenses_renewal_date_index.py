@@ -0,0 +1,35 @@
+"""add partial index on expenses.renewal_date (active expenses)
+
+Revision ID: q9r0s1t2u3v4
+Revises: p8q9r0s1t2u3
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+from app.core.config import settings
+
+revision: str = 'q9r0s1t2u3v4'
+down_revision: Union[str, Sequence[str], None] = 'p8q9r0s1t2u3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = settings.DATABASE_SCHEMA
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # Varredura de renovações (7, 3 e 1 dia): renewal_date IN (...) e COUNT da janela de 7 dias
+    conn.execute(text(f"""
+        CREATE INDEX IF NOT EXISTS ix_expenses_active_renewal_date
+        ON {SCHEMA}.expenses (renewal_date)
+        WHERE status = 'active'
+    """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text(f"DROP INDEX IF EXISTS {SCHEMA}.ix_expenses_active_renewal_date"))
@@ -1,21 +1,42 @@
+import asyncio
+import time
+from datetime import datetime, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.deps import get_current_user, require_roles
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.core.deps import authenticate_token, get_current_user, require_roles, security
 from app.core.permissions import _role_value as role_value
+from app.core.security import STREAM_TOKEN_SCOPE, create_stream_token, decode_access_token
 from app.models.user import User, UserRole
 from app.models.alert import AlertStatus
-from app.schemas.alert import AlertResponse, AlertWithRelationsResponse, AlertStatsResponse
+from app.schemas.alert import (
+    AlertResponse,
+    AlertWithRelationsResponse,
+    AlertStatsResponse,
+    AlertBulkReadRequest,
+    AlertBulkReadResponse,
+    AlertStreamTokenResponse,
+)
 from app.services import alert_service
+from app.services.alert_stream import HEARTBEAT, RESYNC, alert_broker
 
 router = APIRouter(prefix="/alerts", tags=["Alerts"])
 
 # Apenas admins podem ver todas validações
 admin_only = require_roles([UserRole.FINANCE_ADMIN, UserRole.SYSTEM_ADMIN])
 
+# Stream: token de acesso no cabeçalho ou token de stream em ?token= (EventSource do navegador não envia cabeçalhos)
+optional_bearer = HTTPBearer(auto_error=False)
+
+# Limite de ids por chamada de /bulk-read
+BULK_READ_MAX_IDS = 500
+
 
 @router.get("/me", response_model=list[AlertWithRelationsResponse])
 def get_my_alerts(
@@ -43,6 +64,113 @@ def get_my_alerts(
     return alerts
 
 
+def _authenticate_stream(token: str, scope: str | None) -> tuple[UUID, datetime]:
+    """
+    Autentica o stream com uma sessão curta (nenhuma conexão ao banco fica presa à conexão SSE).
+    Retorna o destinatário e até quando vale a sessão: exp do token de acesso
+    ou, para o token de stream, session_exp (exp do token de acesso que o emitiu).
+    """
+    db = SessionLocal()
+    try:
+        recipient_id = authenticate_token(db, token, scope).id
+    finally:
+        db.close()
+    payload = decode_access_token(token)
+    session_exp = payload["session_exp"] if scope == STREAM_TOKEN_SCOPE else payload["exp"]
+    return recipient_id, datetime.fromtimestamp(session_exp, timezone.utc)
+
+
+def _stream_user_active(recipient_id: UUID) -> bool:
+    db = SessionLocal()
+    try:
+        return bool(db.query(User.is_active).filter(User.id == recipient_id).scalar())
+    finally:
+        db.close()
+
+
+@router.post("/stream-token", response_model=AlertStreamTokenResponse)
+def create_alert_stream_token(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Emite um token curto que só serve para abrir GET /alerts/stream?token=
+    (o token de acesso não vai na URL, onde ficaria em logs de proxy e do servidor).
+    O stream aberto com ele fecha quando o token de acesso usado aqui expira.
+    """
+    session_expires_at = datetime.fromtimestamp(decode_access_token(credentials.credentials)["exp"], timezone.utc)
+    return AlertStreamTokenResponse(
+        token=create_stream_token(str(current_user.id), session_expires_at),
+        expires_in=settings.ALERT_STREAM_TOKEN_TTL_SECONDS,
+    )
+
+
+@router.get("/stream")
+async def stream_my_alerts(
+    token: str | None = Query(None, description="Token de POST /alerts/stream-token (alternativa ao cabeçalho Authorization)"),
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+    last_event_id_param: str | None = Query(None, alias="last_event_id", description="Último id recebido, ao reabrir com token novo"),
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_bearer),
+):
+    """
+    Stream (Server-Sent Events) dos alertas do usuário logado, no lugar de polling em /alerts/me.
+    Eventos: "alert" (AlertResponse) quando um alerta é criado, enviado ou lido; "read"
+    ({"count"}) após /read-all ou /bulk-read; "resync" quando
+    eventos foram perdidos (o cliente deve recarregar /alerts/me); ping a cada
+    ALERT_STREAM_HEARTBEAT_SECONDS. Na reconexão, Last-Event-ID (cabeçalho ou ?last_event_id=)
+    repete os eventos perdidos.
+    Autenticação: token de acesso no cabeçalho Authorization ou token de POST /alerts/stream-token
+    em ?token=. O stream fecha quando a sessão expira ou o usuário é desativado
+    (verificado a cada ALERT_STREAM_HEARTBEAT_SECONDS); o cliente reconecta com um token novo.
+    """
+    if credentials:
+        raw_token, scope = credentials.credentials, None
+    else:
+        raw_token, scope = token, STREAM_TOKEN_SCOPE
+    if not raw_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Não autenticado"
+        )
+    recipient_id, session_expires_at = await asyncio.to_thread(_authenticate_stream, raw_token, scope)
+    last_event_id = last_event_id or last_event_id_param
+    heartbeat = settings.ALERT_STREAM_HEARTBEAT_SECONDS
+
+    async def events():
+        subscription, backlog = alert_broker.subscribe(recipient_id, last_event_id)
+        checked_at = time.monotonic()
+        try:
+            yield "retry: 5000\n\n"
+            if backlog is None:
+                yield RESYNC
+            else:
+                for event in backlog:
+                    yield event.encoded
+            while True:
+                remaining = (session_expires_at - datetime.now(timezone.utc)).total_seconds()
+                if remaining <= 0:
+                    return  # Sessão expirada
+                pending, resync = await subscription.next(min(heartbeat, remaining))
+                if resync:
+                    yield RESYNC
+                for event in pending:
+                    yield event.encoded
+                if time.monotonic() - checked_at >= heartbeat:
+                    if not await asyncio.to_thread(_stream_user_active, recipient_id):
+                        return  # Usuário desativado ou removido
+                    checked_at = time.monotonic()
+                if not pending and not resync:
+                    yield HEARTBEAT
+        finally:
+            alert_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("", response_model=list[AlertWithRelationsResponse])
 def list_alerts(
     recipient_id: UUID | None = Query(None, description="Filtrar por destinatário"),
@@ -73,6 +201,43 @@ def list_alerts(
     return alerts
 
 
+@router.post("/read-all", response_model=AlertBulkReadResponse)
+def mark_all_alerts_as_read(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Marca todos os alertas não lidos do usuário logado como lidos."""
+    updated = alert_service.mark_many_as_read(db, current_user.id)
+    return AlertBulkReadResponse(updated=updated)
+
+
+@router.post("/bulk-read", response_model=AlertBulkReadResponse)
+def bulk_mark_alerts_as_read(
+    body: AlertBulkReadRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Marca como lidos vários alertas do usuário logado: por ids e/ou por filtro
+    (alert_type, status). Apenas alertas do próprio usuário são alterados; ids de
+    outros destinatários são ignorados (não entram na contagem).
+    """
+    if body.ids is None and body.alert_type is None and body.status is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe ids ou um filtro (alert_type, status)"
+        )
+    if body.ids is not None and len(body.ids) > BULK_READ_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Máximo de {BULK_READ_MAX_IDS} alertas por requisição"
+        )
+    updated = alert_service.mark_many_as_read(
+        db, current_user.id, alert_ids=body.ids, alert_type=body.alert_type, status=body.status
+    )
+    return AlertBulkReadResponse(updated=updated)
+
+
 @router.get("/{alert_id}", response_model=AlertWithRelationsResponse)
 def get_alert(
     alert_id: UUID,
@@ -147,7 +312,7 @@ def process_pending_alerts(
     current_user: User = Depends(admin_only)
 ):
     """
-    Processa alertas pendentes e tenta enviá-los.
+    Processa um lote de alertas pendentes agora, sem esperar o worker do outbox.
     Apenas admins podem executar.
     """
     stats = alert_service.process_pending_alerts(db, limit)
@@ -3,15 +3,12 @@ from datetime import date
 
 from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.deps import get_current_user
-from app.core.permissions import _role_value as role_value, get_expense_scope_params
+from app.core.deps import get_current_user, require_roles
+from app.core.permissions import _role_value as role_value
 from app.models.user import User, UserRole
-from app.models.alert import Alert, AlertStatus
-from app.models.expense_validation import ExpenseValidation, ValidationStatus
-from app.models.expense import Expense
 from app.services import dashboard_service
 from app.schemas.dashboard import (
     DashboardStatsResponse,
@@ -22,10 +19,16 @@ from app.schemas.dashboard import (
     TopExpenseResponse,
     StatusDistributionResponse,
     UpcomingRenewalsResponse,
+    DashboardOverviewResponse,
+    DashboardCacheStatsResponse,
+    ForecastResponse,
+    HistoricalSpendResponse,
 )
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+admin_only = require_roles([UserRole.FINANCE_ADMIN, UserRole.SYSTEM_ADMIN])
+
 
 def validate_dashboard_filters(
     current_user: User,
@@ -51,6 +54,31 @@ def validate_dashboard_filters(
                 )
 
 
+@router.get("/cache-stats", response_model=DashboardCacheStatsResponse)
+def get_dashboard_cache_stats(current_user: User = Depends(admin_only)):
+    """Retorna hits/misses do cache de resultados do Dashboard deste processo"""
+    return dashboard_service.get_cache_stats()
+
+
+@router.get("/overview", response_model=DashboardOverviewResponse)
+def get_dashboard_overview(
+    company_id: UUID | None = Query(None, description="Filtrar por empresa"),
+    department_id: UUID | None = Query(None, description="Filtrar por setor"),
+    month: str | None = Query(None, description="Filtrar por mês (formato YYYY-MM)"),
+    limit: int = Query(10, ge=1, le=50, description="Limite de resultados por widget"),
+    months: int = Query(6, ge=1, le=12, description="Número de meses da evolução"),
+    days: int = Query(30, ge=1, le=90, description="Dias à frente para renovações"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Retorna todos os widgets do Dashboard em uma única requisição (tempos por widget com DEBUG)"""
+    validate_dashboard_filters(current_user, company_id, department_id)
+    return dashboard_service.get_overview(
+        db, current_user, company_id, department_id, month,
+        limit=limit, months=months, days=days, include_timings=settings.DEBUG
+    )
+
+
 @router.get("/stats", response_model=DashboardStatsResponse)
 def get_dashboard_stats(
     company_id: UUID | None = Query(None, description="Filtrar por empresa"),
@@ -59,65 +87,9 @@ def get_dashboard_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Retorna estatísticas gerais do dashboard"""
+    """Retorna estatísticas gerais do dashboard (uma única query, incluindo validações pendentes e alertas não lidos)"""
     validate_dashboard_filters(current_user, company_id, department_id)
-    stats = dashboard_service.get_dashboard_stats(db, current_user, company_id, department_id, month)
-    
-    # Calcular validações pendentes (respeitando filtro de empresa)
-    user_role = role_value(current_user.role)
-    if user_role in (UserRole.SYSTEM_ADMIN.value, UserRole.FINANCE_ADMIN.value):
-        validation_filters = [ExpenseValidation.status == ValidationStatus.PENDING]
-        if company_id:
-            validation_filters.append(Expense.company_id == company_id)
-        if department_id:
-            validation_filters.append(Expense.department_id == department_id)
-        pending_validations = db.query(func.count(ExpenseValidation.id)).join(
-            Expense, ExpenseValidation.expense_id == Expense.id
-        ).filter(and_(*validation_filters)).scalar() or 0
-    elif user_role == UserRole.LEADER.value:
-        company_ids = [c.id for c in current_user.companies] if current_user.companies else []
-        if company_ids:
-            validation_filters = [
-                ExpenseValidation.status == ValidationStatus.PENDING,
-                Expense.owner_id == current_user.id,
-                Expense.company_id.in_(company_ids),
-            ]
-            if company_id:
-                validation_filters.append(Expense.company_id == company_id)
-            if department_id:
-                validation_filters.append(Expense.department_id == department_id)
-            pending_validations = db.query(func.count(ExpenseValidation.id)).join(
-                Expense, ExpenseValidation.expense_id == Expense.id
-            ).filter(and_(*validation_filters)).scalar() or 0
-        else:
-            pending_validations = 0
-    else:
-        pending_validations = 0
-    
-    # Calcular alertas não lidos (respeitando filtro de empresa)
-    if company_id:
-        unread_alerts = db.query(func.count(Alert.id)).outerjoin(
-            Expense, Alert.expense_id == Expense.id
-        ).filter(
-            and_(
-                Alert.recipient_id == current_user.id,
-                Alert.status == AlertStatus.PENDING,
-                Expense.company_id == company_id,
-            )
-        ).scalar() or 0
-    else:
-        unread_alerts = db.query(func.count(Alert.id)).filter(
-            and_(
-                Alert.recipient_id == current_user.id,
-                Alert.status == AlertStatus.PENDING,
-            )
-        ).scalar() or 0
-    
-    # Atualizar stats com valores calculados
-    stats.pending_validations = pending_validations
-    stats.unread_alerts = unread_alerts
-    
-    return stats
+    return dashboard_service.get_dashboard_stats(db, current_user, company_id, department_id, month)
 
 
 @router.get("/expenses-by-category", response_model=CategoryExpenseResponse)
@@ -228,3 +200,38 @@ def get_upcoming_renewals(
     return dashboard_service.get_upcoming_renewals(
         db, current_user, company_id, department_id, days, limit
     )
+
+
+@router.get("/forecast", response_model=ForecastResponse)
+def get_forecast(
+    months: int = Query(24, ge=1, le=60, description="Número de meses projetados"),
+    company_id: UUID | None = Query(None, description="Filtrar por empresa"),
+    department_id: UUID | None = Query(None, description="Filtrar por setor"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Projeta o desembolso mensal em BRL por empresa, setor e categoria a partir da periodicidade"""
+    validate_dashboard_filters(current_user, company_id, department_id)
+    return dashboard_service.get_forecast(db, current_user, company_id, department_id, months)
+
+
+@router.get("/historical-spend", response_model=HistoricalSpendResponse)
+def get_historical_spend(
+    from_month: str | None = Query(None, description="Mês inicial (YYYY-MM); padrão: 11 meses antes do final"),
+    to_month: str | None = Query(None, description="Mês final (YYYY-MM); padrão: mês atual"),
+    company_id: UUID | None = Query(None, description="Filtrar por empresa"),
+    department_id: UUID | None = Query(None, description="Filtrar por setor"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Gasto mensal com despesas em moeda estrangeira convertidas pela cotação histórica de cada mês"""
+    validate_dashboard_filters(current_user, company_id, department_id)
+    try:
+        return dashboard_service.get_historical_spend(
+            db, current_user, company_id, department_id, from_month, to_month
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
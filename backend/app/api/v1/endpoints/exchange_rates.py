@@ -0,0 +1,86 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.deps import require_roles, get_current_user
+from app.models.user import User, UserRole
+from app.schemas.exchange_rate import (
+    ExchangeRateResponse,
+    ExchangeRateImportResponse,
+    ExchangeRateRevalueResponse,
+)
+from app.services import exchange_rate_service
+
+router = APIRouter(prefix="/exchange-rates", tags=["Exchange Rates"])
+
+# Apenas admins podem importar cotações e reavaliar despesas
+admin_only = require_roles([UserRole.FINANCE_ADMIN, UserRole.SYSTEM_ADMIN])
+
+
+@router.get("", response_model=list[ExchangeRateResponse])
+def list_exchange_rates(
+    currency: str = Query("USD", min_length=3, max_length=3, description="Moeda de origem"),
+    date_from: date | None = Query(None, description="Data inicial (inclusive)"),
+    date_to: date | None = Query(None, description="Data final (inclusive)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Lista cotações diárias registradas"""
+    return exchange_rate_service.get_rates(db, currency.upper(), date_from, date_to)
+
+
+@router.get("/latest", response_model=ExchangeRateResponse)
+def get_latest_exchange_rate(
+    currency: str = Query("USD", min_length=3, max_length=3, description="Moeda de origem"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Retorna a cotação diária mais recente"""
+    latest = exchange_rate_service.get_latest(db, currency.upper())
+    if not latest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Nenhuma cotação registrada"
+        )
+    return latest
+
+
+async def _read_csv_upload(
+    file: UploadFile = File(..., description="CSV com colunas date,rate[,currency]")
+) -> str:
+    """Lê o CSV enviado (UTF-8, com ou sem BOM)."""
+    try:
+        return (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Arquivo deve estar em UTF-8"
+        )
+
+
+@router.post("/import", response_model=ExchangeRateImportResponse)
+def import_exchange_rates(
+    content: str = Depends(_read_csv_upload),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_only)
+):
+    """Importa cotações históricas de um CSV (linhas inválidas são reportadas)"""
+    return exchange_rate_service.import_csv(db, content)
+
+
+@router.post("/revalue", response_model=ExchangeRateRevalueResponse)
+def revalue_expenses(
+    currency: str = Query("USD", min_length=3, max_length=3, description="Moeda das despesas"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_only)
+):
+    """Reavalia value_brl das despesas ativas na moeda pela cotação mais recente"""
+    try:
+        return exchange_rate_service.revalue_expenses(db, currency.upper())
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
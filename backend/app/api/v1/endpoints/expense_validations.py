@@ -1,5 +1,6 @@
 from uuid import UUID
 from datetime import date
+from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
 from sqlalchemy.orm import Session
@@ -12,10 +13,10 @@ from app.schemas.expense_validation import (
     ExpenseValidationResponse,
     ExpenseValidationWithExpenseResponse,
     ExpenseBasic,
-    CompanyBasic,
-    DepartmentBasic,
-    UserBasic,
     RejectRequest,
+    PredictedValidationsMonth,
+    ValidationBulkRequest,
+    ValidationBulkResponse,
 )
 from app.services import expense_validation_service
 from app.models.expense_validation import ValidationStatus
@@ -25,6 +26,15 @@ router = APIRouter(prefix="/expense-validations", tags=["Expense Validations"])
 # Apenas admins podem executar tarefas administrativas
 admin_only = require_roles([UserRole.FINANCE_ADMIN, UserRole.SYSTEM_ADMIN])
 
+# Limite de meses por chamada de /create-monthly com end_month
+BACKFILL_MAX_MONTHS = 36
+
+# Limite de meses por chamada de /predicted/by-month
+PREDICTED_MAX_MONTHS = 24
+
+# Limite de ids por chamada de /bulk
+BULK_MAX_IDS = 500
+
 
 @router.get("/pending", response_model=list[ExpenseValidationWithExpenseResponse])
 def list_pending_validations(
@@ -57,6 +67,39 @@ def get_validation_history(
     return validations
 
 
+def _predicted_response(expense, validation_month: date) -> ExpenseValidationWithExpenseResponse:
+    """Validação prevista (sem registro no banco) no formato de resposta das validações."""
+    return ExpenseValidationWithExpenseResponse(
+        id=None,  # Não tem ID pois não existe no banco
+        expense_id=expense.id,
+        validator_id=None,
+        validation_month=validation_month,
+        status=ValidationStatus.PENDING,
+        validated_at=None,
+        is_overdue=False,
+        is_predicted=True,
+        created_at=None,
+        updated_at=None,
+        expense=ExpenseBasic.model_validate(expense),
+        validator=None
+    )
+
+
+def _validate_future_month(month: date) -> date:
+    """Primeiro dia do mês; 400 se não for um mês futuro."""
+    from datetime import datetime
+    
+    first_day_target = month.replace(day=1)
+    first_day_current = datetime.now().date().replace(day=1)
+    
+    if first_day_target <= first_day_current:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Este endpoint é apenas para meses futuros. Use /pending ou /history para meses passados/atuais."
+        )
+    return first_day_target
+
+
 @router.get("/predicted", response_model=list[ExpenseValidationWithExpenseResponse])
 def get_predicted_validations(
     month: date = Query(..., description="Mês futuro para previsão (primeiro dia do mês)"),
@@ -69,89 +112,60 @@ def get_predicted_validations(
     Não cria registros no banco.
     Apenas despesas ATIVAS são consideradas (canceladas não aparecem).
     """
-    from datetime import datetime
-    from uuid import uuid4
+    first_day_target = _validate_future_month(month)
     
-    # Validar que é um mês futuro
-    today = datetime.now().date()
-    first_day_target = month.replace(day=1)
-    first_day_current = today.replace(day=1)
+    predicted = expense_validation_service.get_predicted_validations(db, first_day_target, current_user=current_user)
     
-    if first_day_target <= first_day_current:
+    return [_predicted_response(item["expense"], item["validation_month"]) for item in predicted]
+
+
+@router.get("/predicted/by-month", response_model=list[PredictedValidationsMonth])
+def get_predicted_validations_by_month(
+    from_month: date = Query(..., description="Primeiro mês futuro da previsão (primeiro dia do mês)"),
+    to_month: date = Query(..., description="Último mês da previsão, inclusive (primeiro dia do mês)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Lista validações previstas de from_month até to_month (ex.: um trimestre ou um ano),
+    agrupadas por mês, em uma única consulta.
+    Meses sem validação prevista aparecem com count = 0.
+    Não cria registros no banco.
+    """
+    first_day = _validate_future_month(from_month)
+    last_day = to_month.replace(day=1)
+    if last_day < first_day:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Este endpoint é apenas para meses futuros. Use /pending ou /history para meses passados/atuais."
+            detail="to_month deve ser posterior ou igual a from_month"
+        )
+    if (last_day.year - first_day.year) * 12 + (last_day.month - first_day.month) >= PREDICTED_MAX_MONTHS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Intervalo máximo de {PREDICTED_MAX_MONTHS} meses"
         )
     
-    predicted = expense_validation_service.get_predicted_validations(db, first_day_target, current_user=current_user)
+    predicted = expense_validation_service.get_predicted_validations(
+        db, first_day, last_day, current_user=current_user
+    )
     
-    # Converter para formato de resposta (criar objetos temporários similares a ExpenseValidation)
-    result = []
+    groups: dict[date, list] = {}
+    month = first_day
+    while month <= last_day:
+        groups[month] = []
+        month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
     for item in predicted:
-        expense = item["expense"]
-        validation_month = item["validation_month"]
-        
-        # Criar objeto temporário similar a ExpenseValidation mas sem ID
-        # Usar ExpenseValidationWithExpenseResponse com campos adaptados
-        # Garantir que os relacionamentos foram carregados
-        currency_str = expense.currency.value if hasattr(expense.currency, 'value') else str(expense.currency)
-        status_str = expense.status.value if hasattr(expense.status, 'value') else str(expense.status)
-        
-        company_basic = None
-        if expense.company:
-            company_basic = CompanyBasic(
-                id=expense.company.id,
-                name=expense.company.name
-            )
-        
-        department_basic = None
-        if expense.department:
-            department_basic = DepartmentBasic(
-                id=expense.department.id,
-                name=expense.department.name
-            )
-        
-        owner_basic = None
-        if expense.owner:
-            owner_basic = UserBasic(
-                id=expense.owner.id,
-                name=expense.owner.name,
-                email=expense.owner.email
-            )
-        
-        expense_basic = ExpenseBasic(
-            id=expense.id,
-            code=expense.code,
-            service_name=expense.service_name,
-            value=expense.value,
-            currency=currency_str,
-            value_brl=expense.value_brl,
-            status=status_str,
-            department_id=expense.department_id,
-            company=company_basic,
-            department=department_basic,
-            owner=owner_basic
-        )
-        
-        # Criar resposta temporária
-        validation_response = ExpenseValidationWithExpenseResponse(
-            id=None,  # Não tem ID pois não existe no banco
-            expense_id=expense.id,
-            validator_id=None,
-            validation_month=validation_month,
-            status=ValidationStatus.PENDING,
-            validated_at=None,
-            is_overdue=False,
-            is_predicted=True,
-            created_at=None,
-            updated_at=None,
-            expense=expense_basic,
-            validator=None
-        )
-        
-        result.append(validation_response)
+        groups[item["validation_month"]].append(item["expense"])
     
-    return result
+    return [
+        PredictedValidationsMonth(
+            month=month,
+            count=len(expenses),
+            total_value_brl=sum((expense.value_brl for expense in expenses), Decimal("0.00")),
+            validations=[_predicted_response(expense, month) for expense in expenses],
+        )
+        for month, expenses in groups.items()
+    ]
 
 
 @router.get("/{validation_id}", response_model=ExpenseValidationWithExpenseResponse)
@@ -187,13 +201,13 @@ def approve_validation(
     """
     Aprova validação (apenas se a despesa estiver no escopo do usuário).
     """
-    validation = expense_validation_service.get_by_id(db, validation_id)
-    if not validation:
+    expense = expense_validation_service.get_expense_for_validation(db, validation_id)
+    if not expense:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Validação não encontrada"
         )
-    if not can_approve_expense(current_user, validation.expense):
+    if not can_approve_expense(current_user, expense):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Você não tem permissão para aprovar esta validação"
@@ -219,13 +233,13 @@ def reject_validation(
     Rejeita validação (cancela despesa). Apenas se a despesa estiver no escopo do usuário.
     Body opcional: charged_this_month (se a despesa já foi processada no mês, valor conta no dashboard).
     """
-    validation = expense_validation_service.get_by_id(db, validation_id)
-    if not validation:
+    expense = expense_validation_service.get_expense_for_validation(db, validation_id)
+    if not expense:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Validação não encontrada"
         )
-    if not can_approve_expense(current_user, validation.expense):
+    if not can_approve_expense(current_user, expense):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Você não tem permissão para rejeitar esta validação"
@@ -243,6 +257,33 @@ def reject_validation(
         )
 
 
+@router.post("/bulk", response_model=ValidationBulkResponse)
+def bulk_decide_validations(
+    body: ValidationBulkRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Aprova e rejeita várias validações de uma vez, em uma única transação.
+    Cada id é verificado individualmente (escopo/permissão e status pendente);
+    falhas são reportadas por id e não impedem os demais.
+    """
+    if len(body.approve) + len(body.reject) > BULK_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Máximo de {BULK_MAX_IDS} validações por requisição"
+        )
+    results = expense_validation_service.bulk_decide(
+        db, body.approve, body.reject, current_user, charged_this_month=body.charged_this_month
+    )
+    return ValidationBulkResponse(
+        approved=sum(1 for r in results if r["success"] and r["action"] == "approve"),
+        rejected=sum(1 for r in results if r["success"] and r["action"] == "reject"),
+        failed=sum(1 for r in results if not r["success"]),
+        results=results,
+    )
+
+
 @router.post("/mark-overdue", status_code=status.HTTP_200_OK)
 def mark_overdue_validations_endpoint(
     db: Session = Depends(get_db),
@@ -259,6 +300,7 @@ def mark_overdue_validations_endpoint(
 @router.post("/create-monthly", status_code=status.HTTP_201_CREATED)
 def create_monthly_validations_endpoint(
     month: date | None = Query(None, description="Mês para criar validações (primeiro dia do mês). Se não fornecido, usa o mês atual."),
+    end_month: date | None = Query(None, description="Último mês (inclusive) para recuperar meses perdidos de month até end_month"),
     db: Session = Depends(get_db),
     current_user: User = Depends(admin_only)
 ):
@@ -266,6 +308,7 @@ def create_monthly_validations_endpoint(
     Cria validações mensais para todas despesas recorrentes ativas baseado na periodicidade.
     Apenas admins podem executar.
     Se month não for fornecido, usa o primeiro dia do mês atual.
+    Com end_month, cria as validações de todos os meses do intervalo de uma vez.
     """
     from datetime import datetime
     
@@ -274,11 +317,27 @@ def create_monthly_validations_endpoint(
         month = today.replace(day=1)
     else:
         month = month.replace(day=1)
+    end = end_month.replace(day=1) if end_month else month
+    if end < month:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_month deve ser posterior ou igual a month"
+        )
+    if (end.year - month.year) * 12 + (end.month - month.month) >= BACKFILL_MAX_MONTHS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Intervalo máximo de {BACKFILL_MAX_MONTHS} meses"
+        )
     
-    validations = expense_validation_service.create_monthly_validations(db, month)
+    validations = expense_validation_service.create_monthly_validations(db, month, end)
     
+    if end == month:
+        period = f"o mês {month.strftime('%Y-%m')}"
+    else:
+        period = f"os meses {month.strftime('%Y-%m')} a {end.strftime('%Y-%m')}"
     return {
-        "message": f"{len(validations)} validações criadas para o mês {month.strftime('%Y-%m')}",
+        "message": f"{len(validations)} validações criadas para {period}",
         "count": len(validations),
-        "month": month.isoformat()
+        "month": month.isoformat(),
+        "end_month": end.isoformat()
     }
@@ -1,10 +1,15 @@
+import csv
+import io
 import logging
 from datetime import date
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from pydantic import ValidationError
 
 from app.core.database import get_db
 from app.core.deps import get_current_user, require_roles
@@ -16,8 +21,18 @@ from app.core.permissions import (
 )
 from app.models.user import User, UserRole
 from app.models.expense import ExpenseStatus, ExpenseType
-from app.schemas.expense import ExpenseCreate, ExpenseUpdate, ExpenseResponse, ExpenseWithRelationsResponse, ExpenseCancelRequest
-from app.services import expense_service, expense_validation_service, exchange_service
+from app.schemas.expense import (
+    ExpenseCreate,
+    ExpenseUpdate,
+    ExpenseResponse,
+    ExpenseWithRelationsResponse,
+    ExpenseCancelRequest,
+    ExpensePageResponse,
+    ExpenseSummaryPageResponse,
+    ExpenseSearchResult,
+    ExpenseBulkResponse,
+)
+from app.services import expense_service, expense_validation_service, exchange_service, expense_export_service
 from app.services import category_service, company_service, department_service, user_service
 
 router = APIRouter(prefix="/expenses", tags=["Expenses"])
@@ -25,6 +40,8 @@ router = APIRouter(prefix="/expenses", tags=["Expenses"])
 # Apenas admins podem gerenciar todas as despesas
 admin_only = require_roles([UserRole.FINANCE_ADMIN, UserRole.SYSTEM_ADMIN])
 
+BULK_MAX_ROWS = 1000
+
 
 def _normalize_list(value: list | None) -> list | None:
     """Retorna None se lista vazia, senão a própria lista."""
@@ -33,25 +50,27 @@ def _normalize_list(value: list | None) -> list | None:
     return value
 
 
-@router.get("", response_model=list[ExpenseWithRelationsResponse])
-def list_expenses(
-    company_ids: list[UUID] | None = Query(None, description="Filtrar por empresas"),
-    department_ids: list[UUID] | None = Query(None, description="Filtrar por setores"),
-    owner_ids: list[UUID] | None = Query(None, description="Filtrar por responsáveis"),
-    category_ids: list[UUID] | None = Query(None, description="Filtrar por categorias"),
-    status: list[ExpenseStatus] | None = Query(None, description="Filtrar por status"),
-    expense_type: list[ExpenseType] | None = Query(None, description="Filtrar por tipo"),
-    service_name: str | None = Query(None, description="Busca parcial por nome"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Lista despesas com escopo por role (empresa + responsável/created_by)."""
+def _scoped_filters(
+    current_user: User,
+    company_ids: list[UUID] | None = None,
+    department_ids: list[UUID] | None = None,
+    owner_ids: list[UUID] | None = None,
+    category_ids: list[UUID] | None = None,
+    statuses: list[ExpenseStatus] | None = None,
+    expense_types: list[ExpenseType] | None = None,
+    service_name: str | None = None,
+) -> dict:
+    """
+    Combina os filtros da requisição com o escopo do usuário (empresa + responsável/created_by).
+    Retorna os kwargs de filtro aceitos por expense_service (get_filtered_page, get_summary_page, ...).
+    Levanta 403 se um líder filtrar por empresa fora do seu escopo.
+    """
     company_ids = _normalize_list(company_ids)
     department_ids = _normalize_list(department_ids)
     owner_ids = _normalize_list(owner_ids)
     category_ids = _normalize_list(category_ids)
-    statuses = _normalize_list(status)
-    expense_types = _normalize_list(expense_type)
+    statuses = _normalize_list(statuses)
+    expense_types = _normalize_list(expense_types)
 
     scope = get_expense_scope_params(current_user)
     scope_company_ids = scope["company_ids"]
@@ -60,7 +79,8 @@ def list_expenses(
     scope_department_ids = scope.get("department_ids")
 
     if scope_company_ids is not None and len(scope_company_ids) == 0:
-        return []
+        # Sem empresas no escopo: lista vazia faz os serviços retornarem nenhum resultado
+        return {"company_ids": []}
 
     # Validar filtros contra escopo do usuário
     role_val = _perm_role_value(current_user.role)
@@ -107,18 +127,113 @@ def list_expenses(
         # Se não há filtro do usuário, usar escopo (pode ser None)
         final_department_ids = scope_department_ids
 
-    expenses = expense_service.get_filtered(
-        db,
-        company_ids=final_company_ids,
-        department_ids=final_department_ids,
-        owner_ids=final_owner_ids,
-        created_by_id=scope_created_by_id,
+    return {
+        "company_ids": final_company_ids,
+        "department_ids": final_department_ids,
+        "owner_ids": final_owner_ids,
+        "created_by_id": scope_created_by_id,
+        "category_ids": category_ids,
+        "statuses": statuses,
+        "expense_types": expense_types,
+        "service_name": service_name,
+    }
+
+
+@router.get("", response_model=ExpensePageResponse | ExpenseSummaryPageResponse)
+def list_expenses(
+    company_ids: list[UUID] | None = Query(None, description="Filtrar por empresas"),
+    department_ids: list[UUID] | None = Query(None, description="Filtrar por setores"),
+    owner_ids: list[UUID] | None = Query(None, description="Filtrar por responsáveis"),
+    category_ids: list[UUID] | None = Query(None, description="Filtrar por categorias"),
+    status_filter: list[ExpenseStatus] | None = Query(None, alias="status", description="Filtrar por status"),
+    expense_type: list[ExpenseType] | None = Query(None, description="Filtrar por tipo"),
+    service_name: str | None = Query(None, description="Busca parcial por nome"),
+    limit: int = Query(50, ge=1, le=200, description="Itens por página"),
+    cursor: str | None = Query(None, description="Cursor opaco retornado em next_cursor"),
+    view: Literal["full", "summary"] = Query("full", description="full: despesa completa com relações; summary: colunas da tabela + nomes"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Lista despesas com escopo por role (empresa + responsável/created_by).
+    Paginação por cursor: ordenação (created_at DESC, id DESC); envie next_cursor como cursor para a próxima página.
+    view=summary retorna linhas enxutas (sem carregar entidades ORM), para tabelas.
+    """
+    page_response = ExpenseSummaryPageResponse if view == "summary" else ExpensePageResponse
+    filters = _scoped_filters(
+        current_user,
+        company_ids=company_ids,
+        department_ids=department_ids,
+        owner_ids=owner_ids,
+        category_ids=category_ids,
+        statuses=status_filter,
+        expense_types=expense_type,
+        service_name=service_name,
+    )
+
+    get_page = expense_service.get_summary_page if view == "summary" else expense_service.get_filtered_page
+    try:
+        expenses, next_cursor = get_page(db, limit=limit, cursor=cursor, **filters)
+    except expense_service.InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return page_response(items=expenses, next_cursor=next_cursor)
+
+
+@router.get("/search", response_model=list[ExpenseSearchResult])
+def search_expenses(
+    q: str = Query(..., min_length=1, max_length=100, description="Termo de busca (nome, descrição, plano ou código)"),
+    limit: int = Query(20, ge=1, le=50, description="Limite de resultados"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Busca aproximada (trigramas) de despesas no escopo do usuário, ordenada por similaridade.
+    """
+    filters = _scoped_filters(current_user)
+    return expense_service.search(db, q, limit=limit, **filters)
+
+
+@router.get("/export")
+def export_expenses(
+    file_format: Literal["csv", "xlsx"] = Query("csv", alias="format", description="Formato do arquivo"),
+    company_ids: list[UUID] | None = Query(None, description="Filtrar por empresas"),
+    department_ids: list[UUID] | None = Query(None, description="Filtrar por setores"),
+    owner_ids: list[UUID] | None = Query(None, description="Filtrar por responsáveis"),
+    category_ids: list[UUID] | None = Query(None, description="Filtrar por categorias"),
+    status_filter: list[ExpenseStatus] | None = Query(None, alias="status", description="Filtrar por status"),
+    expense_type: list[ExpenseType] | None = Query(None, description="Filtrar por tipo"),
+    service_name: str | None = Query(None, description="Busca parcial por nome"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Exporta todas as despesas filtradas (mesmos filtros e escopo da listagem) em CSV ou XLSX.
+    As linhas são lidas com cursor no servidor e transmitidas, sem montar a lista em memória.
+    """
+    filters = _scoped_filters(
+        current_user,
+        company_ids=company_ids,
+        department_ids=department_ids,
+        owner_ids=owner_ids,
         category_ids=category_ids,
-        statuses=statuses,
-        expense_types=expense_types,
+        statuses=status_filter,
+        expense_types=expense_type,
         service_name=service_name,
     )
-    return expenses
+    filename = f"despesas_{date.today().isoformat()}.{file_format}"
+    if file_format == "xlsx":
+        content = expense_export_service.stream_xlsx(filters)
+        media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    else:
+        content = expense_export_service.stream_csv(filters)
+        media_type = "text/csv; charset=utf-8"
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{expense_id}", response_model=ExpenseWithRelationsResponse)
@@ -245,6 +360,93 @@ def create_expense(
         )
 
 
+async def _read_bulk_rows(request: Request) -> list[dict]:
+    """Lê as linhas da importação: JSON (lista de despesas) ou upload CSV (campo "file", cabeçalho = campos de ExpenseCreate)."""
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or not hasattr(upload, "read"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Envie o arquivo CSV no campo 'file'"
+            )
+        try:
+            text = (await upload.read()).decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Arquivo CSV inválido: use a codificação UTF-8"
+            )
+        # Células vazias = campo não informado
+        return [
+            {key: (value if value != "" else None) for key, value in row.items()}
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Corpo inválido: envie uma lista JSON de despesas ou um arquivo CSV"
+        )
+    if not isinstance(body, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Corpo inválido: envie uma lista JSON de despesas"
+        )
+    return body
+
+
+@router.post("/bulk", response_model=ExpenseBulkResponse)
+def bulk_create_expenses(
+    raw_rows: list[dict] = Depends(_read_bulk_rows),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Importa várias despesas de uma vez (JSON ou CSV), em uma única transação.
+    Linhas inválidas são reportadas individualmente e não impedem as demais.
+    """
+    if len(raw_rows) > BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Máximo de {BULK_MAX_ROWS} despesas por importação"
+        )
+
+    results = [None] * len(raw_rows)
+    parsed = []
+    for index, raw in enumerate(raw_rows):
+        try:
+            parsed.append((index, ExpenseCreate.model_validate(raw)))
+        except ValidationError as e:
+            results[index] = {
+                "row": index,
+                "success": False,
+                "errors": [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()],
+            }
+
+    if parsed:
+        try:
+            created = expense_service.bulk_create(db, [data for _, data in parsed], current_user)
+        except IntegrityError as e:
+            logging.warning("IntegrityError na importação em lote: %s", e)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Dados inválidos ou conflito (ex.: setor não pertence à empresa)."
+            )
+        for result in created:
+            index = parsed[result["row"]][0]
+            results[index] = {**result, "row": index}
+
+    created_count = sum(1 for r in results if r["success"])
+    return ExpenseBulkResponse(
+        created=created_count,
+        failed=len(results) - created_count,
+        rows=results,
+    )
+
+
 @router.put("/{expense_id}", response_model=ExpenseResponse)
 def update_expense(
     expense_id: UUID,
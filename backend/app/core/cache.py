@@ -0,0 +1,112 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from app.core.config import settings
+
+
+def _estimate_size(value: Any) -> int:
+    """Tamanho aproximado em bytes de um resultado (JSON para schemas Pydantic)."""
+    if hasattr(value, "model_dump_json"):
+        return len(value.model_dump_json())
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Cache em memória de resultados com TTL, despejo LRU e limite de memória.
+
+    Invalidação por geração: cada entrada guarda a geração vigente quando o cálculo
+    começou; invalidate() incrementa a geração e torna todas as entradas obsoletas
+    sem precisar percorrê-las. Um cálculo que começou antes de uma escrita é
+    descartado mesmo que termine depois dela.
+
+    Por processo: com vários workers, cada um tem seu cache e o TTL limita
+    a defasagem em relação a escritas feitas em outro worker.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, max_bytes: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[int, float, int, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def invalidate(self) -> None:
+        """Invalida todas as entradas (chamado após escritas que afetam os resultados)."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Retorna o valor em cache para key ou calcula, armazena e retorna."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                generation, expires_at, _, value = entry
+                if generation == self._generation and expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._drop(key)
+            self.misses += 1
+            generation = self._generation
+
+        value = compute()
+        self._store(key, generation, value)
+        return value
+
+    def _store(self, key: Hashable, generation: int, value: Any) -> None:
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return  # Houve escrita durante o cálculo: resultado pode estar defasado
+            self._drop(key)
+            self._entries[key] = (generation, time.monotonic() + self.ttl_seconds, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def stats(self) -> dict:
+        """Contadores de uso do cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "generation": self._generation,
+            }
+
+
+# Resultados do Dashboard; invalidado por escritas em despesas, validações e alertas
+dashboard_cache = ResultCache(
+    ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS,
+    max_entries=settings.DASHBOARD_CACHE_MAX_ENTRIES,
+    max_bytes=settings.DASHBOARD_CACHE_MAX_BYTES,
+)
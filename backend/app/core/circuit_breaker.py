@@ -0,0 +1,85 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker para chamadas a serviços externos.
+
+    closed: chamadas liberadas; failure_threshold falhas seguidas abrem o circuito.
+    open: chamadas recusadas sem I/O até reset_timeout_seconds se passarem.
+    half_open: uma única chamada de teste (probe); sucesso fecha, falha reabre.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probe_in_flight = False
+        self._last_error: str | None = None
+        self._last_failure_at: datetime | None = None
+        self._last_success_at: datetime | None = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Indica se a chamada pode ser feita agora (em half_open, só o probe)."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout_seconds:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+            self._last_success_at = datetime.now(timezone.utc)
+
+    def record_failure(self, error: BaseException | str | None = None) -> None:
+        with self._lock:
+            self._failures += 1
+            self._last_error = str(error) if error is not None else None
+            self._last_failure_at = datetime.now(timezone.utc)
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        """Estado atual para diagnóstico (/health)."""
+        with self._lock:
+            retry_in = None
+            if self._state == self.OPEN:
+                retry_in = max(0.0, self.reset_timeout_seconds - (time.monotonic() - self._opened_at))
+            return {
+                "name": self.name,
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "retry_in_seconds": round(retry_in, 1) if retry_in is not None else None,
+                "last_error": self._last_error,
+                "last_failure_at": self._last_failure_at.isoformat() if self._last_failure_at else None,
+                "last_success_at": self._last_success_at.isoformat() if self._last_success_at else None,
+            }
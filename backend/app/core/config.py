@@ -18,6 +18,49 @@ class Settings(BaseSettings):
 
     # Cotação
     AWESOME_API_URL: str = "https://economia.awesomeapi.com.br/json/last/USD-BRL"
+    EXCHANGE_RATE_TTL_SECONDS: int = 600  # Após isso, leitura agenda nova busca
+    EXCHANGE_RATE_REFRESH_SECONDS: int = 300  # Intervalo do refresher em background
+    EXCHANGE_RATE_LATENCY_BUDGET_SECONDS: float = 3.0  # Tempo máximo por busca
+    EXCHANGE_RATE_BREAKER_FAILURES: int = 3  # Falhas seguidas que abrem o circuito
+    EXCHANGE_RATE_BREAKER_RESET_SECONDS: int = 60  # Tempo aberto antes do probe (half-open)
+
+    # Debug (ex.: tempos por widget em /dashboard/overview)
+    DEBUG: bool = False
+
+    # Cache de resultados do Dashboard (por processo)
+    DASHBOARD_CACHE_TTL_SECONDS: int = 60
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 1000
+    DASHBOARD_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    DASHBOARD_OVERVIEW_WORKERS: int = 4  # Widgets de /dashboard/overview em paralelo (1 = em sequência)
+
+    # Outbox de alertas: worker em background que entrega alertas pendentes
+    ALERT_OUTBOX_ENABLED: bool = True
+    ALERT_OUTBOX_POLL_SECONDS: float = 5.0  # Espera quando a fila está vazia
+    ALERT_OUTBOX_BATCH_SIZE: int = 100  # Alertas reivindicados por lote
+    ALERT_OUTBOX_CONCURRENCY: int = 10  # Entregas simultâneas por worker
+    ALERT_OUTBOX_LEASE_SECONDS: int = 300  # Após isso, alerta reivindicado e não concluído volta à fila
+    ALERT_OUTBOX_MAX_ATTEMPTS: int = 5  # Tentativas antes de marcar como falha
+    ALERT_OUTBOX_BACKOFF_BASE_SECONDS: float = 30.0  # Espera após a 1ª falha (dobra a cada tentativa)
+    ALERT_OUTBOX_BACKOFF_MAX_SECONDS: float = 3600.0
+    ALERT_DELIVERY_TIMEOUT_SECONDS: float = 10.0  # Tempo máximo por entrega
+
+    # Canais externos de alertas (vazio = canal desabilitado; alerta fica apenas in-app)
+    ALERT_SMTP_HOST: str = ""
+    ALERT_SMTP_PORT: int = 587
+    ALERT_SMTP_USERNAME: str = ""
+    ALERT_SMTP_PASSWORD: str = ""
+    ALERT_SMTP_FROM: str = ""
+    ALERT_SMTP_STARTTLS: bool = True
+    ALERT_WHATSAPP_URL: str = ""  # Webhook HTTP: POST JSON {"phone", "title", "message"}
+    ALERT_WHATSAPP_TOKEN: str = ""
+    ALERT_SMS_URL: str = ""
+    ALERT_SMS_TOKEN: str = ""
+
+    # Stream de alertas (GET /alerts/stream, Server-Sent Events)
+    ALERT_STREAM_HEARTBEAT_SECONDS: float = 15.0  # Ping para manter a conexão aberta em proxies
+    ALERT_STREAM_MAX_QUEUED: int = 100  # Eventos pendentes por conexão; acima disso, resync
+    ALERT_STREAM_REPLAY_SIZE: int = 1000  # Eventos recentes guardados para reconexão (Last-Event-ID)
+    ALERT_STREAM_TOKEN_TTL_SECONDS: int = 60  # Validade do token de /alerts/stream-token (só para abrir o stream)
 
     # CORS (produção: lista separada por vírgula, ex: "https://subs.nitrofund.com")
     CORS_ORIGINS: str = ""
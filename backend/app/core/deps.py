@@ -14,11 +14,17 @@ def get_current_user(
     db: Session = Depends(get_db)
 ) -> User:
     """Retorna o usuário logado a partir do token JWT (com companies para escopo)."""
-    
-    token = credentials.credentials
+    return authenticate_token(db, credentials.credentials)
+
+
+def authenticate_token(db: Session, token: str, scope: str | None = None) -> User:
+    """
+    Valida o token JWT e retorna o usuário ativo (401/403 como get_current_user).
+    scope: escopo exigido no token (None = token de acesso, sem escopo).
+    """
     payload = decode_access_token(token)
 
-    if not payload:
+    if not payload or payload.get("scope") != scope:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido ou expirado",
@@ -19,6 +19,10 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+# Escopo do token curto de GET /alerts/stream (vai na URL: não serve como token de acesso)
+STREAM_TOKEN_SCOPE = "alert_stream"
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.JWT_EXPIRATION_MINUTES)
@@ -28,6 +32,21 @@ def create_access_token(data: dict) -> str:
     return token
 
 
+def create_stream_token(user_id: str, session_expires_at: datetime) -> str:
+    """
+    Token de curta duração (ALERT_STREAM_TOKEN_TTL_SECONDS) para abrir o stream de alertas.
+    session_exp guarda a expiração do token de acesso que o emitiu: o stream fecha nela.
+    """
+    expire = datetime.now(timezone.utc) + timedelta(seconds=settings.ALERT_STREAM_TOKEN_TTL_SECONDS)
+    to_encode = {
+        "sub": user_id,
+        "scope": STREAM_TOKEN_SCOPE,
+        "exp": min(expire, session_expires_at),
+        "session_exp": int(session_expires_at.timestamp()),
+    }
+    return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+
 def decode_access_token(token: str) -> dict | None:
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
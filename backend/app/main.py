@@ -9,7 +9,9 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import get_db
-from app.api.v1.endpoints import auth, users, companies, departments, categories, expenses, expense_validations, alerts, dashboard
+from app.services.alert_outbox import alert_outbox
+from app.services.exchange_service import rate_provider
+from app.api.v1.endpoints import auth, users, companies, departments, categories, expenses, expense_validations, alerts, dashboard, exchange_rates
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +19,14 @@ RENEWAL_CHECK_INTERVAL_SECONDS = 6 * 3600  # 6 horas
 
 
 async def _renewal_alert_loop():
-    """Loop em background: avança renewal_date passadas e verifica alertas de renovação a cada 6 horas."""
-    from app.tasks.alert_tasks import check_and_create_renewal_alerts_7_3_1
+    """
+    Loop em background a cada 6 horas: avança renewal_date passadas, verifica alertas
+    de renovação e de validações vencidas.
+    """
+    from app.tasks.alert_tasks import (
+        check_and_create_renewal_alerts_7_3_1,
+        check_and_create_validation_overdue_alerts,
+    )
     from app.tasks.monthly_validation import advance_renewal_dates_task
 
     while True:
@@ -29,21 +37,34 @@ async def _renewal_alert_loop():
             logger.info("Verificação de renovação concluída: %s", result)
         except Exception:
             logger.exception("Erro na verificação automática de alertas de renovação")
+        try:
+            result = await asyncio.to_thread(check_and_create_validation_overdue_alerts)
+            logger.info("Verificação de validações vencidas concluída: %s", result)
+        except Exception:
+            logger.exception("Erro na verificação automática de validações vencidas")
         await asyncio.sleep(RENEWAL_CHECK_INTERVAL_SECONDS)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gerencia tarefas em background durante o ciclo de vida da aplicação."""
+    await rate_provider.start()
+    logger.info("Refresher de cotação USD-BRL iniciado (intervalo: %ds)", settings.EXCHANGE_RATE_REFRESH_SECONDS)
     task = asyncio.create_task(_renewal_alert_loop())
     logger.info("Scheduler de alertas de renovação iniciado (intervalo: %ds)", RENEWAL_CHECK_INTERVAL_SECONDS)
+    if settings.ALERT_OUTBOX_ENABLED:
+        await alert_outbox.start()
+        logger.info("Worker do outbox de alertas iniciado (lote: %d, concorrência: %d)",
+                    settings.ALERT_OUTBOX_BATCH_SIZE, settings.ALERT_OUTBOX_CONCURRENCY)
     yield
+    await alert_outbox.stop()
     task.cancel()
     try:
         await task
     except asyncio.CancelledError:
         pass
     logger.info("Scheduler de alertas de renovação encerrado")
+    await rate_provider.stop()
 
 
 app = FastAPI(
@@ -82,6 +103,7 @@ app.include_router(expenses.router, prefix="/api/v1")
 app.include_router(expense_validations.router, prefix="/api/v1")
 app.include_router(alerts.router, prefix="/api/v1")
 app.include_router(dashboard.router, prefix="/api/v1")
+app.include_router(exchange_rates.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -91,8 +113,10 @@ def root():
 
 @app.get("/health")
 def health_check(db: Session = Depends(get_db)):
+    # Breaker aberto não torna a API unhealthy: despesas em USD usam a última cotação boa
+    exchange_rate = rate_provider.health()
     try:
         db.execute(text("SELECT 1"))
-        return {"status": "healthy", "database": "connected"}
+        return {"status": "healthy", "database": "connected", "exchange_rate": exchange_rate}
     except Exception as e:
-        return {"status": "unhealthy", "database": str(e)}
\ No newline at end of file
+        return {"status": "unhealthy", "database": str(e), "exchange_rate": exchange_rate}
\ No newline at end of file
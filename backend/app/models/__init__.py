@@ -7,6 +7,8 @@ from app.models.department import Department
 from app.models.user import User, UserRole
 from app.models.expense import Expense, ExpenseType, Currency, Periodicity, PaymentMethod, ExpenseStatus
 from app.models.expense_validation import ExpenseValidation, ValidationStatus
+from app.models.expense_monthly_rollup import ExpenseMonthlyRollup
+from app.models.exchange_rate import ExchangeRate
 from app.models.alert import Alert, AlertType, AlertStatus, AlertChannel
 
 __all__ = [
@@ -27,6 +29,8 @@ __all__ = [
     "ExpenseStatus",
     "ExpenseValidation",
     "ValidationStatus",
+    "ExpenseMonthlyRollup",
+    "ExchangeRate",
     "Alert",
     "AlertType",
     "AlertStatus",
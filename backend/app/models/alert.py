@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Enum, ForeignKey, String, Text, Boolean, DateTime, Index
+from sqlalchemy import Column, Enum, ForeignKey, Integer, String, Text, Boolean, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
@@ -55,6 +55,14 @@ class Alert(Base, BaseModel):
     sent_at = Column(DateTime(timezone=True), nullable=True)
     read_at = Column(DateTime(timezone=True), nullable=True)
     error_message = Column(Text, nullable=True)  # Mensagem de erro se falhar
+
+    # Outbox: tentativas de entrega e quando o alerta pode ser reivindicado de novo
+    # (backoff após falha ou fim do lease de um worker)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Chave de deduplicação de alertas automáticos (ex.: renewal_upcoming:<despesa>:<data>:<dias>)
+    dedup_key = Column(String(255), nullable=True)
     
     # Relacionamentos ORM
     recipient = relationship("User", foreign_keys=[recipient_id])
@@ -66,4 +74,6 @@ class Alert(Base, BaseModel):
         Index('idx_alert_recipient_status', 'recipient_id', 'status'),
         Index('idx_alert_type_status', 'alert_type', 'status'),
         Index('idx_alert_expense', 'expense_id'),
+        Index('uq_alert_dedup_key', 'dedup_key', unique=True),
+        Index('idx_alert_outbox', 'status', 'next_attempt_at', 'created_at'),
     )
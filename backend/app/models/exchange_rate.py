@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Date, DateTime, Numeric, func
+
+from app.core.database import Base
+
+
+class ExchangeRate(Base):
+    """
+    Cotação diária para BRL (uma linha por moeda e dia).
+    Preenchida pelo rate_provider (última cotação do dia) e por importação de CSV histórico.
+    """
+    __tablename__ = "exchange_rates"
+
+    currency = Column(String(3), primary_key=True)  # Moeda de origem (ex.: "USD")
+    rate_date = Column(Date, primary_key=True)
+    rate = Column(Numeric(10, 4), nullable=False)  # Quantos BRL vale 1 unidade da moeda
+    source = Column(String(50), nullable=False)  # "awesomeapi", "csv"
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Enum, ForeignKey, Numeric, Date, DateTime, Integer
+from sqlalchemy import Column, String, Boolean, Enum, ForeignKey, Numeric, Date, DateTime, Integer, Index, Sequence, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
@@ -42,6 +42,15 @@ class ExpenseStatus(str, enum.Enum):
     MIGRATED = "migrated"
 
 
+# Numeração dos códigos DP01, DP02, ... (alocada atomicamente pelo Postgres)
+expense_code_seq = Sequence("expense_code_seq", metadata=Base.metadata)
+
+
+def format_expense_code(number: int) -> str:
+    """Formata o número sequencial como código de despesa (DP01 ... DP99, DP100, ...)."""
+    return f"DP{number:02d}"
+
+
 class Expense(Base, BaseModel):
     __tablename__ = "expenses"
 
@@ -113,4 +122,17 @@ class Expense(Base, BaseModel):
     approver = relationship("User", foreign_keys=[approver_id])
     created_by = relationship("User", foreign_keys=[created_by_id])
     cancelled_by = relationship("User", foreign_keys=[cancelled_by_id])
-    validations = relationship("ExpenseValidation", back_populates="expense")
\ No newline at end of file
+    validations = relationship("ExpenseValidation", back_populates="expense")
+
+    # Índices
+    __table_args__ = (
+        # Paginação por keyset em (created_at DESC, id DESC); B-tree é percorrida de trás para frente
+        Index('ix_expenses_created_at_id', 'created_at', 'id'),
+        # Varredura de renovações (alert_tasks): despesas ativas por renewal_date
+        Index('ix_expenses_active_renewal_date', 'renewal_date', postgresql_where=text("status = 'active'")),
+        # Busca aproximada (pg_trgm): GET /expenses/search e ilike '%termo%' em service_name
+        Index('ix_expenses_service_name_trgm', 'service_name', postgresql_using='gin', postgresql_ops={'service_name': 'gin_trgm_ops'}),
+        Index('ix_expenses_description_trgm', 'description', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+        Index('ix_expenses_contracted_plan_trgm', 'contracted_plan', postgresql_using='gin', postgresql_ops={'contracted_plan': 'gin_trgm_ops'}),
+        Index('ix_expenses_code_trgm', 'code', postgresql_using='gin', postgresql_ops={'code': 'gin_trgm_ops'}),
+    )
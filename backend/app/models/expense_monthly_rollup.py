@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Enum, ForeignKey, Date, Numeric, Integer, Index
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+from app.models.expense import ExpenseStatus, ExpenseType
+
+
+class ExpenseMonthlyRollup(Base):
+    """
+    Agregado de despesas por mês de criação (UTC) e dimensões do dashboard.
+    Mantido incrementalmente por rollup_service a cada escrita em expenses;
+    reconstruído por scripts/rebuild_expense_rollup.py.
+    """
+    __tablename__ = "expense_monthly_rollup"
+
+    month = Column(Date, primary_key=True)  # Primeiro dia do mês de created_at
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), primary_key=True)
+    department_id = Column(UUID(as_uuid=True), ForeignKey("departments.id"), primary_key=True)
+    category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id"), primary_key=True)
+    status = Column(
+        Enum(ExpenseStatus, values_callable=lambda x: [e.value for e in x]),
+        primary_key=True,
+    )
+    expense_type = Column(
+        Enum(ExpenseType, values_callable=lambda x: [e.value for e in x]),
+        primary_key=True,
+    )
+
+    total_value_brl = Column(Numeric(14, 2), nullable=False, default=0)
+    expense_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('idx_expense_rollup_company_month', 'company_id', 'month'),
+    )
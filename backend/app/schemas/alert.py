@@ -66,3 +66,21 @@ class AlertStatsResponse(BaseModel):
     sent: int
     failed: int
     read: int
+
+
+class AlertBulkReadRequest(BaseModel):
+    """Marcar vários alertas do usuário como lidos: por ids e/ou por filtro (tipo, status)"""
+    ids: list[UUID] | None = None
+    alert_type: AlertType | None = None
+    status: AlertStatus | None = None
+
+
+class AlertBulkReadResponse(BaseModel):
+    """Quantidade de alertas marcados como lidos"""
+    updated: int
+
+
+class AlertStreamTokenResponse(BaseModel):
+    """Token curto para abrir GET /alerts/stream?token= (EventSource não envia cabeçalhos)"""
+    token: str
+    expires_in: int  # Segundos
@@ -113,3 +113,64 @@ class UpcomingRenewalItem(BaseModel):
 class UpcomingRenewalsResponse(BaseModel):
     items: list[UpcomingRenewalItem]
     count: int
+
+
+class DashboardOverviewResponse(BaseModel):
+    """Todos os widgets do Dashboard em uma única resposta."""
+    stats: DashboardStatsResponse
+    by_category: CategoryExpenseResponse
+    by_company: CompanyExpenseResponse
+    by_department: DepartmentExpenseResponse
+    timeline: TimelineDataResponse
+    top_expenses: TopExpenseResponse
+    by_status: StatusDistributionResponse
+    upcoming_renewals: UpcomingRenewalsResponse
+    timings_ms: Optional[dict[str, float]] = None  # Tempo por widget (apenas com DEBUG)
+
+
+class DashboardCacheStatsResponse(BaseModel):
+    """Contadores do cache de resultados do Dashboard (por processo)."""
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    entries: int
+    bytes: int
+    generation: int
+
+
+class ForecastItem(BaseModel):
+    company_id: UUID
+    company_name: str
+    department_id: UUID
+    department_name: str
+    category_id: UUID
+    category_name: str
+    total_value: Decimal
+
+
+class ForecastMonth(BaseModel):
+    month: str  # YYYY-MM
+    total_value: Decimal
+    items: list[ForecastItem]
+
+
+class ForecastResponse(BaseModel):
+    """Desembolso previsto das despesas recorrentes ativas, mês a mês."""
+    months: list[ForecastMonth]
+    total: Decimal
+
+
+class HistoricalSpendPoint(BaseModel):
+    month: str  # YYYY-MM
+    total_value: Decimal  # Moeda estrangeira pela cotação vigente no mês
+    total_value_current: Decimal  # Pelo value_brl atual das despesas
+    foreign_value: Decimal  # Soma dos valores em moeda estrangeira (sem conversão)
+    count: int
+
+
+class HistoricalSpendResponse(BaseModel):
+    """Gasto mensal (validações cobradas) a cotações históricas."""
+    data: list[HistoricalSpendPoint]
+    total_value: Decimal
+    total_value_current: Decimal
@@ -0,0 +1,33 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+
+class ExchangeRateResponse(BaseModel):
+    currency: str
+    rate_date: date
+    rate: Decimal
+    source: str
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ExchangeRateImportError(BaseModel):
+    line: int
+    error: str
+
+
+class ExchangeRateImportResponse(BaseModel):
+    imported: int
+    errors: list[ExchangeRateImportError]
+
+
+class ExchangeRateRevalueResponse(BaseModel):
+    """Resultado da reavaliação de value_brl pela cotação mais recente."""
+    currency: str
+    rate: Decimal
+    rate_date: date
+    updated: int
@@ -153,4 +153,61 @@ class UserBasic(BaseModel):
     email: str
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ExpensePageResponse(BaseModel):
+    """Página de despesas (paginação por cursor). next_cursor é None na última página."""
+    items: list[ExpenseWithRelationsResponse]
+    next_cursor: str | None = None
+
+
+class ExpenseSummaryResponse(BaseModel):
+    """Linha enxuta da listagem (view=summary): colunas da tabela + nomes das relações."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    code: str
+    service_name: str
+    expense_type: ExpenseType
+    status: ExpenseStatus
+    value: Decimal
+    currency: Currency
+    value_brl: Decimal
+    periodicity: Periodicity | None
+    renewal_date: date | None
+    category_id: UUID
+    company_id: UUID
+    department_id: UUID
+    owner_id: UUID
+    created_at: datetime
+    category_name: str
+    company_name: str
+    department_name: str
+    owner_name: str
+
+
+class ExpenseSummaryPageResponse(BaseModel):
+    """Página de despesas no modo resumido (view=summary)."""
+    items: list[ExpenseSummaryResponse]
+    next_cursor: str | None = None
+
+
+class ExpenseSearchResult(ExpenseSummaryResponse):
+    """Resultado da busca aproximada: linha resumida + similaridade (0 a 1)."""
+    score: float
+
+
+class ExpenseBulkRowResult(BaseModel):
+    """Resultado de uma linha da importação em lote (row = posição no payload, a partir de 0)."""
+    row: int
+    success: bool
+    expense_id: UUID | None = None
+    code: str | None = None
+    errors: list[str] = []
+
+
+class ExpenseBulkResponse(BaseModel):
+    """Relatório da importação em lote."""
+    created: int
+    failed: int
+    rows: list[ExpenseBulkRowResult]
@@ -25,6 +25,30 @@ class RejectRequest(BaseModel):
     charged_this_month: bool = False
 
 
+class ValidationBulkRequest(BaseModel):
+    """Aprovação/rejeição em lote: ids a aprovar e a rejeitar (charged_this_month vale para todas as rejeitadas)"""
+    approve: list[UUID] = []
+    reject: list[UUID] = []
+    charged_this_month: bool = False
+
+
+class ValidationBulkResult(BaseModel):
+    """Resultado de um id do lote (status = status atual da validação, quando encontrada)"""
+    id: UUID
+    action: str  # "approve" ou "reject"
+    success: bool
+    status: ValidationStatus | None = None
+    error: str | None = None
+
+
+class ValidationBulkResponse(BaseModel):
+    """Relatório da aprovação/rejeição em lote"""
+    approved: int
+    rejected: int
+    failed: int
+    results: list[ValidationBulkResult]
+
+
 class ExpenseValidationResponse(BaseModel):
     """Schema básico de resposta de validação"""
     id: UUID | None = None  # Opcional para validações previstas
@@ -96,3 +120,11 @@ class ExpenseValidationWithExpenseResponse(ExpenseValidationResponse):
 
     class Config:
         from_attributes = True
+
+
+class PredictedValidationsMonth(BaseModel):
+    """Validações previstas de um mês (GET /expense-validations/predicted/by-month)"""
+    month: date
+    count: int
+    total_value_brl: Decimal
+    validations: list[ExpenseValidationWithExpenseResponse]
@@ -0,0 +1,177 @@
+import asyncio
+import smtplib
+from email.message import EmailMessage
+
+import httpx
+
+from app.core.config import settings
+from app.models.alert import AlertChannel
+
+
+class DeliveryError(Exception):
+    """
+    Falha ao entregar um alerta por um canal.
+    retryable=False indica falha definitiva (ex.: destinatário sem email/telefone,
+    endereço recusado): o alerta é marcado como falho sem novas tentativas.
+    """
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class ChannelAdapter:
+    """
+    Adapter de entrega de um canal (AlertChannel).
+
+    send() recebe o alerta reivindicado pelo outbox, com os dados do destinatário
+    já resolvidos: id, title, message, recipient_name, recipient_email, recipient_phone.
+    Sucesso = retorno normal; falha = DeliveryError (ou qualquer exceção, tratada como temporária).
+    """
+
+    async def send(self, alert) -> None:
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """Libera conexões do adapter (chamado ao encerrar o worker)."""
+
+
+class InAppAdapter(ChannelAdapter):
+    """Canal sem transporte externo configurado: o alerta já é exibido no app."""
+
+    async def send(self, alert) -> None:
+        return None
+
+
+class EmailAdapter(ChannelAdapter):
+    """Envio por SMTP (smtplib em thread, uma conexão por mensagem)."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        sender: str,
+        username: str = "",
+        password: str = "",
+        starttls: bool = True,
+        timeout_seconds: float = 10.0,
+    ):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout_seconds = timeout_seconds
+
+    def _send_sync(self, message: EmailMessage) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout_seconds) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(message)
+
+    async def send(self, alert) -> None:
+        if not alert.recipient_email:
+            raise DeliveryError("Destinatário sem email", retryable=False)
+
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = alert.recipient_email
+        message["Subject"] = alert.title
+        message.set_content(alert.message)
+
+        try:
+            await asyncio.to_thread(self._send_sync, message)
+        except smtplib.SMTPRecipientsRefused as e:
+            raise DeliveryError(f"Email recusado: {e}", retryable=False) from e
+        except smtplib.SMTPResponseException as e:
+            # 5xx é definitivo, exceto falha de autenticação (configuração, não o alerta)
+            permanent = e.smtp_code >= 500 and not isinstance(e, smtplib.SMTPAuthenticationError)
+            raise DeliveryError(f"SMTP {e.smtp_code}: {e.smtp_error!r}", retryable=not permanent) from e
+        except (smtplib.SMTPException, OSError) as e:
+            raise DeliveryError(f"Erro SMTP: {e}") from e
+
+
+class WebhookAdapter(ChannelAdapter):
+    """
+    Envio por gateway HTTP (WhatsApp, SMS): POST JSON {"phone", "title", "message"}
+    com Bearer token. 2xx = entregue; 408, 429 e 5xx = tentar de novo; outros 4xx = falha definitiva.
+    """
+
+    RETRYABLE_STATUS = {408, 425, 429}
+
+    def __init__(self, name: str, url: str, token: str = "", timeout_seconds: float = 10.0, max_connections: int = 10):
+        self.name = name
+        self.url = url
+        self.token = token
+        self.timeout_seconds = timeout_seconds
+        self.max_connections = max_connections
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            headers = {"Authorization": f"Bearer {self.token}"} if self.token else None
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_seconds,
+                headers=headers,
+                limits=httpx.Limits(max_connections=self.max_connections),
+            )
+        return self._client
+
+    async def send(self, alert) -> None:
+        if not alert.recipient_phone:
+            raise DeliveryError("Destinatário sem telefone", retryable=False)
+
+        payload = {"phone": alert.recipient_phone, "title": alert.title, "message": alert.message}
+        try:
+            response = await self._get_client().post(self.url, json=payload)
+        except httpx.HTTPError as e:
+            raise DeliveryError(f"Erro {self.name}: {e!r}") from e
+
+        if response.is_success:
+            return
+        retryable = response.status_code >= 500 or response.status_code in self.RETRYABLE_STATUS
+        raise DeliveryError(f"{self.name} HTTP {response.status_code}", retryable=retryable)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def build_adapters() -> dict[AlertChannel, ChannelAdapter]:
+    """Adapters dos canais configurados nas settings (ALERT_SMTP_*, ALERT_WHATSAPP_*, ALERT_SMS_*)."""
+    timeout = settings.ALERT_DELIVERY_TIMEOUT_SECONDS
+    connections = settings.ALERT_OUTBOX_CONCURRENCY
+    adapters: dict[AlertChannel, ChannelAdapter] = {}
+    if settings.ALERT_SMTP_HOST:
+        adapters[AlertChannel.EMAIL] = EmailAdapter(
+            host=settings.ALERT_SMTP_HOST,
+            port=settings.ALERT_SMTP_PORT,
+            sender=settings.ALERT_SMTP_FROM or settings.ALERT_SMTP_USERNAME,
+            username=settings.ALERT_SMTP_USERNAME,
+            password=settings.ALERT_SMTP_PASSWORD,
+            starttls=settings.ALERT_SMTP_STARTTLS,
+            timeout_seconds=timeout,
+        )
+    if settings.ALERT_WHATSAPP_URL:
+        adapters[AlertChannel.WHATSAPP] = WebhookAdapter(
+            "WhatsApp", settings.ALERT_WHATSAPP_URL, settings.ALERT_WHATSAPP_TOKEN, timeout, connections
+        )
+    if settings.ALERT_SMS_URL:
+        adapters[AlertChannel.SMS] = WebhookAdapter(
+            "SMS", settings.ALERT_SMS_URL, settings.ALERT_SMS_TOKEN, timeout, connections
+        )
+    return adapters
+
+
+def configured_channels() -> set[AlertChannel]:
+    """Canais com transporte externo configurado (os demais são apenas in-app)."""
+    configured = {
+        AlertChannel.EMAIL: settings.ALERT_SMTP_HOST,
+        AlertChannel.WHATSAPP: settings.ALERT_WHATSAPP_URL,
+        AlertChannel.SMS: settings.ALERT_SMS_URL,
+    }
+    return {channel for channel, target in configured.items() if target}
@@ -0,0 +1,283 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import dashboard_cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.alert import Alert, AlertChannel, AlertStatus
+from app.models.user import User
+from app.services.alert_channels import ChannelAdapter, DeliveryError, InAppAdapter, build_adapters
+
+logger = logging.getLogger(__name__)
+
+RECIPIENT_INACTIVE_ERROR = "Destinatário não encontrado ou inativo"
+
+_in_app = InAppAdapter()
+
+
+def claim_batch(db: Session, limit: int, lease_seconds: float) -> list:
+    """
+    Reivindica até limit alertas pendentes e vencidos (next_attempt_at nulo ou no passado),
+    em um único UPDATE ... RETURNING com SELECT ... FOR UPDATE SKIP LOCKED: workers
+    concorrentes pegam lotes disjuntos sem esperar uns pelos outros.
+    O alerta reivindicado ganha uma tentativa e um lease (next_attempt_at = agora + lease):
+    se o worker morrer no meio da entrega, volta à fila quando o lease expira.
+    Os dados do destinatário vêm na mesma instrução (UPDATE ... FROM users).
+    """
+    alerts = Alert.__table__
+    users = User.__table__
+    claimable = select(alerts.c.id).where(
+        alerts.c.status == AlertStatus.PENDING,
+        or_(alerts.c.next_attempt_at.is_(None), alerts.c.next_attempt_at <= func.now()),
+    ).order_by(alerts.c.created_at).limit(limit).with_for_update(skip_locked=True)
+
+    stmt = update(alerts).where(
+        alerts.c.id.in_(claimable),
+        alerts.c.recipient_id == users.c.id,
+    ).values(
+        attempts=alerts.c.attempts + 1,
+        next_attempt_at=func.now() + timedelta(seconds=lease_seconds),
+    ).returning(
+        alerts.c.id,
+        alerts.c.channel,
+        alerts.c.title,
+        alerts.c.message,
+        alerts.c.attempts,
+        users.c.name.label("recipient_name"),
+        users.c.email.label("recipient_email"),
+        users.c.phone.label("recipient_phone"),
+        users.c.is_active.label("recipient_active"),
+    )
+    rows = db.execute(stmt).all()
+    db.commit()
+    return rows
+
+
+async def deliver_batch(
+    rows: list,
+    adapters: dict[AlertChannel, ChannelAdapter],
+    concurrency: int,
+    timeout_seconds: float,
+) -> list[tuple]:
+    """
+    Entrega os alertas reivindicados pelos adapters dos canais, no máximo concurrency
+    ao mesmo tempo. Canal sem adapter = apenas in-app (entregue).
+    Retorna (alerta, erro, retryable) por alerta; erro None = entregue.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def deliver(row) -> tuple:
+        if not row.recipient_active:
+            return row, RECIPIENT_INACTIVE_ERROR, False
+        adapter = adapters.get(row.channel, _in_app)
+        async with semaphore:
+            try:
+                await asyncio.wait_for(adapter.send(row), timeout=timeout_seconds)
+            except DeliveryError as e:
+                return row, str(e), e.retryable
+            except asyncio.TimeoutError:
+                return row, f"Tempo de entrega excedido ({timeout_seconds}s)", True
+            except Exception as e:
+                logger.exception("Erro inesperado ao entregar alerta %s", row.id)
+                return row, str(e) or type(e).__name__, True
+        return row, None, False
+
+    return await asyncio.gather(*(deliver(row) for row in rows))
+
+
+def backoff_seconds(attempts: int, base_seconds: float, max_seconds: float) -> float:
+    """Espera antes da próxima tentativa: base * 2^(tentativas - 1), limitada, com jitter (50% a 100%)."""
+    delay = min(max_seconds, base_seconds * 2 ** max(attempts - 1, 0))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def complete_batch(
+    db: Session,
+    results: list[tuple],
+    max_attempts: int,
+    backoff_base_seconds: float,
+    backoff_max_seconds: float,
+) -> dict:
+    """
+    Grava o resultado das entregas em um único UPDATE (executemany):
+    entregue -> SENT; falha temporária -> continua PENDING com next_attempt_at em backoff
+    exponencial; falha definitiva ou tentativas esgotadas -> FAILED.
+    Só atualiza se o alerta ainda está PENDING com o mesmo número de tentativas (outro
+    worker não o reivindicou após o lease expirar e o usuário não o marcou como lido).
+    """
+    stats = {"processed": len(results), "sent": 0, "failed": 0, "retrying": 0}
+    if not results:
+        return stats
+
+    now = datetime.now(timezone.utc)
+    params = []
+    for row, error, retryable in results:
+        if error is None:
+            status, next_attempt_at = AlertStatus.SENT, None
+            stats["sent"] += 1
+        elif retryable and row.attempts < max_attempts:
+            delay = backoff_seconds(row.attempts, backoff_base_seconds, backoff_max_seconds)
+            status, next_attempt_at = AlertStatus.PENDING, now + timedelta(seconds=delay)
+            stats["retrying"] += 1
+        else:
+            status, next_attempt_at = AlertStatus.FAILED, None
+            stats["failed"] += 1
+        params.append({
+            "b_id": row.id,
+            "b_attempts": row.attempts,
+            "b_status": status,
+            "b_sent_at": now if error is None else None,
+            "b_error": error,
+            "b_next_attempt_at": next_attempt_at,
+        })
+
+    alerts = Alert.__table__
+    stmt = update(alerts).where(
+        alerts.c.id == bindparam("b_id"),
+        alerts.c.attempts == bindparam("b_attempts"),
+        alerts.c.status == AlertStatus.PENDING,
+    ).values(
+        status=bindparam("b_status"),
+        sent_at=bindparam("b_sent_at"),
+        error_message=bindparam("b_error"),
+        next_attempt_at=bindparam("b_next_attempt_at"),
+        updated_at=now,
+    )
+    db.execute(stmt, params)
+    db.commit()
+    dashboard_cache.invalidate()
+    return stats
+
+
+def drain_once_sync(db: Session, limit: int) -> dict:
+    """Um lote do outbox a partir de código síncrono (endpoint /alerts/process-pending, tasks)."""
+    rows = claim_batch(db, limit, settings.ALERT_OUTBOX_LEASE_SECONDS)
+    if not rows:
+        return {"processed": 0, "sent": 0, "failed": 0, "retrying": 0}
+
+    async def deliver() -> list[tuple]:
+        adapters = build_adapters()
+        try:
+            return await deliver_batch(
+                rows, adapters, settings.ALERT_OUTBOX_CONCURRENCY, settings.ALERT_DELIVERY_TIMEOUT_SECONDS
+            )
+        finally:
+            for adapter in adapters.values():
+                await adapter.aclose()
+
+    results = asyncio.run(deliver())
+    return complete_batch(
+        db,
+        results,
+        settings.ALERT_OUTBOX_MAX_ATTEMPTS,
+        settings.ALERT_OUTBOX_BACKOFF_BASE_SECONDS,
+        settings.ALERT_OUTBOX_BACKOFF_MAX_SECONDS,
+    )
+
+
+class AlertOutboxWorker:
+    """
+    Worker do outbox de alertas (iniciado no lifespan).
+
+    Em loop: reivindica um lote (claim_batch), entrega com concorrência limitada
+    (deliver_batch) e grava os resultados (complete_batch). Com a fila vazia, espera
+    poll_seconds. Vários workers (processos da API) drenam a fila em paralelo:
+    o SKIP LOCKED garante lotes disjuntos.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        concurrency: int,
+        poll_seconds: float,
+        lease_seconds: float,
+        max_attempts: int,
+        backoff_base_seconds: float,
+        backoff_max_seconds: float,
+        delivery_timeout_seconds: float,
+        adapters_factory: Callable[[], dict[AlertChannel, ChannelAdapter]] = build_adapters,
+    ):
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.delivery_timeout_seconds = delivery_timeout_seconds
+        self.adapters_factory = adapters_factory
+        self._adapters: dict[AlertChannel, ChannelAdapter] = {}
+        self._task: asyncio.Task | None = None
+
+    def _claim(self) -> list:
+        db = SessionLocal()
+        try:
+            return claim_batch(db, self.batch_size, self.lease_seconds)
+        finally:
+            db.close()
+
+    def _complete(self, results: list[tuple]) -> dict:
+        db = SessionLocal()
+        try:
+            return complete_batch(
+                db, results, self.max_attempts, self.backoff_base_seconds, self.backoff_max_seconds
+            )
+        finally:
+            db.close()
+
+    async def drain_once(self) -> dict:
+        """Processa um lote; retorna as estatísticas (processed = 0 com a fila vazia)."""
+        rows = await asyncio.to_thread(self._claim)
+        if not rows:
+            return {"processed": 0, "sent": 0, "failed": 0, "retrying": 0}
+        results = await deliver_batch(rows, self._adapters, self.concurrency, self.delivery_timeout_seconds)
+        return await asyncio.to_thread(self._complete, results)
+
+    async def _run(self):
+        while True:
+            try:
+                stats = await self.drain_once()
+                if stats["processed"]:
+                    logger.info("Outbox de alertas: %s", stats)
+            except Exception:
+                logger.exception("Erro no worker do outbox de alertas")
+                stats = None
+            # Lote cheio: provavelmente há mais na fila, segue sem esperar
+            if stats is None or stats["processed"] < self.batch_size:
+                await asyncio.sleep(self.poll_seconds)
+
+    async def start(self):
+        """Inicia o worker em background (chamado no lifespan)."""
+        self._adapters = self.adapters_factory()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Encerra o worker e fecha as conexões dos adapters."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for adapter in self._adapters.values():
+            await adapter.aclose()
+        self._adapters = {}
+
+
+alert_outbox = AlertOutboxWorker(
+    batch_size=settings.ALERT_OUTBOX_BATCH_SIZE,
+    concurrency=settings.ALERT_OUTBOX_CONCURRENCY,
+    poll_seconds=settings.ALERT_OUTBOX_POLL_SECONDS,
+    lease_seconds=settings.ALERT_OUTBOX_LEASE_SECONDS,
+    max_attempts=settings.ALERT_OUTBOX_MAX_ATTEMPTS,
+    backoff_base_seconds=settings.ALERT_OUTBOX_BACKOFF_BASE_SECONDS,
+    backoff_max_seconds=settings.ALERT_OUTBOX_BACKOFF_MAX_SECONDS,
+    delivery_timeout_seconds=settings.ALERT_DELIVERY_TIMEOUT_SECONDS,
+)
@@ -3,13 +3,17 @@ from datetime import datetime, timezone, timedelta, date
 from typing import Optional
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, select, update
+from sqlalchemy.dialects.postgresql import insert
 
+from app.core.cache import dashboard_cache
 from app.models.alert import Alert, AlertType, AlertStatus, AlertChannel
 from app.models.user import User
 from app.models.expense import Expense, ExpenseStatus
 from app.models.expense_validation import ExpenseValidation, ValidationStatus
-
+from app.services import alert_outbox
+from app.services.alert_channels import configured_channels
+from app.services.alert_stream import alert_broker
 
 def create_alert(
     db: Session,
@@ -19,11 +23,11 @@ def create_alert(
     recipient_id: UUID,
     expense_id: Optional[UUID] = None,
     validation_id: Optional[UUID] = None,
-    channel: AlertChannel = AlertChannel.EMAIL  # Canal padrão (envio externo desabilitado; alertas apenas in-app)
+    channel: AlertChannel = AlertChannel.EMAIL  # Canal padrão (sem ALERT_SMTP_HOST, apenas in-app)
 ) -> Alert:
     """
     Cria um novo alerta no sistema.
-    Alertas são exibidos no app; envio externo (WhatsApp, etc.) foi desabilitado.
+    Alertas são exibidos no app; canais externos configurados são entregues pelo worker do outbox.
     """
     alert = Alert(
         alert_type=alert_type,
@@ -38,15 +42,31 @@ def create_alert(
     
     db.add(alert)
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(alert)
+    alert_broker.publish_alert(alert)
     
     return alert
 
 
+def delivery_state(channel: AlertChannel, recipient_active: bool, now: datetime) -> dict:
+    """
+    Estado de entrega de um alerta novo (status, sent_at, error_message):
+    canal com transporte externo configurado -> PENDING, entregue pelo worker do outbox;
+    senão apenas in-app -> SENT; destinatário inativo -> FAILED.
+    """
+    if not recipient_active:
+        return {"status": AlertStatus.FAILED, "sent_at": None, "error_message": alert_outbox.RECIPIENT_INACTIVE_ERROR}
+    if channel in configured_channels():
+        return {"status": AlertStatus.PENDING, "sent_at": None, "error_message": None}
+    return {"status": AlertStatus.SENT, "sent_at": now, "error_message": None}
+
+
 def send_alert(db: Session, alert_id: UUID) -> Alert:
     """
-    Marca o alerta como enviado (disponível no app).
-    Envio externo (WhatsApp, email, SMS) foi desabilitado; alertas são apenas in-app.
+    Envia o alerta: sem transporte externo para o canal, marca como enviado (disponível no app);
+    com transporte configurado (ALERT_SMTP_*, ALERT_WHATSAPP_*, ALERT_SMS_*), o alerta continua
+    pendente e é entregue pelo worker do outbox.
     """
     alert = db.query(Alert).filter(Alert.id == alert_id).first()
     
@@ -58,19 +78,19 @@ def send_alert(db: Session, alert_id: UUID) -> Alert:
     
     recipient = db.query(User).filter(User.id == alert.recipient_id).first()
     
-    if not recipient or not recipient.is_active:
-        alert.status = AlertStatus.FAILED
-        alert.error_message = "Destinatário não encontrado ou inativo"
-        alert.updated_at = datetime.now(timezone.utc)
-        db.commit()
+    now = datetime.now(timezone.utc)
+    state = delivery_state(alert.channel, bool(recipient and recipient.is_active), now)
+    if state["status"] == AlertStatus.PENDING:
         return alert
-    
-    # Alertas apenas in-app (sem envio externo)
-    alert.status = AlertStatus.SENT
-    alert.sent_at = datetime.now(timezone.utc)
-    alert.updated_at = datetime.now(timezone.utc)
+
+    alert.status = state["status"]
+    alert.sent_at = state["sent_at"]
+    alert.error_message = state["error_message"]
+    alert.updated_at = now
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(alert)
+    alert_broker.publish_alert(alert)
     
     return alert
 
@@ -145,11 +165,76 @@ def mark_as_read(db: Session, alert_id: UUID) -> Alert:
     alert.updated_at = datetime.now(timezone.utc)
     
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(alert)
+    alert_broker.publish_alert(alert)
     
     return alert
 
 
+def mark_many_as_read(
+    db: Session,
+    recipient_id: UUID,
+    alert_ids: Optional[list[UUID]] = None,
+    alert_type: Optional[AlertType] = None,
+    status: Optional[AlertStatus] = None,
+) -> int:
+    """
+    Marca como lidos os alertas não lidos do destinatário (opcionalmente só alert_ids,
+    alert_type e/ou status) em um único UPDATE ... RETURNING, contado no banco.
+    Alertas de outros destinatários nunca são alterados. Retorna quantos foram marcados.
+    """
+    alerts = Alert.__table__
+    filters = [alerts.c.recipient_id == recipient_id, alerts.c.status != AlertStatus.READ]
+    if alert_ids is not None:
+        filters.append(alerts.c.id.in_(alert_ids))
+    if alert_type is not None:
+        filters.append(alerts.c.alert_type == alert_type)
+    if status is not None:
+        filters.append(alerts.c.status == status)
+
+    now = datetime.now(timezone.utc)
+    updated = update(alerts).where(*filters).values(
+        status=AlertStatus.READ,
+        read_at=now,
+        updated_at=now,
+    ).returning(alerts.c.id).cte("updated")
+    count = db.execute(select(func.count()).select_from(updated)).scalar_one()
+    db.commit()
+
+    if count:
+        # Contador de não lidos do dashboard (cache) e demais abas do usuário (stream)
+        dashboard_cache.invalidate()
+        alert_broker.publish_read(recipient_id, count)
+    return count
+
+
+def validation_overdue_dedup_key(validation_id: UUID) -> str:
+    """Chave de deduplicação do alerta de validação vencida (um por validação)."""
+    return f"validation_overdue:{validation_id}"
+
+
+def validation_overdue_content(
+    recipient_name: str,
+    service_name: str,
+    value_brl,
+    department_name: str | None,
+    validation_month: date,
+) -> tuple[str, str]:
+    """Título e mensagem do alerta de validação vencida."""
+    title = "Validação de Despesa Vencida"
+    message = (
+        f"⚠️ *Validação Vencida*\n\n"
+        f"Olá {recipient_name},\n\n"
+        f"A validação da despesa *{service_name}* está vencida.\n"
+        f"Por favor, acesse o sistema para validar.\n\n"
+        f"Valor: R$ {value_brl:.2f}\n"
+        f"Setor: {department_name or 'N/A'}\n"
+        f"Mês de referência: {validation_month.strftime('%m/%Y')}"
+    )
+    return title, message
+
+
 def create_validation_overdue_alert(
     db: Session,
     validation: ExpenseValidation,
@@ -163,15 +248,12 @@ def create_validation_overdue_alert(
     if not expense:
         raise ValueError("Despesa não encontrada")
     
-    title = "Validação de Despesa Vencida"
-    message = (
-        f"⚠️ *Validação Vencida*\n\n"
-        f"Olá {recipient.name},\n\n"
-        f"A validação da despesa *{expense.service_name}* está vencida.\n"
-        f"Por favor, acesse o sistema para validar.\n\n"
-        f"Valor: R$ {expense.value_brl:.2f}\n"
-        f"Setor: {expense.department.name if expense.department else 'N/A'}\n"
-        f"Mês de referência: {validation.validation_month.strftime('%m/%Y')}"
+    title, message = validation_overdue_content(
+        recipient.name,
+        expense.service_name,
+        expense.value_brl,
+        expense.department.name if expense.department else None,
+        validation.validation_month,
     )
     
     return create_and_send_alert(
@@ -185,6 +267,32 @@ def create_validation_overdue_alert(
     )
 
 
+def renewal_upcoming_dedup_key(expense_id: UUID, renewal_date: date, days_until_renewal: int) -> str:
+    """Chave de deduplicação do alerta de renovação (uma por despesa, data de renovação e antecedência)."""
+    return f"renewal_upcoming:{expense_id}:{renewal_date.isoformat()}:{days_until_renewal}"
+
+
+def renewal_upcoming_content(
+    recipient_name: str,
+    service_name: str,
+    value_brl,
+    renewal_date: date | None,
+    contracted_plan: str | None,
+    days_until_renewal: int,
+) -> tuple[str, str]:
+    """Título e mensagem do alerta de renovação próxima."""
+    title = f"Renovação em {days_until_renewal} dias"
+    message = (
+        f"📅 *Renovação Próxima*\n\n"
+        f"Olá {recipient_name},\n\n"
+        f"A despesa *{service_name}* será renovada em *{days_until_renewal} dias*.\n\n"
+        f"Valor: R$ {value_brl:.2f}\n"
+        f"Data de renovação: {renewal_date.strftime('%d/%m/%Y') if renewal_date else 'N/A'}\n"
+        f"Plano: {contracted_plan or 'N/A'}"
+    )
+    return title, message
+
+
 def create_renewal_upcoming_alert(
     db: Session,
     expense: Expense,
@@ -198,14 +306,13 @@ def create_renewal_upcoming_alert(
     if not recipient:
         raise ValueError("Responsável da despesa não encontrado")
     
-    title = f"Renovação em {days_until_renewal} dias"
-    message = (
-        f"📅 *Renovação Próxima*\n\n"
-        f"Olá {recipient.name},\n\n"
-        f"A despesa *{expense.service_name}* será renovada em *{days_until_renewal} dias*.\n\n"
-        f"Valor: R$ {expense.value_brl:.2f}\n"
-        f"Data de renovação: {expense.renewal_date.strftime('%d/%m/%Y') if expense.renewal_date else 'N/A'}\n"
-        f"Plano: {expense.contracted_plan or 'N/A'}"
+    title, message = renewal_upcoming_content(
+        recipient.name,
+        expense.service_name,
+        expense.value_brl,
+        expense.renewal_date,
+        expense.contracted_plan,
+        days_until_renewal,
     )
     
     return create_and_send_alert(
@@ -218,6 +325,26 @@ def create_renewal_upcoming_alert(
     )
 
 
+def bulk_insert_alerts(db: Session, rows: list[dict]) -> int:
+    """
+    Insere vários alertas já prontos (colunas de Alert, incluindo id) em lote, em uma transação.
+    Linhas cuja dedup_key já existe são ignoradas (ON CONFLICT DO NOTHING), então
+    varreduras concorrentes não duplicam alertas. O RETURNING id mantém o executemany
+    em páginas multi-linha (insertmanyvalues) e diz quais linhas entraram; rowcount
+    não serve aqui. Retorna quantos foram inseridos e publica só esses no stream.
+    """
+    if not rows:
+        return 0
+    stmt = insert(Alert.__table__).on_conflict_do_nothing(
+        index_elements=[Alert.dedup_key],
+    ).returning(Alert.id)
+    inserted_ids = set(db.execute(stmt, rows).scalars())
+    db.commit()
+    dashboard_cache.invalidate()
+    alert_broker.publish_rows([row for row in rows if row["id"] in inserted_ids])
+    return len(inserted_ids)
+
+
 def create_renewal_due_alert(
     db: Session,
     expense: Expense
@@ -252,32 +379,8 @@ def create_renewal_due_alert(
 
 def process_pending_alerts(db: Session, limit: int = 50) -> dict:
     """
-    Processa alertas pendentes e tenta enviá-los.
+    Processa um lote de alertas pendentes agora, pelo mesmo caminho do worker do outbox
+    (reivindicação com SKIP LOCKED, entrega pelos adapters dos canais, backoff em falhas).
     Retorna estatísticas do processamento.
     """
-    pending_alerts = get_pending_alerts(db, limit)
-    
-    stats = {
-        "processed": 0,
-        "sent": 0,
-        "failed": 0
-    }
-    
-    for alert in pending_alerts:
-        try:
-            result = send_alert(db, alert.id)
-            stats["processed"] += 1
-            
-            if result.status == AlertStatus.SENT:
-                stats["sent"] += 1
-            else:
-                stats["failed"] += 1
-        except Exception as e:
-            stats["failed"] += 1
-            # Atualizar alerta com erro
-            alert.status = AlertStatus.FAILED
-            alert.error_message = str(e)
-            alert.updated_at = datetime.now(timezone.utc)
-            db.commit()
-    
-    return stats
+    return alert_outbox.drain_once_sync(db, limit)
@@ -0,0 +1,190 @@
+import asyncio
+import itertools
+import json
+import threading
+import uuid
+from collections import defaultdict, deque
+from uuid import UUID
+
+from app.core.config import settings
+from app.schemas.alert import AlertResponse
+
+# Defaults das colunas que não vêm nas linhas de bulk_insert_alerts
+_ROW_DEFAULTS = {"expense_id": None, "validation_id": None, "sent_at": None, "read_at": None, "error_message": None}
+
+
+class AlertEvent:
+    """Evento SSE já codificado (compartilhado por todas as conexões do destinatário)."""
+
+    def __init__(self, seq: int, event_id: str, recipient_id: UUID, event: str, data: str):
+        self.seq = seq
+        self.id = event_id
+        self.recipient_id = recipient_id
+        self.encoded = f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+
+
+RESYNC = "event: resync\ndata: {}\n\n"  # Cliente perdeu eventos: deve recarregar /alerts/me
+HEARTBEAT = ": ping\n\n"
+
+
+class AlertSubscription:
+    """
+    Conexão SSE de um destinatário. A fila é limitada (max_queued): se o cliente não
+    acompanhar, os eventos mais antigos são descartados e ele recebe um resync.
+    push() roda no event loop; next() é aguardado pelo gerador da resposta.
+    """
+
+    def __init__(self, recipient_id: UUID, max_queued: int):
+        self.recipient_id = recipient_id
+        self._events: deque[AlertEvent] = deque(maxlen=max_queued)
+        self._resync = False
+        self._wakeup = asyncio.Event()
+
+    def push(self, event: AlertEvent) -> None:
+        if len(self._events) == self._events.maxlen:
+            self._resync = True
+        self._events.append(event)
+        self._wakeup.set()
+
+    def push_resync(self) -> None:
+        self._resync = True
+        self._wakeup.set()
+
+    async def next(self, timeout: float) -> tuple[list[AlertEvent], bool]:
+        """Eventos pendentes e se é preciso resync; ([], False) se nada chegou em timeout segundos."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return [], False
+        self._wakeup.clear()
+        events = list(self._events)
+        self._events.clear()
+        resync, self._resync = self._resync, False
+        return events, resync
+
+
+class AlertBroker:
+    """
+    Pub/sub de alertas em memória para GET /alerts/stream
+    (eventos "alert" com o alerta criado/alterado e "read" após marcação em lote).
+
+    publish_*() pode ser chamado de qualquer thread (handlers síncronos, tasks): o evento
+    é serializado uma vez, guardado no buffer de replay e entregue às conexões do
+    destinatário pelo event loop. O buffer de replay (replay_size eventos) atende
+    reconexões com Last-Event-ID; ids têm o prefixo da época do processo, então um id
+    de outro processo ou anterior ao buffer resulta em resync.
+
+    Por processo: com vários workers, cada conexão recebe os eventos publicados
+    no processo em que está conectada.
+    """
+
+    def __init__(self, replay_size: int, max_queued: int):
+        self.replay_size = replay_size
+        self.max_queued = max_queued
+        self._epoch = uuid.uuid4().hex[:8]
+        self._seq = itertools.count(1)
+        self._floor = 0  # Eventos com seq <= floor não podem mais ser repetidos
+        self._replay: deque[AlertEvent] = deque(maxlen=replay_size)
+        self._subscribers: dict[UUID, set[AlertSubscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _parse_seq(self, last_event_id: str) -> int | None:
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self._epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def subscribe(self, recipient_id: UUID, last_event_id: str | None = None) -> tuple[AlertSubscription, list[AlertEvent] | None]:
+        """
+        Registra uma conexão (chamado no event loop). Retorna a assinatura e os eventos a
+        repetir desde last_event_id (None = não é possível repetir: o cliente deve fazer resync).
+        """
+        subscription = AlertSubscription(recipient_id, self.max_queued)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers[recipient_id].add(subscription)
+            if last_event_id is None:
+                return subscription, []
+            last_seq = self._parse_seq(last_event_id)
+            oldest = self._replay[0].seq if self._replay else self._floor + 1
+            if last_seq is None or last_seq < oldest - 1:
+                return subscription, None
+            return subscription, [
+                event for event in self._replay
+                if event.seq > last_seq and event.recipient_id == recipient_id
+            ]
+
+    def unsubscribe(self, subscription: AlertSubscription) -> None:
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.recipient_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[subscription.recipient_id]
+
+    def connections(self) -> int:
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+    def _dispatch(self, targets: list[tuple[AlertSubscription, AlertEvent | None]]) -> None:
+        for subscription, event in targets:
+            if event is None:
+                subscription.push_resync()
+            else:
+                subscription.push(event)
+
+    def _schedule(self, targets: list) -> None:
+        loop = self._loop
+        if targets and loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._dispatch, targets)
+
+    def _publish(self, recipient_id: UUID, event: str, data: str) -> None:
+        with self._lock:
+            seq = next(self._seq)
+            alert_event = AlertEvent(seq, f"{self._epoch}-{seq}", recipient_id, event, data)
+            self._replay.append(alert_event)
+            targets = [(subscription, alert_event) for subscription in self._subscribers.get(recipient_id, ())]
+        self._schedule(targets)
+
+    def publish_alert(self, alert, event: str = "alert") -> None:
+        """Publica um alerta (objeto Alert ou dict com as colunas) para o destinatário."""
+        if isinstance(alert, dict):
+            alert = {**_ROW_DEFAULTS, **alert}
+            recipient_id = alert["recipient_id"]
+        else:
+            recipient_id = alert.recipient_id
+        self._publish(recipient_id, event, AlertResponse.model_validate(alert).model_dump_json())
+
+    def publish_read(self, recipient_id: UUID, count: int) -> None:
+        """Publica que count alertas do destinatário foram marcados como lidos em lote."""
+        self._publish(recipient_id, "read", json.dumps({"count": count}))
+
+    def publish_rows(self, rows: list[dict]) -> None:
+        """
+        Publica alertas inseridos em lote. Se o lote não cabe no buffer de replay, envia
+        um resync a todas as conexões em vez de um evento por linha.
+        """
+        if len(rows) <= self.replay_size:
+            for row in rows:
+                self.publish_alert(row)
+            return
+        self.resync_all()
+
+    def resync_all(self) -> None:
+        """Descarta o buffer de replay e pede resync a todas as conexões."""
+        with self._lock:
+            self._floor = next(self._seq)
+            self._replay.clear()
+            targets = [
+                (subscription, None)
+                for subscriptions in self._subscribers.values()
+                for subscription in subscriptions
+            ]
+        self._schedule(targets)
+
+
+alert_broker = AlertBroker(
+    replay_size=settings.ALERT_STREAM_REPLAY_SIZE,
+    max_queued=settings.ALERT_STREAM_MAX_QUEUED,
+)
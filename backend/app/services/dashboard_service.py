@@ -1,17 +1,28 @@
+import functools
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
 from uuid import UUID
 from decimal import Decimal
 from datetime import datetime, date, timedelta
 from typing import Optional
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-from sqlalchemy.orm import joinedload
+from sqlalchemy import func, and_, or_, case, cast, literal, literal_column, select, String
+from sqlalchemy.orm import joinedload, aliased
 
-from app.models.expense import Expense, ExpenseStatus, ExpenseType
+from app.core.cache import dashboard_cache
+from app.core.config import settings
+from app.models.alert import Alert, AlertStatus
+from app.models.exchange_rate import ExchangeRate
+from app.models.expense import Expense, ExpenseStatus, ExpenseType, Currency
+from app.models.expense_monthly_rollup import ExpenseMonthlyRollup
+from app.models.expense_validation import ExpenseValidation, ValidationStatus
 from app.models.category import Category
 from app.models.company import Company
 from app.models.department import Department
 from app.models.user import User, UserRole
+from app.services import forecast_service
 from app.schemas.dashboard import (
     DashboardStatsResponse,
     CategoryExpenseItem,
@@ -28,6 +39,10 @@ from app.schemas.dashboard import (
     StatusDistributionResponse,
     UpcomingRenewalItem,
     UpcomingRenewalsResponse,
+    DashboardOverviewResponse,
+    ForecastResponse,
+    HistoricalSpendPoint,
+    HistoricalSpendResponse,
 )
 
 
@@ -38,11 +53,69 @@ KNOWN_ROLES = frozenset({
 })
 
 
+# Pool compartilhado pelas requisições de /dashboard/overview: limita as conexões
+# abertas pelos widgets a DASHBOARD_OVERVIEW_WORKERS por processo
+_overview_executor = (
+    ThreadPoolExecutor(max_workers=settings.DASHBOARD_OVERVIEW_WORKERS, thread_name_prefix="dashboard-overview")
+    if settings.DASHBOARD_OVERVIEW_WORKERS > 1 else None
+)
+
+
 def _role_value(role) -> str:
     """Normaliza role para string (enum ou string do DB)."""
     return role.value if hasattr(role, "value") else str(role)
 
 
+def _scope_fingerprint(current_user: User, per_user: bool = False) -> tuple:
+    """
+    Identifica o escopo de dados do usuário para a chave do cache:
+    admins compartilham entradas; líderes por conjunto de empresas;
+    demais roles (escopo por created_by) e widgets pessoais, por usuário.
+    """
+    role_val = (_role_value(current_user.role) or "").strip()
+    if role_val in (UserRole.SYSTEM_ADMIN.value, UserRole.FINANCE_ADMIN.value):
+        fingerprint = ("admin",)
+    elif role_val == UserRole.LEADER.value:
+        company_ids = sorted(str(c.id) for c in current_user.companies) if current_user.companies else []
+        fingerprint = (role_val, tuple(company_ids))
+    else:
+        return (role_val, str(current_user.id))
+    if per_user:
+        fingerprint += (str(current_user.id),)
+    return fingerprint
+
+
+def _cached(per_user: bool = False):
+    """
+    Guarda o resultado da função no dashboard_cache, com chave
+    (função, escopo do usuário, demais argumentos). per_user para resultados
+    que dependem do próprio usuário (alertas não lidos, validações como responsável).
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(db: Session, current_user: User, *args, **kwargs):
+            bound = signature.bind(db, current_user, *args, **kwargs)
+            bound.apply_defaults()
+            params = tuple(
+                (name, value) for name, value in bound.arguments.items()
+                if name not in ("db", "current_user")
+            )
+            key = (func.__name__, _scope_fingerprint(current_user, per_user), params)
+            return dashboard_cache.get_or_compute(
+                key, lambda: func(db, current_user, *args, **kwargs)
+            )
+
+        return wrapper
+    return decorator
+
+
+def get_cache_stats() -> dict:
+    """Contadores de hit/miss do cache do Dashboard."""
+    return dashboard_cache.stats()
+
+
 def _get_base_filters(
     current_user: User,
     company_id: Optional[UUID] = None,
@@ -105,21 +178,59 @@ def _get_base_filters(
     return filters
 
 
-def get_dashboard_stats(
-    db: Session,
+def _get_rollup_filters(
     current_user: User,
     company_id: Optional[UUID] = None,
     department_id: Optional[UUID] = None,
     month: Optional[str] = None
-) -> DashboardStatsResponse:
-    """Calcula estatísticas gerais do dashboard"""
-    base_filters = _get_base_filters(current_user, company_id, department_id, month)
-    
-    # Total de todas as despesas ativas
-    active_filters = base_filters + [Expense.status == ExpenseStatus.ACTIVE]
-    total_value = db.query(func.sum(Expense.value_brl)).filter(and_(*active_filters)).scalar() or Decimal('0')
-    
-    # Total do mês (usar filtro se fornecido, senão mês atual)
+):
+    """
+    Filtros equivalentes a _get_base_filters sobre expense_monthly_rollup.
+    Retorna None quando o escopo depende de created_by (não materializado no rollup);
+    nesse caso os agregados consultam expenses diretamente.
+    """
+    role_val = (_role_value(current_user.role) or "").strip()
+    if role_val in (UserRole.SYSTEM_ADMIN.value, UserRole.FINANCE_ADMIN.value):
+        filters = []
+    elif role_val == UserRole.LEADER.value:
+        company_ids = [c.id for c in current_user.companies] if current_user.companies else []
+        filters = [ExpenseMonthlyRollup.company_id.in_(company_ids)]
+    else:
+        return None
+
+    if company_id:
+        filters.append(ExpenseMonthlyRollup.company_id == company_id)
+    if department_id:
+        filters.append(ExpenseMonthlyRollup.department_id == department_id)
+
+    # Filtro por mês (formato YYYY-MM); formato inválido é ignorado como em _get_base_filters
+    if month:
+        try:
+            year, month_num = month.split('-')
+            filters.append(ExpenseMonthlyRollup.month == date(int(year), int(month_num), 1))
+        except (ValueError, IndexError):
+            pass
+
+    return filters
+
+
+def _aggregate_source(base_filters: list, rollup_filters: Optional[list]):
+    """
+    Fonte dos agregados: (entidade, filtros, soma de value_brl, contagem).
+    Usa o rollup mensal quando o escopo permite; senão, expenses.
+    """
+    if rollup_filters is not None:
+        return (
+            ExpenseMonthlyRollup,
+            rollup_filters,
+            func.sum(ExpenseMonthlyRollup.total_value_brl),
+            func.sum(ExpenseMonthlyRollup.expense_count),
+        )
+    return Expense, base_filters, func.sum(Expense.value_brl), func.count(Expense.id)
+
+
+def _month_bounds(month: Optional[str]) -> tuple[datetime, datetime]:
+    """Retorna [primeiro dia do mês, primeiro dia do mês seguinte) para YYYY-MM; mês atual se ausente ou inválido."""
     if month:
         try:
             year, month_num = month.split('-')
@@ -130,88 +241,155 @@ def get_dashboard_stats(
                 last_day_month = datetime(year_int + 1, 1, 1)
             else:
                 last_day_month = datetime(year_int, month_int + 1, 1)
-            monthly_filters = active_filters + [
-                Expense.created_at >= first_day_month,
-                Expense.created_at < last_day_month
-            ]
+            return first_day_month, last_day_month
         except (ValueError, IndexError):
-            # Se formato inválido, usar mês atual
-            now = datetime.now()
-            first_day_month = datetime(now.year, now.month, 1)
-            if now.month == 12:
-                last_day_month = datetime(now.year + 1, 1, 1)
-            else:
-                last_day_month = datetime(now.year, now.month + 1, 1)
-            monthly_filters = active_filters + [
-                Expense.created_at >= first_day_month,
-                Expense.created_at < last_day_month
-            ]
+            pass  # Formato inválido: usar mês atual
+    now = datetime.now()
+    first_day_month = datetime(now.year, now.month, 1)
+    if now.month == 12:
+        last_day_month = datetime(now.year + 1, 1, 1)
     else:
-        # Sem filtro de mês, usar mês atual
-        now = datetime.now()
-        first_day_month = datetime(now.year, now.month, 1)
-        if now.month == 12:
-            last_day_month = datetime(now.year + 1, 1, 1)
-        else:
-            last_day_month = datetime(now.year, now.month + 1, 1)
-        monthly_filters = active_filters + [
-            Expense.created_at >= first_day_month,
-            Expense.created_at < last_day_month
+        last_day_month = datetime(now.year, now.month + 1, 1)
+    return first_day_month, last_day_month
+
+
+def _pending_validations_subquery(
+    current_user: User,
+    company_id: Optional[UUID] = None,
+    department_id: Optional[UUID] = None
+):
+    """Subquery escalar: validações pendentes no escopo do usuário (respeitando filtro de empresa/setor)."""
+    role_val = _role_value(current_user.role)
+    # Alias para não correlacionar com a tabela expenses da query externa
+    validation_expense = aliased(Expense)
+    if role_val in (UserRole.SYSTEM_ADMIN.value, UserRole.FINANCE_ADMIN.value):
+        validation_filters = [ExpenseValidation.status == ValidationStatus.PENDING]
+    elif role_val == UserRole.LEADER.value:
+        company_ids = [c.id for c in current_user.companies] if current_user.companies else []
+        if not company_ids:
+            return literal(0)
+        validation_filters = [
+            ExpenseValidation.status == ValidationStatus.PENDING,
+            validation_expense.owner_id == current_user.id,
+            validation_expense.company_id.in_(company_ids),
         ]
-    monthly_value = db.query(func.sum(Expense.value_brl)).filter(and_(*monthly_filters)).scalar() or Decimal('0')
-    # Incluir despesas canceladas neste mês cujo valor conta no dashboard (já foi processada)
-    month_date = first_day_month.date() if hasattr(first_day_month, 'date') else first_day_month
-    cancelled_month_filters = base_filters + [
-        Expense.status == ExpenseStatus.CANCELLED,
-        Expense.cancellation_month == month_date,
-        Expense.charged_when_cancelled == True,
+    else:
+        return literal(0)
+    if company_id:
+        validation_filters.append(validation_expense.company_id == company_id)
+    if department_id:
+        validation_filters.append(validation_expense.department_id == department_id)
+    return select(func.count(ExpenseValidation.id)).join(
+        validation_expense, ExpenseValidation.expense_id == validation_expense.id
+    ).where(and_(*validation_filters)).scalar_subquery()
+
+
+def _unread_alerts_subquery(current_user: User, company_id: Optional[UUID] = None):
+    """Subquery escalar: alertas não lidos do usuário (respeitando filtro de empresa)."""
+    alert_filters = [
+        Alert.recipient_id == current_user.id,
+        Alert.status == AlertStatus.PENDING,
     ]
-    cancelled_month_value = db.query(func.sum(Expense.value_brl)).filter(and_(*cancelled_month_filters)).scalar() or Decimal('0')
-    monthly_value = monthly_value + cancelled_month_value
+    query = select(func.count(Alert.id))
+    if company_id:
+        alert_expense = aliased(Expense)
+        query = query.outerjoin(alert_expense, Alert.expense_id == alert_expense.id)
+        alert_filters.append(alert_expense.company_id == company_id)
+    return query.where(and_(*alert_filters)).scalar_subquery()
+
+
+@_cached(per_user=True)
+def get_dashboard_stats(
+    db: Session,
+    current_user: User,
+    company_id: Optional[UUID] = None,
+    department_id: Optional[UUID] = None,
+    month: Optional[str] = None
+) -> DashboardStatsResponse:
+    """
+    Calcula estatísticas gerais do dashboard em uma única query:
+    agregados com FILTER sobre uma varredura de expenses (escopo + filtros base),
+    mais validações pendentes e alertas não lidos como subqueries escalares.
+    """
+    base_filters = _get_base_filters(current_user, company_id, department_id, month)
+    return _dashboard_stats(db, current_user, base_filters, company_id, department_id, month)
+
+
+def _dashboard_stats(
+    db: Session,
+    current_user: User,
+    base_filters: list,
+    company_id: Optional[UUID] = None,
+    department_id: Optional[UUID] = None,
+    month: Optional[str] = None
+) -> DashboardStatsResponse:
+    """Corpo de get_dashboard_stats sobre filtros base já calculados."""
+    # Total do mês (usar filtro se fornecido, senão mês atual)
+    first_day_month, last_day_month = _month_bounds(month)
+    month_date = first_day_month.date()
 
-    # Média por despesa
-    active_count = db.query(func.count(Expense.id)).filter(and_(*active_filters)).scalar() or 0
-    average_value = total_value / active_count if active_count > 0 else Decimal('0')
-    
-    # Despesas recorrentes vs únicas
-    recurring_count = db.query(func.count(Expense.id)).filter(
-        and_(*(active_filters + [Expense.expense_type == ExpenseType.RECURRING]))
-    ).scalar() or 0
-    one_time_count = db.query(func.count(Expense.id)).filter(
-        and_(*(active_filters + [Expense.expense_type == ExpenseType.ONE_TIME]))
-    ).scalar() or 0
-    
-    # Despesas canceladas (economia potencial)
-    cancelled_filters = base_filters + [Expense.status == ExpenseStatus.CANCELLED]
-    cancelled_value = db.query(func.sum(Expense.value_brl)).filter(and_(*cancelled_filters)).scalar() or Decimal('0')
-    
     # Próximas renovações (próximos 30 dias)
     today = date.today()
     next_month = today + timedelta(days=30)
-    upcoming_renewals = db.query(func.count(Expense.id)).filter(
-        and_(*(
-            active_filters + [
-                Expense.renewal_date.isnot(None),
-                Expense.renewal_date >= today,
-                Expense.renewal_date <= next_month
-            ]
-        ))
-    ).scalar() or 0
-    
+
+    is_active = Expense.status == ExpenseStatus.ACTIVE
+    is_cancelled = Expense.status == ExpenseStatus.CANCELLED
+    zero = literal(Decimal('0'))
+
+    row = db.query(
+        # Total de todas as despesas ativas
+        func.coalesce(func.sum(Expense.value_brl).filter(is_active), zero).label('total_value'),
+        func.coalesce(func.sum(Expense.value_brl).filter(and_(
+            is_active,
+            Expense.created_at >= first_day_month,
+            Expense.created_at < last_day_month,
+        )), zero).label('monthly_value'),
+        # Despesas canceladas neste mês cujo valor conta no dashboard (já foi processada)
+        func.coalesce(func.sum(Expense.value_brl).filter(and_(
+            is_cancelled,
+            Expense.cancellation_month == month_date,
+            Expense.charged_when_cancelled == True,
+        )), zero).label('cancelled_month_value'),
+        func.count(Expense.id).filter(is_active).label('active_count'),
+        # Despesas recorrentes vs únicas
+        func.count(Expense.id).filter(and_(
+            is_active, Expense.expense_type == ExpenseType.RECURRING
+        )).label('recurring_count'),
+        func.count(Expense.id).filter(and_(
+            is_active, Expense.expense_type == ExpenseType.ONE_TIME
+        )).label('one_time_count'),
+        # Despesas canceladas (economia potencial)
+        func.coalesce(func.sum(Expense.value_brl).filter(is_cancelled), zero).label('cancelled_value'),
+        func.count(Expense.id).filter(and_(
+            is_active,
+            Expense.renewal_date.isnot(None),
+            Expense.renewal_date >= today,
+            Expense.renewal_date <= next_month,
+        )).label('upcoming_renewals'),
+        _pending_validations_subquery(current_user, company_id, department_id).label('pending_validations'),
+        _unread_alerts_subquery(current_user, company_id).label('unread_alerts'),
+    ).select_from(Expense).filter(and_(*base_filters)).one()
+
+    total_value = row.total_value or Decimal('0')
+    active_count = row.active_count or 0
+    # Média por despesa
+    average_value = total_value / active_count if active_count > 0 else Decimal('0')
+
     return DashboardStatsResponse(
         total_expenses_value=total_value,
-        monthly_expenses_value=monthly_value,
+        monthly_expenses_value=(row.monthly_value or Decimal('0')) + (row.cancelled_month_value or Decimal('0')),
         average_expense_value=average_value,
-        pending_validations=0,  # Será calculado no endpoint
-        unread_alerts=0,  # Será calculado no endpoint
+        pending_validations=row.pending_validations or 0,
+        unread_alerts=row.unread_alerts or 0,
         active_expenses=active_count,
-        recurring_expenses=recurring_count,
-        one_time_expenses=one_time_count,
-        upcoming_renewals=upcoming_renewals,
-        cancelled_expenses_value=cancelled_value,
+        recurring_expenses=row.recurring_count or 0,
+        one_time_expenses=row.one_time_count or 0,
+        upcoming_renewals=row.upcoming_renewals or 0,
+        cancelled_expenses_value=row.cancelled_value or Decimal('0'),
     )
 
 
+@_cached()
 def get_expenses_by_category(
     db: Session,
     current_user: User,
@@ -222,21 +400,35 @@ def get_expenses_by_category(
 ) -> CategoryExpenseResponse:
     """Agrega despesas por categoria"""
     base_filters = _get_base_filters(current_user, company_id, department_id, month)
-    active_filters = base_filters + [Expense.status == ExpenseStatus.ACTIVE]
+    rollup_filters = _get_rollup_filters(current_user, company_id, department_id, month)
+    return _expenses_by_category(db, base_filters, rollup_filters, limit)
+
+
+def _expenses_by_category(
+    db: Session,
+    base_filters: list,
+    rollup_filters: Optional[list] = None,
+    limit: int = 10
+) -> CategoryExpenseResponse:
+    """Corpo de get_expenses_by_category sobre filtros base já calculados."""
+    source, filters, total_value, count = _aggregate_source(base_filters, rollup_filters)
+    active_filters = filters + [source.status == ExpenseStatus.ACTIVE]
     
     results = db.query(
-        Expense.category_id,
+        source.category_id,
         Category.name.label('category_name'),
-        func.sum(Expense.value_brl).label('total_value'),
-        func.count(Expense.id).label('count')
-    ).join(
-        Category, Expense.category_id == Category.id
+        total_value.label('total_value'),
+        count.label('count')
+    ).select_from(source).join(
+        Category, source.category_id == Category.id
     ).filter(
         and_(*active_filters)
     ).group_by(
-        Expense.category_id, Category.name
+        source.category_id, Category.name
+    ).having(
+        count > 0
     ).order_by(
-        func.sum(Expense.value_brl).desc()
+        total_value.desc()
     ).limit(limit).all()
     
     total = sum(r.total_value for r in results) or Decimal('0')
@@ -256,6 +448,7 @@ def get_expenses_by_category(
     return CategoryExpenseResponse(items=items, total=total)
 
 
+@_cached()
 def get_expenses_by_company(
     db: Session,
     current_user: User,
@@ -266,21 +459,35 @@ def get_expenses_by_company(
 ) -> CompanyExpenseResponse:
     """Agrega despesas por empresa"""
     base_filters = _get_base_filters(current_user, company_id, department_id, month)
-    active_filters = base_filters + [Expense.status == ExpenseStatus.ACTIVE]
+    rollup_filters = _get_rollup_filters(current_user, company_id, department_id, month)
+    return _expenses_by_company(db, base_filters, rollup_filters, limit)
+
+
+def _expenses_by_company(
+    db: Session,
+    base_filters: list,
+    rollup_filters: Optional[list] = None,
+    limit: int = 10
+) -> CompanyExpenseResponse:
+    """Corpo de get_expenses_by_company sobre filtros base já calculados."""
+    source, filters, total_value, count = _aggregate_source(base_filters, rollup_filters)
+    active_filters = filters + [source.status == ExpenseStatus.ACTIVE]
     
     results = db.query(
-        Expense.company_id,
+        source.company_id,
         Company.name.label('company_name'),
-        func.sum(Expense.value_brl).label('total_value'),
-        func.count(Expense.id).label('count')
-    ).join(
-        Company, Expense.company_id == Company.id
+        total_value.label('total_value'),
+        count.label('count')
+    ).select_from(source).join(
+        Company, source.company_id == Company.id
     ).filter(
         and_(*active_filters)
     ).group_by(
-        Expense.company_id, Company.name
+        source.company_id, Company.name
+    ).having(
+        count > 0
     ).order_by(
-        func.sum(Expense.value_brl).desc()
+        total_value.desc()
     ).limit(limit).all()
     
     total = sum(r.total_value for r in results) or Decimal('0')
@@ -300,6 +507,7 @@ def get_expenses_by_company(
     return CompanyExpenseResponse(items=items, total=total)
 
 
+@_cached()
 def get_expenses_by_department(
     db: Session,
     current_user: User,
@@ -310,24 +518,38 @@ def get_expenses_by_department(
 ) -> DepartmentExpenseResponse:
     """Agrega despesas por setor"""
     base_filters = _get_base_filters(current_user, company_id, department_id, month)
-    active_filters = base_filters + [Expense.status == ExpenseStatus.ACTIVE]
+    rollup_filters = _get_rollup_filters(current_user, company_id, department_id, month)
+    return _expenses_by_department(db, base_filters, rollup_filters, limit)
+
+
+def _expenses_by_department(
+    db: Session,
+    base_filters: list,
+    rollup_filters: Optional[list] = None,
+    limit: int = 10
+) -> DepartmentExpenseResponse:
+    """Corpo de get_expenses_by_department sobre filtros base já calculados."""
+    source, filters, total_value, count = _aggregate_source(base_filters, rollup_filters)
+    active_filters = filters + [source.status == ExpenseStatus.ACTIVE]
     
     results = db.query(
-        Expense.department_id,
+        source.department_id,
         Department.name.label('department_name'),
         Company.name.label('company_name'),
-        func.sum(Expense.value_brl).label('total_value'),
-        func.count(Expense.id).label('count')
-    ).join(
-        Department, Expense.department_id == Department.id
+        total_value.label('total_value'),
+        count.label('count')
+    ).select_from(source).join(
+        Department, source.department_id == Department.id
     ).join(
-        Company, Expense.company_id == Company.id
+        Company, source.company_id == Company.id
     ).filter(
         and_(*active_filters)
     ).group_by(
-        Expense.department_id, Department.name, Company.name
+        source.department_id, Department.name, Company.name
+    ).having(
+        count > 0
     ).order_by(
-        func.sum(Expense.value_brl).desc()
+        total_value.desc()
     ).limit(limit).all()
     
     total = sum(r.total_value for r in results) or Decimal('0')
@@ -348,6 +570,7 @@ def get_expenses_by_department(
     return DepartmentExpenseResponse(items=items, total=total)
 
 
+@_cached()
 def get_expenses_timeline(
     db: Session,
     current_user: User,
@@ -357,20 +580,42 @@ def get_expenses_timeline(
 ) -> TimelineDataResponse:
     """Retorna dados de evolução de gastos ao longo do tempo"""
     base_filters = _get_base_filters(current_user, company_id, department_id)
-    active_filters = base_filters + [Expense.status == ExpenseStatus.ACTIVE]
+    rollup_filters = _get_rollup_filters(current_user, company_id, department_id)
+    return _expenses_timeline(db, base_filters, rollup_filters, months)
+
+
+def _expenses_timeline(
+    db: Session,
+    base_filters: list,
+    rollup_filters: Optional[list] = None,
+    months: int = 6
+) -> TimelineDataResponse:
+    """Corpo de get_expenses_timeline sobre filtros base já calculados."""
+    source, filters, total_value, count = _aggregate_source(base_filters, rollup_filters)
+    active_filters = filters + [source.status == ExpenseStatus.ACTIVE]
     
     # Calcular data inicial
     end_date = datetime.now()
     start_date = end_date - timedelta(days=months * 30)
+
+    if source is ExpenseMonthlyRollup:
+        # Rollup tem granularidade mensal: começa no mês da data inicial
+        month_col = ExpenseMonthlyRollup.month
+        active_filters.append(ExpenseMonthlyRollup.month >= start_date.date().replace(day=1))
+    else:
+        month_col = func.date_trunc('month', Expense.created_at)
+        active_filters.append(Expense.created_at >= start_date)
     
     results = db.query(
-        func.date_trunc('month', Expense.created_at).label('month'),
-        func.sum(Expense.value_brl).label('total_value'),
-        func.count(Expense.id).label('count')
-    ).filter(
-        and_(*(active_filters + [Expense.created_at >= start_date]))
+        month_col.label('month'),
+        total_value.label('total_value'),
+        count.label('count')
+    ).select_from(source).filter(
+        and_(*active_filters)
     ).group_by(
-        func.date_trunc('month', Expense.created_at)
+        month_col
+    ).having(
+        count > 0
     ).order_by('month').all()
     
     data_points = []
@@ -386,6 +631,7 @@ def get_expenses_timeline(
     return TimelineDataResponse(data=data_points)
 
 
+@_cached()
 def get_top_expenses(
     db: Session,
     current_user: User,
@@ -396,6 +642,15 @@ def get_top_expenses(
 ) -> TopExpenseResponse:
     """Retorna as maiores despesas"""
     base_filters = _get_base_filters(current_user, company_id, department_id, month)
+    return _top_expenses(db, base_filters, limit)
+
+
+def _top_expenses(
+    db: Session,
+    base_filters: list,
+    limit: int = 10
+) -> TopExpenseResponse:
+    """Corpo de get_top_expenses sobre filtros base já calculados."""
     active_filters = base_filters + [Expense.status == ExpenseStatus.ACTIVE]
     
     expenses = db.query(Expense).options(
@@ -425,6 +680,7 @@ def get_top_expenses(
     return TopExpenseResponse(items=items)
 
 
+@_cached()
 def get_expenses_by_status(
     db: Session,
     current_user: User,
@@ -434,15 +690,28 @@ def get_expenses_by_status(
 ) -> StatusDistributionResponse:
     """Distribuição de despesas por status"""
     base_filters = _get_base_filters(current_user, company_id, department_id, month)
+    rollup_filters = _get_rollup_filters(current_user, company_id, department_id, month)
+    return _expenses_by_status(db, base_filters, rollup_filters)
+
+
+def _expenses_by_status(
+    db: Session,
+    base_filters: list,
+    rollup_filters: Optional[list] = None
+) -> StatusDistributionResponse:
+    """Corpo de get_expenses_by_status sobre filtros base já calculados."""
+    source, filters, total_value, count = _aggregate_source(base_filters, rollup_filters)
     
     results = db.query(
-        Expense.status,
-        func.count(Expense.id).label('count'),
-        func.sum(Expense.value_brl).label('total_value')
-    ).filter(
-        and_(*base_filters)
+        source.status,
+        count.label('count'),
+        total_value.label('total_value')
+    ).select_from(source).filter(
+        and_(*filters)
     ).group_by(
-        Expense.status
+        source.status
+    ).having(
+        count > 0
     ).all()
     
     total_count = sum(r.count for r in results) or 0
@@ -466,6 +735,7 @@ def get_expenses_by_status(
     )
 
 
+@_cached()
 def get_upcoming_renewals(
     db: Session,
     current_user: User,
@@ -476,6 +746,16 @@ def get_upcoming_renewals(
 ) -> UpcomingRenewalsResponse:
     """Retorna próximas renovações"""
     base_filters = _get_base_filters(current_user, company_id, department_id)
+    return _upcoming_renewals(db, base_filters, days, limit)
+
+
+def _upcoming_renewals(
+    db: Session,
+    base_filters: list,
+    days: int = 30,
+    limit: int = 10
+) -> UpcomingRenewalsResponse:
+    """Corpo de get_upcoming_renewals sobre filtros base já calculados."""
     
     today = date.today()
     end_date = today + timedelta(days=days)
@@ -507,3 +787,171 @@ def get_upcoming_renewals(
             ))
     
     return UpcomingRenewalsResponse(items=items, count=len(items))
+
+
+@_cached()
+def get_forecast(
+    db: Session,
+    current_user: User,
+    company_id: Optional[UUID] = None,
+    department_id: Optional[UUID] = None,
+    months: int = 24
+) -> ForecastResponse:
+    """Projeção de desembolso em BRL das despesas recorrentes ativas a partir do próximo mês"""
+    base_filters = _get_base_filters(current_user, company_id, department_id)
+    today = date.today()
+    next_month = date(today.year + today.month // 12, today.month % 12 + 1, 1)
+    return forecast_service.project(db, base_filters, next_month, months)
+
+
+def _parse_month(month: str) -> date:
+    """Converte YYYY-MM no primeiro dia do mês (ValueError se inválido)."""
+    try:
+        year, month_num = month.split('-')
+        return date(int(year), int(month_num), 1)
+    except (ValueError, IndexError):
+        raise ValueError(f"Mês inválido: '{month}' (use YYYY-MM)")
+
+
+@_cached()
+def get_historical_spend(
+    db: Session,
+    current_user: User,
+    company_id: Optional[UUID] = None,
+    department_id: Optional[UUID] = None,
+    from_month: Optional[str] = None,
+    to_month: Optional[str] = None
+) -> HistoricalSpendResponse:
+    """
+    Gasto mês a mês a partir das validações (uma validação = uma cobrança da despesa no mês).
+    Despesas em moeda estrangeira são convertidas pela última cotação de exchange_rates
+    até o fim daquele mês; sem histórico, vale o value_brl atual.
+    Validações rejeitadas só contam se a despesa foi cobrada no mês do cancelamento.
+    Padrão: últimos 12 meses, incluindo o atual.
+    """
+    today = date.today()
+    end_month = _parse_month(to_month) if to_month else today.replace(day=1)
+    if from_month:
+        start_month = _parse_month(from_month)
+    else:
+        start_index = end_month.year * 12 + end_month.month - 1 - 11
+        start_month = date(start_index // 12, start_index % 12 + 1, 1)
+    if start_month > end_month:
+        raise ValueError("from_month deve ser anterior ou igual a to_month")
+
+    base_filters = _get_base_filters(current_user, company_id, department_id)
+
+    next_month = ExpenseValidation.validation_month + literal_column("INTERVAL '1 month'")
+    historical_rate = select(ExchangeRate.rate).where(
+        ExchangeRate.currency == cast(Expense.currency, String),
+        ExchangeRate.rate_date < next_month,
+    ).order_by(
+        ExchangeRate.rate_date.desc()
+    ).limit(1).correlate(Expense, ExpenseValidation).scalar_subquery()
+    is_brl = Expense.currency == Currency.BRL
+    value_at_rate = case(
+        (is_brl, Expense.value),
+        else_=func.coalesce(func.round(Expense.value * historical_rate, 2), Expense.value_brl),
+    )
+
+    results = db.query(
+        ExpenseValidation.validation_month.label('month'),
+        func.sum(value_at_rate).label('total_value'),
+        func.sum(Expense.value_brl).label('total_value_current'),
+        func.sum(case((is_brl, 0), else_=Expense.value)).label('foreign_value'),
+        func.count(ExpenseValidation.id).label('count')
+    ).join(
+        Expense, ExpenseValidation.expense_id == Expense.id
+    ).filter(
+        and_(
+            *base_filters,
+            ExpenseValidation.validation_month >= start_month,
+            ExpenseValidation.validation_month <= end_month,
+            or_(
+                ExpenseValidation.status != ValidationStatus.REJECTED,
+                Expense.charged_when_cancelled.is_(True),
+            ),
+        )
+    ).group_by(
+        ExpenseValidation.validation_month
+    ).order_by(
+        ExpenseValidation.validation_month
+    ).all()
+
+    data = [
+        HistoricalSpendPoint(
+            month=result.month.strftime('%Y-%m'),
+            total_value=result.total_value or Decimal('0'),
+            total_value_current=result.total_value_current or Decimal('0'),
+            foreign_value=result.foreign_value or Decimal('0'),
+            count=result.count or 0,
+        )
+        for result in results
+    ]
+    return HistoricalSpendResponse(
+        data=data,
+        total_value=sum((point.total_value for point in data), Decimal('0')),
+        total_value_current=sum((point.total_value_current for point in data), Decimal('0')),
+    )
+
+
+@_cached(per_user=True)
+def get_overview(
+    db: Session,
+    current_user: User,
+    company_id: Optional[UUID] = None,
+    department_id: Optional[UUID] = None,
+    month: Optional[str] = None,
+    limit: int = 10,
+    months: int = 6,
+    days: int = 30,
+    include_timings: bool = False
+) -> DashboardOverviewResponse:
+    """
+    Calcula todos os widgets do Dashboard com filtros base calculados uma vez.
+    Os widgets são independentes e rodam em paralelo no pool de _overview_executor,
+    cada um com sua própria sessão (Session não é thread-safe); com
+    DASHBOARD_OVERVIEW_WORKERS=1, rodam em sequência na sessão da requisição.
+    Com include_timings, retorna o tempo de cada widget em milissegundos.
+    """
+    # Timeline e renovações não usam o filtro de mês
+    month_filters = _get_base_filters(current_user, company_id, department_id, month)
+    base_filters = _get_base_filters(current_user, company_id, department_id)
+    month_rollup_filters = _get_rollup_filters(current_user, company_id, department_id, month)
+    rollup_filters = _get_rollup_filters(current_user, company_id, department_id)
+
+    widgets = {
+        "stats": lambda s: _dashboard_stats(s, current_user, month_filters, company_id, department_id, month),
+        "by_category": lambda s: _expenses_by_category(s, month_filters, month_rollup_filters, limit),
+        "by_company": lambda s: _expenses_by_company(s, month_filters, month_rollup_filters, limit),
+        "by_department": lambda s: _expenses_by_department(s, month_filters, month_rollup_filters, limit),
+        "timeline": lambda s: _expenses_timeline(s, base_filters, rollup_filters, months),
+        "top_expenses": lambda s: _top_expenses(s, month_filters, limit),
+        "by_status": lambda s: _expenses_by_status(s, month_filters, month_rollup_filters),
+        "upcoming_renewals": lambda s: _upcoming_renewals(s, base_filters, days, limit),
+    }
+
+    def timed(compute, session: Session) -> tuple:
+        started = time.perf_counter()
+        result = compute(session)
+        return result, round((time.perf_counter() - started) * 1000, 2)
+
+    def in_new_session(compute) -> tuple:
+        session = Session(bind=db.get_bind())
+        try:
+            return timed(compute, session)
+        finally:
+            session.close()
+
+    if _overview_executor is None:
+        outcomes = {name: timed(compute, db) for name, compute in widgets.items()}
+    else:
+        futures = {name: _overview_executor.submit(in_new_session, compute) for name, compute in widgets.items()}
+        outcomes = {name: future.result() for name, future in futures.items()}
+    results = {name: result for name, (result, _) in outcomes.items()}
+    timings = {name: elapsed for name, (_, elapsed) in outcomes.items()}
+
+    return DashboardOverviewResponse(
+        **results,
+        timings_ms=timings if include_timings else None,
+    )
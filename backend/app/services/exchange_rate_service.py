@@ -0,0 +1,226 @@
+import csv
+import io
+import re
+from datetime import date, datetime, timezone
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import dashboard_cache
+from app.core.config import settings
+from app.models.exchange_rate import ExchangeRate
+
+
+# Cabeçalhos aceitos no CSV histórico (inglês ou português)
+CSV_DATE_COLUMNS = ("date", "data", "rate_date")
+CSV_RATE_COLUMNS = ("rate", "cotacao", "cotação", "bid")
+CSV_CURRENCY_COLUMNS = ("currency", "moeda")
+
+# Limites da coluna exchange_rates.rate (Numeric(10, 4)) e formato ISO 4217 de currency
+MAX_RATE = Decimal("999999.9999")
+CURRENCY_PATTERN = re.compile(r"^[A-Z]{3}$")
+
+
+def upsert_rates(db: Session, rates: list[dict]) -> int:
+    """
+    Grava cotações (currency, rate_date, rate, source) em um único INSERT ... ON CONFLICT.
+    Repetições da mesma moeda/dia mantêm a última. Não faz commit.
+    """
+    unique = {(r["currency"], r["rate_date"]): r for r in rates}
+    if not unique:
+        return 0
+    stmt = insert(ExchangeRate).values(list(unique.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ExchangeRate.currency, ExchangeRate.rate_date],
+        set_={
+            "rate": stmt.excluded.rate,
+            "source": stmt.excluded.source,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt)
+    return len(unique)
+
+
+def record_rate(db: Session, rate: Decimal, rate_date: date, source: str, currency: str = "USD") -> None:
+    """Grava a cotação do dia (a última do dia prevalece)."""
+    upsert_rates(db, [{
+        "currency": currency,
+        "rate_date": rate_date,
+        "rate": rate,
+        "source": source,
+        "updated_at": datetime.now(timezone.utc),
+    }])
+    db.commit()
+    dashboard_cache.invalidate()
+
+
+def get_latest(db: Session, currency: str = "USD") -> ExchangeRate | None:
+    return db.query(ExchangeRate)\
+        .filter(ExchangeRate.currency == currency)\
+        .order_by(ExchangeRate.rate_date.desc())\
+        .first()
+
+
+def get_rates(
+    db: Session,
+    currency: str = "USD",
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> list[ExchangeRate]:
+    query = db.query(ExchangeRate).filter(ExchangeRate.currency == currency)
+    if date_from:
+        query = query.filter(ExchangeRate.rate_date >= date_from)
+    if date_to:
+        query = query.filter(ExchangeRate.rate_date <= date_to)
+    return query.order_by(ExchangeRate.rate_date).all()
+
+
+def _parse_date(value: str) -> date:
+    value = value.strip()
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Data inválida: '{value}' (use AAAA-MM-DD ou DD/MM/AAAA)")
+
+
+def _parse_rate(value: str) -> Decimal:
+    raw = value.strip()
+    # Aceita vírgula decimal (5,1234); ponto como milhar não ocorre em cotações
+    try:
+        rate = Decimal(raw.replace(",", "."))
+    except InvalidOperation:
+        raise ValueError(f"Cotação inválida: '{value}'")
+    if not rate.is_finite():
+        raise ValueError(f"Cotação inválida: '{value}'")
+    if rate <= 0:
+        raise ValueError(f"Cotação deve ser positiva: '{value}'")
+    if rate > MAX_RATE:
+        raise ValueError(f"Cotação fora do intervalo (máximo {MAX_RATE}): '{value}'")
+    return rate
+
+
+def _parse_currency(value: str | None) -> str:
+    currency = (value or "USD").strip().upper()
+    if not CURRENCY_PATTERN.match(currency):
+        raise ValueError(f"Moeda inválida: '{value}' (use o código de 3 letras, ex.: USD)")
+    return currency
+
+
+def _pick(row: dict, names: tuple[str, ...]) -> str | None:
+    for name in names:
+        value = row.get(name)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def import_csv(db: Session, content: str, source: str = "csv") -> dict:
+    """
+    Importa cotações históricas de um CSV com cabeçalho (date,rate[,currency]);
+    separador vírgula ou ponto e vírgula. Moeda padrão: USD.
+    Linhas inválidas (data, cotação fora de Numeric(10, 4), moeda fora do formato ISO) são reportadas
+    e não impedem as demais; grava tudo em um único upsert e invalida o cache do Dashboard.
+    """
+    dialect = csv.excel
+    try:
+        dialect = csv.Sniffer().sniff(content[:2048], delimiters=",;")
+    except csv.Error:
+        pass
+    reader = csv.DictReader(io.StringIO(content), dialect=dialect)
+    if reader.fieldnames:
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+
+    now = datetime.now(timezone.utc)
+    rates = []
+    errors = []
+    for line, row in enumerate(reader, start=2):  # Linha 1 = cabeçalho
+        try:
+            raw_date = _pick(row, CSV_DATE_COLUMNS)
+            raw_rate = _pick(row, CSV_RATE_COLUMNS)
+            if raw_date is None or raw_rate is None:
+                raise ValueError("Colunas obrigatórias: date e rate")
+            rates.append({
+                "currency": _parse_currency(_pick(row, CSV_CURRENCY_COLUMNS)),
+                "rate_date": _parse_date(raw_date),
+                "rate": _parse_rate(raw_rate),
+                "source": source,
+                "updated_at": now,
+            })
+        except ValueError as e:
+            errors.append({"line": line, "error": str(e)})
+
+    imported = upsert_rates(db, rates)
+    db.commit()
+    if imported:
+        dashboard_cache.invalidate()
+    return {"imported": imported, "errors": errors}
+
+
+def revalue_expenses(db: Session, currency: str = "USD") -> dict:
+    """
+    Reavalia value_brl de todas as despesas ativas na moeda pela cotação mais recente
+    de exchange_rates, em um único UPDATE. No mesmo statement aplica a diferença
+    em expense_monthly_rollup (CTE), então o rollup continua consistente.
+    Despesas cujo value_brl já corresponde à cotação não são tocadas.
+    """
+    schema = settings.DATABASE_SCHEMA
+    result = db.execute(text(f"""
+        WITH latest AS (
+            SELECT rate, rate_date
+            FROM {schema}.exchange_rates
+            WHERE currency = :currency
+            ORDER BY rate_date DESC
+            LIMIT 1
+        ),
+        previous AS (
+            SELECT e.id, e.value_brl AS old_value_brl
+            FROM {schema}.expenses e
+            WHERE e.currency::text = :currency AND e.status = 'active'
+            FOR UPDATE
+        ),
+        updated AS (
+            UPDATE {schema}.expenses e
+            SET value_brl = round(e.value * latest.rate, 2),
+                exchange_rate = latest.rate,
+                exchange_rate_date = latest.rate_date::timestamp AT TIME ZONE 'UTC',
+                updated_at = now()
+            FROM latest, previous
+            WHERE e.id = previous.id
+              AND e.value_brl IS DISTINCT FROM round(e.value * latest.rate, 2)
+            RETURNING e.created_at, e.company_id, e.department_id, e.category_id,
+                      e.status, e.expense_type, e.value_brl - previous.old_value_brl AS delta
+        ),
+        rollup AS (
+            INSERT INTO {schema}.expense_monthly_rollup (
+                month, company_id, department_id, category_id, status, expense_type,
+                total_value_brl, expense_count
+            )
+            SELECT date_trunc('month', created_at AT TIME ZONE 'UTC')::date,
+                   company_id, department_id, category_id, status, expense_type,
+                   SUM(delta), 0
+            FROM updated
+            GROUP BY 1, 2, 3, 4, 5, 6
+            ON CONFLICT (month, company_id, department_id, category_id, status, expense_type)
+            DO UPDATE SET total_value_brl =
+                expense_monthly_rollup.total_value_brl + EXCLUDED.total_value_brl
+        )
+        SELECT (SELECT count(*) FROM updated) AS updated, latest.rate, latest.rate_date
+        FROM latest
+    """), {"currency": currency}).first()
+    if result is None:
+        db.rollback()
+        raise ValueError(f"Nenhuma cotação registrada para {currency}")
+    db.commit()
+    dashboard_cache.invalidate()
+
+    return {
+        "currency": currency,
+        "rate": result.rate,
+        "rate_date": result.rate_date,
+        "updated": result.updated,
+    }
@@ -1,10 +1,16 @@
+import asyncio
+import logging
+import time
 from decimal import Decimal
 from datetime import datetime, timezone
 
 import httpx
 
+from app.core.circuit_breaker import CircuitBreaker
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class ExchangeRateResult:
     def __init__(self, rate: Decimal, date: datetime):
@@ -12,51 +18,221 @@ class ExchangeRateResult:
         self.date = date
 
 
-async def get_usd_to_brl_rate() -> ExchangeRateResult | None:
-    """Busca a cotação atual do dólar (USD → BRL)"""
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(settings.AWESOME_API_URL, timeout=10.0)
+def _parse_usd_brl(data) -> Decimal | None:
+    """Extrai a cotação da resposta da Awesome API: {"USDBRL": {"bid": "5.12", ...}}"""
+    usd_brl = data.get("USDBRL") if isinstance(data, dict) else None
+    if isinstance(usd_brl, dict):
+        bid = usd_brl.get("bid") or usd_brl.get("ask")
+        if bid is not None:
+            return Decimal(str(bid))
+    return None
+
+
+class UsdBrlRateProvider:
+    """
+    Cotação USD → BRL em cache no processo.
+
+    Um refresher em background (iniciado no lifespan) busca a cotação com um
+    httpx.AsyncClient de longa duração (pool de conexões). Handlers só leem o
+    cache via current(), sem I/O de rede; se a cotação passou do TTL, current()
+    agenda uma atualização e devolve a última conhecida.
+    Buscas concorrentes são deduplicadas (single-flight): todos aguardam a mesma requisição.
+
+    Cada busca tem um orçamento de latência (latency_budget_seconds) e passa pelo
+    circuit breaker: com a API fora do ar, nenhuma busca é feita até o próximo probe
+    e vale a última cotação boa (em memória ou, após reinício, a última de exchange_rates).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl_seconds: float,
+        refresh_seconds: float,
+        latency_budget_seconds: float,
+        breaker: CircuitBreaker,
+    ):
+        self.url = url
+        self.ttl_seconds = ttl_seconds
+        self.refresh_seconds = refresh_seconds
+        self.latency_budget_seconds = latency_budget_seconds
+        self.breaker = breaker
+        self._result: ExchangeRateResult | None = None
+        self._source: str | None = None  # "live" (API) ou "stored" (exchange_rates)
+        self._fetched_at: float | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._inflight: asyncio.Task | None = None
+        self._refresher: asyncio.Task | None = None
+
+    def is_fresh(self) -> bool:
+        return self._fetched_at is not None and time.monotonic() - self._fetched_at < self.ttl_seconds
+
+    def current(self) -> ExchangeRateResult | None:
+        """Cotação em cache (sem I/O). Pode ser chamada de qualquer thread."""
+        if not self.is_fresh() and self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._start_fetch)
+        return self._result
+
+    async def refresh(self) -> ExchangeRateResult | None:
+        """Busca a cotação agora, reaproveitando uma busca já em andamento."""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        return await asyncio.shield(self._start_fetch())
+
+    def _start_fetch(self) -> asyncio.Task:
+        """Inicia a busca se não houver outra em andamento (roda no event loop)."""
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.get_running_loop().create_task(self._fetch())
+        return self._inflight
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.latency_budget_seconds,
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+            )
+        return self._client
+
+    async def _fetch(self) -> ExchangeRateResult | None:
+        if not self.breaker.allow_request():
+            return None
+        try:
+            # wait_for limita o tempo total (o timeout do httpx vale por fase: conexão, leitura...)
+            response = await asyncio.wait_for(
+                self._get_client().get(self.url), timeout=self.latency_budget_seconds
+            )
             response.raise_for_status()
-            
-            data = response.json()
-            rate = Decimal(data["USDBRL"]["bid"])
-            date = datetime.now(timezone.utc)
-            
-            return ExchangeRateResult(rate=rate, date=date)
-    except Exception as e:
-        print(f"Erro ao buscar cotação: {e}")
-        return None
+            rate = _parse_usd_brl(response.json())
+            if rate is None:
+                raise ValueError("Resposta de cotação sem USDBRL.bid")
+        except asyncio.CancelledError:
+            self.breaker.record_failure("cancelada")
+            raise
+        except Exception as e:
+            error = e if not isinstance(e, asyncio.TimeoutError) else (
+                f"orçamento de latência excedido ({self.latency_budget_seconds}s)"
+            )
+            self.breaker.record_failure(error)
+            logger.warning("Erro ao buscar cotação: %s (breaker: %s)", error, self.breaker.state)
+            return None
+        self.breaker.record_success()
+        self.set_rate(ExchangeRateResult(rate=rate, date=datetime.now(timezone.utc)), source="live")
+        return self._result
+
+    def set_rate(self, result: ExchangeRateResult, source: str) -> None:
+        """Define a última cotação boa (source: "live" ou "stored")."""
+        self._result = result
+        self._source = source
+        self._fetched_at = time.monotonic() if source == "live" else None
+
+    def health(self) -> dict:
+        """Estado do provider para /health: breaker e última cotação boa."""
+        result = self._result
+        return {
+            "breaker": self.breaker.snapshot(),
+            "rate": str(result.rate) if result else None,
+            "rate_date": result.date.isoformat() if result else None,
+            "source": self._source if result else "fallback",
+            "fresh": self.is_fresh(),
+        }
+
+    async def _refresh_loop(self):
+        from app.tasks.exchange_rate_tasks import record_exchange_rate_task
+
+        while True:
+            result = await self.refresh()
+            if result is not None:
+                # Histórico diário em exchange_rates (a última cotação do dia prevalece)
+                outcome = await asyncio.to_thread(record_exchange_rate_task, result.rate, result.date.date())
+                if not outcome["success"]:
+                    logger.warning("Erro ao gravar cotação diária: %s", outcome["error"])
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def start(self):
+        """Inicia o refresher em background (chamado no lifespan)."""
+        from app.tasks.exchange_rate_tasks import load_latest_exchange_rate_task
+
+        self._loop = asyncio.get_running_loop()
+        # Última cotação gravada: vale até a primeira busca bem-sucedida
+        stored = await asyncio.to_thread(load_latest_exchange_rate_task)
+        if stored is not None and self._result is None:
+            self.set_rate(ExchangeRateResult(rate=stored[0], date=stored[1]), source="stored")
+        self._refresher = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        """Encerra o refresher e fecha o client."""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._loop = None
+
 
+exchange_breaker = CircuitBreaker(
+    name="awesomeapi",
+    failure_threshold=settings.EXCHANGE_RATE_BREAKER_FAILURES,
+    reset_timeout_seconds=settings.EXCHANGE_RATE_BREAKER_RESET_SECONDS,
+)
 
-# Taxa fallback quando a API de cotações falha (evita 502 ao criar despesa em USD)
+rate_provider = UsdBrlRateProvider(
+    url=settings.AWESOME_API_URL,
+    ttl_seconds=settings.EXCHANGE_RATE_TTL_SECONDS,
+    refresh_seconds=settings.EXCHANGE_RATE_REFRESH_SECONDS,
+    latency_budget_seconds=settings.EXCHANGE_RATE_LATENCY_BUDGET_SECONDS,
+    breaker=exchange_breaker,
+)
+
+
+async def get_usd_to_brl_rate() -> ExchangeRateResult | None:
+    """Busca a cotação atual do dólar (USD → BRL): cache se válido, senão busca (single-flight)"""
+    if rate_provider.is_fresh():
+        return rate_provider.current()
+    return await rate_provider.refresh() or rate_provider.current()
+
+
+# Taxa fallback quando não há nenhuma cotação boa conhecida (evita 502 ao criar despesa em USD)
 USD_BRL_FALLBACK_RATE = Decimal("5.50")
 
 
 def get_usd_to_brl_rate_sync() -> ExchangeRateResult | None:
-    """Versão síncrona para buscar cotação"""
+    """Cotação em cache para handlers síncronos (sem I/O de rede; None se ainda não houver)"""
+    return rate_provider.current()
+
+
+def fetch_usd_to_brl_rate_sync() -> ExchangeRateResult | None:
+    """Busca bloqueante da cotação, para scripts fora da API (mesmo breaker e orçamento de latência)"""
+    if not exchange_breaker.allow_request():
+        return rate_provider.current()
+    budget = settings.EXCHANGE_RATE_LATENCY_BUDGET_SECONDS
     try:
-        with httpx.Client() as client:
-            response = client.get(settings.AWESOME_API_URL, timeout=10.0)
+        with httpx.Client(timeout=httpx.Timeout(budget, connect=budget)) as client:
+            response = client.get(settings.AWESOME_API_URL)
             response.raise_for_status()
-            data = response.json()
-            # Awesome API: {"USDBRL": {"bid": "5.12", ...}}
-            usd_brl = data.get("USDBRL") if isinstance(data, dict) else None
-            if isinstance(usd_brl, dict):
-                bid = usd_brl.get("bid") or usd_brl.get("ask")
-                if bid is not None:
-                    rate = Decimal(str(bid))
-                    return ExchangeRateResult(rate=rate, date=datetime.now(timezone.utc))
+            rate = _parse_usd_brl(response.json())
+            if rate is None:
+                raise ValueError("Resposta de cotação sem USDBRL.bid")
     except Exception as e:
+        exchange_breaker.record_failure(e)
         print(f"Erro ao buscar cotação: {e}")
-    return None
+        return rate_provider.current()
+    exchange_breaker.record_success()
+    result = ExchangeRateResult(rate=rate, date=datetime.now(timezone.utc))
+    rate_provider.set_rate(result, source="live")
+    return result
 
 
 def convert_to_brl(value: Decimal, currency: str, exchange_rate: Decimal | None = None) -> tuple[Decimal, Decimal | None, datetime | None]:
     """
     Converte valor para BRL.
     Retorna: (value_brl, exchange_rate, exchange_rate_date)
-    Para USD, se a API de cotação falhar, usa taxa fallback.
+    Para USD, usa a cotação em cache do rate_provider (última cotação boa, mesmo com o
+    breaker aberto); só sem nenhuma cotação conhecida usa a taxa fallback.
     """
     if currency == "BRL":
         return value, None, None
@@ -73,4 +249,4 @@ def convert_to_brl(value: Decimal, currency: str, exchange_rate: Decimal | None
         exchange_date = datetime.now(timezone.utc)
 
     value_brl = value * exchange_rate
-    return value_brl, exchange_rate, exchange_date
\ No newline at end of file
+    return value_brl, exchange_rate, exchange_date
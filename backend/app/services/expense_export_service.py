@@ -0,0 +1,122 @@
+import csv
+import io
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterator
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+
+from app.core.database import SessionLocal
+from app.services import expense_service
+
+
+# (cabeçalho, atributo da linha retornada por expense_service.iter_export_rows)
+EXPORT_COLUMNS = [
+    ("Código", "code"),
+    ("Serviço", "service_name"),
+    ("Descrição", "description"),
+    ("Tipo", "expense_type"),
+    ("Status", "status"),
+    ("Categoria", "category_name"),
+    ("Empresa", "company_name"),
+    ("Setor", "department_name"),
+    ("Responsável", "owner_name"),
+    ("Valor", "value"),
+    ("Moeda", "currency"),
+    ("Cotação", "exchange_rate"),
+    ("Valor (BRL)", "value_brl"),
+    ("Periodicidade", "periodicity"),
+    ("Renovação", "renewal_date"),
+    ("Forma de pagamento", "payment_method"),
+    ("Plano", "contracted_plan"),
+    ("Usuários", "user_count"),
+    ("Mês de cancelamento", "cancellation_month"),
+    ("Criada em", "created_at"),
+]
+
+CSV_FLUSH_ROWS = 500
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Textos que o Excel/LibreOffice interpretariam como fórmula (CSV injection)
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _cell(value):
+    """Converte valor da linha para célula (enums -> valor, datas -> ISO no CSV)."""
+    if value is None:
+        return ""
+    if hasattr(value, "value"):
+        return value.value
+    return value
+
+
+def _csv_cell(value) -> str:
+    value = _cell(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Texto do usuário: o apóstrofo faz a planilha tratar como texto, não fórmula
+        return f"'{value}"
+    return str(value)
+
+
+def _xlsx_cell(sheet, value):
+    value = _cell(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        # Excel não suporta datas com timezone
+        return value.replace(tzinfo=None)
+    if isinstance(value, str) and value.startswith("="):
+        # openpyxl grava textos iniciados por "=" como fórmula: força célula de texto
+        cell = WriteOnlyCell(sheet, value)
+        cell.data_type = "s"
+        return cell
+    return value
+
+
+def stream_csv(filters: dict) -> Iterator[str]:
+    """
+    Gera o CSV em blocos de CSV_FLUSH_ROWS linhas.
+    Abre a própria sessão: o gerador roda depois que o endpoint retorna.
+    """
+    db = SessionLocal()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        # BOM para o Excel reconhecer UTF-8 (acentos)
+        buffer.write("\ufeff")
+        writer.writerow([header for header, _ in EXPORT_COLUMNS])
+        for i, row in enumerate(expense_service.iter_export_rows(db, **filters), 1):
+            writer.writerow([_csv_cell(getattr(row, attr)) for _, attr in EXPORT_COLUMNS])
+            if i % CSV_FLUSH_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+        yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+def stream_xlsx(filters: dict) -> Iterator[bytes]:
+    """
+    Gera o XLSX com openpyxl em modo write_only (linhas vão direto para disco)
+    e transmite o arquivo final em blocos de STREAM_CHUNK_SIZE bytes.
+    """
+    db = SessionLocal()
+    try:
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Despesas")
+        sheet.append([header for header, _ in EXPORT_COLUMNS])
+        for row in expense_service.iter_export_rows(db, **filters):
+            sheet.append([_xlsx_cell(sheet, getattr(row, attr)) for _, attr in EXPORT_COLUMNS])
+    finally:
+        db.close()
+
+    with tempfile.TemporaryFile() as tmp:
+        workbook.save(tmp)
+        tmp.seek(0)
+        while chunk := tmp.read(STREAM_CHUNK_SIZE):
+            yield chunk
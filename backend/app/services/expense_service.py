@@ -1,25 +1,41 @@
+import base64
+import json
+import uuid
 from uuid import UUID
 from decimal import Decimal
 from datetime import datetime, timezone, date
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, literal, or_, select, tuple_
+from sqlalchemy.orm import Session, joinedload, selectinload, aliased
 
-from app.models.expense import Expense, Currency, ExpenseStatus, ExpenseType
-from app.models.expense_validation import ExpenseValidation
+from app.core.cache import dashboard_cache
+from app.models.category import Category
+from app.models.company import Company
+from app.models.department import Department
+from app.models.expense import Expense, Currency, ExpenseStatus, ExpenseType, expense_code_seq, format_expense_code
+from app.models.expense_validation import ExpenseValidation, ValidationStatus
+from app.models.user import User, UserRole
 from app.schemas.expense import ExpenseCreate, ExpenseUpdate
+from app.services import rollup_service
+
+
+def _next_expense_codes(db: Session, count: int) -> list[str]:
+    """Reserva count códigos sequenciais em uma única ida ao banco."""
+    if count <= 0:
+        return []
+    numbers = db.execute(
+        select(expense_code_seq.next_value()).select_from(func.generate_series(1, count))
+    ).scalars().all()
+    return [format_expense_code(number) for number in sorted(numbers)]
 
 
 def _next_expense_code(db: Session) -> str:
-    """Retorna o próximo código sequencial (DP01, DP02, ...)."""
-    codes = db.query(Expense.code).filter(Expense.code.isnot(None)).all()
-    numbers = []
-    for (code,) in codes:
-        if code and code.startswith("DP"):
-            suffix = code[2:].lstrip("0") or "0"
-            if suffix.isdigit():
-                numbers.append(int(suffix))
-    next_num = max(numbers, default=0) + 1
-    return f"DP{next_num:02d}" if next_num < 100 else f"DP{next_num}"
+    """
+    Retorna o próximo código sequencial (DP01, DP02, ...).
+    O número vem de nextval(expense_code_seq): O(1) e sem corrida entre inserts concorrentes.
+    """
+    number = db.execute(expense_code_seq.next_value()).scalar()
+    return format_expense_code(number)
 
 
 def get_all(db: Session) -> list[Expense]:
@@ -36,8 +52,28 @@ def get_all(db: Session) -> list[Expense]:
         .all()
 
 
-def get_filtered(
-    db: Session,
+class InvalidCursorError(ValueError):
+    """Cursor de paginação malformado ou adulterado."""
+
+
+def encode_cursor(created_at: datetime, expense_id: UUID) -> str:
+    """Codifica a posição (created_at, id) da última despesa da página em um cursor opaco."""
+    raw = json.dumps({"c": created_at.isoformat(), "i": str(expense_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decodifica o cursor opaco gerado por encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return datetime.fromisoformat(data["c"]), UUID(data["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Cursor de paginação inválido") from e
+
+
+def _filtered_query(
+    query,
     company_ids: list[UUID] | None = None,
     department_ids: list[UUID] | None = None,
     owner_ids: list[UUID] | None = None,
@@ -46,34 +82,30 @@ def get_filtered(
     statuses: list[ExpenseStatus] | None = None,
     expense_types: list[ExpenseType] | None = None,
     service_name: str | None = None,
-) -> list[Expense]:
-    """Lista despesas com filtros opcionais (listas). Lista vazia = nenhum resultado, None = não filtra."""
-    query = db.query(Expense).options(
-        joinedload(Expense.category),
-        joinedload(Expense.company),
-        joinedload(Expense.department),
-        joinedload(Expense.owner),
-        joinedload(Expense.approver),
-    )
-    
+):
+    """
+    Aplica os filtros de listagem a uma query sobre Expense (entidade ou colunas),
+    sem eager loads nem ordenação.
+    Retorna None quando algum filtro de escopo é lista vazia (nenhum resultado possível).
+    """
     # Tratar company_ids: lista vazia = nenhum resultado
     if company_ids is not None:
         if len(company_ids) == 0:
-            return []
+            return None
         query = query.filter(Expense.company_id.in_(company_ids))
-    
+
     # Tratar department_ids: lista vazia = nenhum resultado
     if department_ids is not None:
         if len(department_ids) == 0:
-            return []
+            return None
         query = query.filter(Expense.department_id.in_(department_ids))
-    
+
     # Tratar owner_ids: lista vazia = nenhum resultado
     if owner_ids is not None:
         if len(owner_ids) == 0:
-            return []
+            return None
         query = query.filter(Expense.owner_id.in_(owner_ids))
-    
+
     if created_by_id is not None:
         query = query.filter(Expense.created_by_id == created_by_id)
     if category_ids:
@@ -84,8 +116,218 @@ def get_filtered(
         query = query.filter(Expense.expense_type.in_(expense_types))
     if service_name and service_name.strip():
         query = query.filter(Expense.service_name.ilike(f"%{service_name.strip()}%"))
-    query = query.order_by(Expense.created_at.desc())
-    return query.all()
+    return query
+
+
+def _with_list_relations(query):
+    """
+    Eager loads usados na listagem de despesas (ExpenseWithRelationsResponse).
+    Relações many-to-one vêm no mesmo SELECT; o histórico de validações (com validador)
+    vem em um único SELECT ... WHERE expense_id IN (...) para a página inteira,
+    então a listagem executa um número constante de queries independente da quantidade de linhas.
+    """
+    return query.options(
+        joinedload(Expense.category),
+        joinedload(Expense.company),
+        joinedload(Expense.department),
+        joinedload(Expense.owner),
+        joinedload(Expense.approver),
+        joinedload(Expense.created_by),
+        joinedload(Expense.cancelled_by),
+        selectinload(Expense.validations).joinedload(ExpenseValidation.validator),
+    )
+
+
+def _keyset_page(query, limit: int, cursor: str | None) -> tuple[list, str | None]:
+    """
+    Aplica paginação por keyset em (created_at DESC, id DESC) a uma query sobre Expense.
+    O cursor aponta para a última linha da página anterior; como a posição é resolvida
+    pelo índice ix_expenses_created_at_id, páginas profundas custam o mesmo que a primeira.
+    Funciona tanto para entidades quanto para linhas com colunas created_at e id.
+    """
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(Expense.created_at, Expense.id) < tuple_(cursor_created_at, cursor_id)
+        )
+    # Busca um item a mais para saber se existe próxima página
+    rows = query\
+        .order_by(Expense.created_at.desc(), Expense.id.desc())\
+        .limit(limit + 1)\
+        .all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
+
+
+def get_filtered_page(
+    db: Session,
+    limit: int,
+    cursor: str | None = None,
+    company_ids: list[UUID] | None = None,
+    department_ids: list[UUID] | None = None,
+    owner_ids: list[UUID] | None = None,
+    created_by_id: UUID | None = None,
+    category_ids: list[UUID] | None = None,
+    statuses: list[ExpenseStatus] | None = None,
+    expense_types: list[ExpenseType] | None = None,
+    service_name: str | None = None,
+) -> tuple[list[Expense], str | None]:
+    """
+    Página de despesas (com relacionamentos) por keyset em (created_at DESC, id DESC).
+    Retorna (despesas, next_cursor); next_cursor é None na última página.
+    Levanta InvalidCursorError se o cursor for inválido.
+    """
+    query = _filtered_query(
+        db.query(Expense), company_ids, department_ids, owner_ids, created_by_id,
+        category_ids, statuses, expense_types, service_name,
+    )
+    if query is None:
+        return [], None
+    return _keyset_page(_with_list_relations(query), limit, cursor)
+
+
+def _summary_query(db: Session, *extra_columns):
+    """Query de colunas usada nas listagens leves (summary/search): colunas da tabela + nomes das relações."""
+    owner = aliased(User)
+    return db.query(
+        Expense.id,
+        Expense.code,
+        Expense.service_name,
+        Expense.expense_type,
+        Expense.status,
+        Expense.value,
+        Expense.currency,
+        Expense.value_brl,
+        Expense.periodicity,
+        Expense.renewal_date,
+        Expense.category_id,
+        Expense.company_id,
+        Expense.department_id,
+        Expense.owner_id,
+        Expense.created_at,
+        Category.name.label("category_name"),
+        Company.name.label("company_name"),
+        Department.name.label("department_name"),
+        owner.name.label("owner_name"),
+        *extra_columns,
+    )\
+        .join(Category, Expense.category_id == Category.id)\
+        .join(Company, Expense.company_id == Company.id)\
+        .join(Department, Expense.department_id == Department.id)\
+        .join(owner, Expense.owner_id == owner.id)
+
+
+def get_summary_page(
+    db: Session,
+    limit: int,
+    cursor: str | None = None,
+    company_ids: list[UUID] | None = None,
+    department_ids: list[UUID] | None = None,
+    owner_ids: list[UUID] | None = None,
+    created_by_id: UUID | None = None,
+    category_ids: list[UUID] | None = None,
+    statuses: list[ExpenseStatus] | None = None,
+    expense_types: list[ExpenseType] | None = None,
+    service_name: str | None = None,
+) -> tuple[list, str | None]:
+    """
+    Versão leve de get_filtered_page para tabelas: seleciona só as colunas exibidas
+    e os nomes das relações via JOIN, retornando linhas (Row) em vez de entidades ORM
+    (sem identity map nem montagem de relacionamentos).
+    """
+    query = _filtered_query(
+        _summary_query(db), company_ids, department_ids, owner_ids, created_by_id,
+        category_ids, statuses, expense_types, service_name,
+    )
+    if query is None:
+        return [], None
+    return _keyset_page(query, limit, cursor)
+
+
+# Colunas cobertas pelos índices GIN de trigramas (pg_trgm) e usadas na busca
+SEARCH_COLUMNS = (
+    Expense.service_name,
+    Expense.description,
+    Expense.contracted_plan,
+    Expense.code,
+)
+
+
+def search(
+    db: Session,
+    term: str,
+    limit: int = 20,
+    company_ids: list[UUID] | None = None,
+    department_ids: list[UUID] | None = None,
+    owner_ids: list[UUID] | None = None,
+    created_by_id: UUID | None = None,
+    category_ids: list[UUID] | None = None,
+    statuses: list[ExpenseStatus] | None = None,
+    expense_types: list[ExpenseType] | None = None,
+    service_name: str | None = None,
+) -> list:
+    """
+    Busca aproximada por trigramas em service_name, description, contracted_plan e code.
+    Usa o operador word_similarity (<%) de pg_trgm, atendido pelos índices GIN ix_expenses_*_trgm,
+    e ordena pela maior similaridade entre as colunas. Retorna linhas do modo summary com a coluna score.
+    """
+    term = term.strip()
+    if not term:
+        return []
+    score = func.greatest(
+        *(func.word_similarity(term, func.coalesce(column, "")) for column in SEARCH_COLUMNS)
+    ).label("score")
+    query = _summary_query(db, score).filter(
+        or_(*(literal(term).op("<%")(column) for column in SEARCH_COLUMNS))
+    )
+    query = _filtered_query(
+        query, company_ids, department_ids, owner_ids, created_by_id,
+        category_ids, statuses, expense_types, service_name,
+    )
+    if query is None:
+        return []
+    return query.order_by(score.desc(), Expense.created_at.desc()).limit(limit).all()
+
+
+def iter_export_rows(
+    db: Session,
+    batch_size: int = 1000,
+    company_ids: list[UUID] | None = None,
+    department_ids: list[UUID] | None = None,
+    owner_ids: list[UUID] | None = None,
+    created_by_id: UUID | None = None,
+    category_ids: list[UUID] | None = None,
+    statuses: list[ExpenseStatus] | None = None,
+    expense_types: list[ExpenseType] | None = None,
+    service_name: str | None = None,
+):
+    """
+    Itera todas as despesas filtradas (linhas do modo summary + colunas de exportação),
+    em (created_at DESC, id DESC), usando cursor no servidor (yield_per):
+    apenas batch_size linhas ficam em memória por vez.
+    """
+    query = _summary_query(
+        db,
+        Expense.description,
+        Expense.payment_method,
+        Expense.contracted_plan,
+        Expense.user_count,
+        Expense.exchange_rate,
+        Expense.cancellation_month,
+    )
+    query = _filtered_query(
+        query, company_ids, department_ids, owner_ids, created_by_id,
+        category_ids, statuses, expense_types, service_name,
+    )
+    if query is None:
+        return
+    yield from query\
+        .order_by(Expense.created_at.desc(), Expense.id.desc())\
+        .yield_per(batch_size)
 
 
 def get_by_id(db: Session, expense_id: UUID) -> Expense | None:
@@ -200,11 +442,23 @@ def create(
         created_by_id=created_by_id,
     )
     db.add(expense)
+    db.flush()
+    rollup_service.apply_change(db, None, rollup_service.snapshot(expense))
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(expense)
     return expense
 
 
+def _lock_for_update(db: Session, expense: Expense) -> None:
+    """
+    Recarrega a despesa com SELECT ... FOR UPDATE antes do snapshot do rollup:
+    edições concorrentes (update, reject, revalue_expenses) esperam umas pelas outras
+    e cada uma calcula o delta a partir do estado já gravado, não do objeto carregado antes.
+    """
+    db.refresh(expense, with_for_update=True)
+
+
 def update(
     db: Session,
     expense: Expense,
@@ -214,6 +468,8 @@ def update(
     exchange_rate_date: datetime | None = None
 ) -> Expense:
     """Atualiza despesa existente"""
+    _lock_for_update(db, expense)
+    before = rollup_service.snapshot(expense)
     if data.service_name is not None:
         expense.service_name = data.service_name
     if data.description is not None:
@@ -264,16 +520,22 @@ def update(
         expense.status = data.status
 
     expense.updated_at = datetime.now(timezone.utc)
+    rollup_service.apply_change(db, before, rollup_service.snapshot(expense))
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(expense)
     return expense
 
 
 def delete(db: Session, expense: Expense) -> Expense:
     """Cancela despesa (soft delete)"""
+    _lock_for_update(db, expense)
+    before = rollup_service.snapshot(expense)
     expense.status = ExpenseStatus.CANCELLED
     expense.updated_at = datetime.now(timezone.utc)
+    rollup_service.apply_change(db, before, rollup_service.snapshot(expense))
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(expense)
     return expense
 
@@ -287,6 +549,8 @@ def cancel_with_info(
 ) -> Expense:
     """Cancela despesa registrando mês e se o valor do mês deve contar no dashboard."""
     now = datetime.now(timezone.utc)
+    _lock_for_update(db, expense)
+    before = rollup_service.snapshot(expense)
     if cancellation_month is None:
         cancellation_month = now.date().replace(day=1)
     expense.status = ExpenseStatus.CANCELLED
@@ -295,6 +559,142 @@ def cancel_with_info(
     expense.cancelled_at = now
     expense.cancelled_by_id = cancelled_by_id
     expense.updated_at = now
+    rollup_service.apply_change(db, before, rollup_service.snapshot(expense))
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(expense)
-    return expense
\ No newline at end of file
+    return expense
+
+
+def bulk_create(
+    db: Session,
+    rows: list[ExpenseCreate],
+    current_user: User,
+) -> list[dict]:
+    """
+    Cria várias despesas em uma única transação (importação em lote).
+    Valida categorias, empresas, setores (e se pertencem à empresa da linha), responsáveis
+    e validadores com uma query por tabela,
+    busca a cotação USD uma única vez, reserva os códigos de uma vez e insere as despesas
+    junto com a validação do mês de criação.
+    Linhas inválidas não impedem as demais; retorna um resultado por linha
+    ({"row", "success", "expense_id", "code", "errors"}), na ordem recebida.
+    """
+    from app.core.permissions import can_create_expense_in_company, _role_value
+    from app.services import exchange_service
+
+    category_ids = {r.category_id for r in rows}
+    company_ids = {r.company_id for r in rows}
+    department_ids = {r.department_id for r in rows}
+    owner_ids = {r.owner_id for r in rows}
+    # Validador omitido = responsável
+    approver_ids = {r.approver_id for r in rows if r.approver_id is not None}
+    user_ids = owner_ids | approver_ids
+
+    existing_categories = {
+        c for (c,) in db.query(Category.id).filter(Category.id.in_(category_ids))
+    } if category_ids else set()
+    existing_companies = {
+        c for (c,) in db.query(Company.id).filter(Company.id.in_(company_ids))
+    } if company_ids else set()
+    department_companies = dict(
+        db.query(Department.id, Department.company_id).filter(Department.id.in_(department_ids))
+    ) if department_ids else {}
+    users = {
+        u.id: u for u in db.query(User).options(selectinload(User.companies)).filter(User.id.in_(user_ids))
+    } if user_ids else {}
+
+    results = []
+    valid_rows = []
+    for index, data in enumerate(rows):
+        errors = []
+        if data.category_id not in existing_categories:
+            errors.append("Categoria não encontrada")
+        if data.company_id not in existing_companies:
+            errors.append("Empresa não encontrada")
+        if data.department_id not in department_companies:
+            errors.append("Setor não encontrado")
+        elif department_companies[data.department_id] != data.company_id:
+            errors.append("O setor selecionado não pertence à empresa escolhida")
+        owner = users.get(data.owner_id)
+        if owner is None:
+            errors.append("Responsável não encontrado")
+        elif _role_value(owner.role) not in (UserRole.SYSTEM_ADMIN.value, UserRole.FINANCE_ADMIN.value):
+            owner_company_ids = [c.id for c in owner.companies] if owner.companies else []
+            if data.company_id not in owner_company_ids:
+                errors.append("O responsável selecionado não pertence à empresa escolhida")
+        if data.approver_id is not None and data.approver_id not in users:
+            errors.append("Validador não encontrado")
+        if not can_create_expense_in_company(current_user, data.company_id):
+            errors.append("Você não tem permissão para criar despesa nesta empresa")
+        result = {"row": index, "success": not errors, "expense_id": None, "code": None, "errors": errors}
+        results.append(result)
+        if not errors:
+            valid_rows.append((data, result))
+
+    if not valid_rows:
+        return results
+
+    # Cotação USD buscada uma vez para o lote inteiro
+    usd_rate = None
+    if any(data.currency == Currency.USD for data, _ in valid_rows):
+        rate_result = exchange_service.get_usd_to_brl_rate_sync()
+        usd_rate = rate_result.rate if rate_result else exchange_service.USD_BRL_FALLBACK_RATE
+
+    codes = _next_expense_codes(db, len(valid_rows))
+    validation_month = datetime.now(timezone.utc).date().replace(day=1)
+    expenses = []
+    validations = []
+    for (data, result), code in zip(valid_rows, codes):
+        currency_str = data.currency.value if hasattr(data.currency, "value") else str(data.currency)
+        value_brl, exchange_rate, exchange_rate_date = exchange_service.convert_to_brl(
+            data.value, currency_str, exchange_rate=usd_rate if currency_str == Currency.USD.value else None
+        )
+        expense_id = uuid.uuid4()
+        expenses.append(Expense(
+            id=expense_id,
+            code=code,
+            service_name=data.service_name,
+            description=data.description,
+            expense_type=data.expense_type,
+            category_id=data.category_id,
+            company_id=data.company_id,
+            department_id=data.department_id,
+            owner_id=data.owner_id,
+            # Responsável = validador
+            approver_id=data.approver_id if data.approver_id is not None else data.owner_id,
+            value=data.value,
+            currency=data.currency,
+            value_brl=value_brl,
+            exchange_rate=exchange_rate,
+            exchange_rate_date=exchange_rate_date,
+            periodicity=data.periodicity,
+            renewal_date=data.renewal_date,
+            payment_method=data.payment_method,
+            payment_identifier=data.payment_identifier,
+            contracted_plan=data.contracted_plan,
+            user_count=data.user_count,
+            evidence_link=data.evidence_link,
+            login=data.login,
+            password=(data.password.strip() if data.password and data.password.strip() else "N/A"),
+            notes=data.notes,
+            status=ExpenseStatus.ACTIVE,
+            created_by_id=current_user.id,
+        ))
+        validations.append(ExpenseValidation(
+            expense_id=expense_id,
+            validator_id=None,
+            validation_month=validation_month,
+            status=ValidationStatus.PENDING,
+            is_overdue=False,
+        ))
+        result["expense_id"] = expense_id
+        result["code"] = code
+
+    db.add_all(expenses)
+    db.flush()
+    db.add_all(validations)
+    rollup_service.apply_changes(db, [(None, rollup_service.snapshot(e)) for e in expenses])
+    db.commit()
+    dashboard_cache.invalidate()
+    return results
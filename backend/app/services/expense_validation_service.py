@@ -1,13 +1,26 @@
 from uuid import UUID
 from datetime import date, datetime, timezone, timedelta
 
-from sqlalchemy.orm import Session, joinedload, subqueryload
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, aliased, contains_eager, joinedload, subqueryload
+from sqlalchemy import Date, and_, case, cast, extract, false, func, literal, literal_column, select, text, true, update
+from sqlalchemy.dialects.postgresql import insert
 
+from app.core.cache import dashboard_cache
+from app.core.config import settings
 from app.models.expense_validation import ExpenseValidation, ValidationStatus
 from app.models.expense import Expense, ExpenseStatus, ExpenseType, Periodicity
 from app.models.user import User, UserRole
 from app.schemas.expense_validation import ExpenseValidationCreate
+from app.services import rollup_service
+
+
+# Intervalo em meses entre cobranças de cada periodicidade
+PERIODICITY_MONTHS = {
+    Periodicity.MONTHLY: 1,
+    Periodicity.QUARTERLY: 3,
+    Periodicity.SEMIANNUAL: 6,
+    Periodicity.ANNUAL: 12,
+}
 
 
 def should_create_validation_for_month(expense: Expense, target_month: date) -> bool:
@@ -36,13 +49,7 @@ def should_create_validation_for_month(expense: Expense, target_month: date) ->
     else:
         anchor_month = creation_month
 
-    periodicity_months = {
-        Periodicity.MONTHLY: 1,
-        Periodicity.QUARTERLY: 3,
-        Periodicity.SEMIANNUAL: 6,
-        Periodicity.ANNUAL: 12,
-    }
-    months_interval = periodicity_months.get(expense.periodicity, 1)
+    months_interval = PERIODICITY_MONTHS.get(expense.periodicity, 1)
 
     # Calcular diferença em meses entre âncora e mês alvo
     diff = (target_first_day.year - anchor_month.year) * 12 + (
@@ -78,58 +85,113 @@ def create_validation_for_creation_month(db: Session, expense: Expense) -> Expen
     )
     db.add(validation)
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(validation)
     return validation
 
 
-def create_monthly_validations(db: Session, month_date: date) -> list[ExpenseValidation]:
+def _month_diff(later, earlier):
+    """Diferença em meses entre duas expressões de data (SQL)."""
+    return (
+        (extract('year', later) - extract('year', earlier)) * 12
+        + (extract('month', later) - extract('month', earlier))
+    )
+
+
+def _periodicity_interval():
+    """Intervalo em meses da periodicidade da despesa (SQL), como PERIODICITY_MONTHS."""
+    return case(
+        {periodicity: months_interval for periodicity, months_interval in PERIODICITY_MONTHS.items()},
+        value=Expense.periodicity,
+        else_=1,
+    )
+
+
+def _advanced_renewal_date():
+    """
+    renewal_date avançada em um ciclo (SQL), como _advance_expense_renewal_date_once:
+    date + interval de meses do Postgres limita o dia ao fim do mês (31/01 -> 29/02).
+    """
+    return cast(
+        Expense.renewal_date + literal_column("INTERVAL '1 month'") * _periodicity_interval(),
+        Date,
+    )
+
+
+def _due_months(first_day: date, last_day: date):
+    """
+    Meses de first_day a last_day (subquery months) e as condições SQL de
+    should_create_validation_for_month para o par (Expense, months.validation_month):
+    despesa recorrente ativa, mês posterior ao de criação e
+    (mês - âncora) múltiplo do intervalo da periodicidade.
+    """
+    months = select(
+        cast(
+            func.generate_series(first_day, last_day, literal_column("INTERVAL '1 month'")),
+            Date,
+        ).label("validation_month")
+    ).subquery("months")
+
+    creation_month = cast(func.date_trunc('month', Expense.created_at), Date)
+    # Âncora: mês da renewal_date se houver, senão mês de criação
+    anchor_month = func.coalesce(cast(func.date_trunc('month', Expense.renewal_date), Date), creation_month)
+    interval = _periodicity_interval()
+
+    conditions = [
+        Expense.status == ExpenseStatus.ACTIVE,
+        Expense.expense_type == ExpenseType.RECURRING,
+        Expense.periodicity.isnot(None),
+        # Não criar validação para meses anteriores ou iguais à criação
+        months.c.validation_month > creation_month,
+        _month_diff(months.c.validation_month, anchor_month) % interval == 0,
+    ]
+    return months, conditions
+
+
+def create_monthly_validations(
+    db: Session,
+    month_date: date,
+    end_month: date | None = None,
+) -> list[ExpenseValidation]:
     """
-    Cria validações para todas despesas recorrentes ativas do mês.
-    Baseado na periodicidade da despesa.
+    Cria validações para todas despesas recorrentes ativas do mês (ou de cada mês
+    de month_date até end_month, inclusive, para recuperar meses perdidos).
+    Baseado na periodicidade da despesa, com a mesma regra de
+    should_create_validation_for_month expressa em SQL, em um único
+    INSERT ... SELECT ... ON CONFLICT (expense_id, validation_month) DO NOTHING.
     Não associa a nenhum validador inicialmente (validator_id = NULL).
+    Retorna apenas as validações efetivamente criadas.
     """
-    # Primeiro dia do mês
     first_day = month_date.replace(day=1)
-    
-    # Buscar todas despesas recorrentes ativas
-    active_expenses = db.query(Expense).filter(
-        Expense.status == ExpenseStatus.ACTIVE,
-        Expense.expense_type == ExpenseType.RECURRING
-    ).all()
-    
-    validations = []
-    
-    for expense in active_expenses:
-        # Verificar se deve criar validação para este mês baseado na periodicidade
-        if not should_create_validation_for_month(expense, first_day):
-            continue
-        
-        # Verificar se já existe validação para este mês
-        existing = db.query(ExpenseValidation).filter(
-            and_(
-                ExpenseValidation.expense_id == expense.id,
-                ExpenseValidation.validation_month == first_day
-            )
-        ).first()
-        
-        if not existing:
-            validation = ExpenseValidation(
-                expense_id=expense.id,
-                validator_id=None,  # Não associar a nenhum validador inicialmente
-                validation_month=first_day,
-                status=ValidationStatus.PENDING,
-                is_overdue=False
-            )
-            db.add(validation)
-            validations.append(validation)
-    
+    last_day = (end_month or month_date).replace(day=1)
+    if last_day < first_day:
+        raise ValueError("end_month deve ser posterior ou igual a month_date")
+
+    months, due = _due_months(first_day, last_day)
+    candidates = select(
+        func.gen_random_uuid(),
+        Expense.id,
+        months.c.validation_month,
+        literal(ValidationStatus.PENDING.value).cast(ExpenseValidation.status.type),
+        false(),
+        func.now(),
+        func.now(),
+    ).select_from(Expense).join(months, true()).where(*due)
+
+    stmt = insert(ExpenseValidation).from_select(
+        ["id", "expense_id", "validation_month", "status", "is_overdue", "created_at", "updated_at"],
+        candidates,
+    ).on_conflict_do_nothing(
+        index_elements=[ExpenseValidation.expense_id, ExpenseValidation.validation_month],
+    ).returning(ExpenseValidation.id)
+
+    created_ids = db.execute(stmt).scalars().all()
     db.commit()
-    
-    # Refresh todas as validações criadas
-    for validation in validations:
-        db.refresh(validation)
-    
-    return validations
+    dashboard_cache.invalidate()
+
+    if not created_ids:
+        return []
+    return db.query(ExpenseValidation).filter(ExpenseValidation.id.in_(created_ids)).all()
 
 
 def _last_day_of_month(year: int, month: int) -> int:
@@ -149,13 +211,7 @@ def _advance_expense_renewal_date_once(expense: Expense) -> None:
     """
     if not expense.renewal_date or not expense.periodicity:
         return
-    periodicity_months = {
-        Periodicity.MONTHLY: 1,
-        Periodicity.QUARTERLY: 3,
-        Periodicity.SEMIANNUAL: 6,
-        Periodicity.ANNUAL: 12,
-    }
-    interval = periodicity_months.get(expense.periodicity, 1)
+    interval = PERIODICITY_MONTHS.get(expense.periodicity, 1)
     new_date = expense.renewal_date
     month = new_date.month + interval
     year = new_date.year + (month - 1) // 12
@@ -164,43 +220,92 @@ def _advance_expense_renewal_date_once(expense: Expense) -> None:
     expense.renewal_date = date(year, month, day)
 
 
+def _sql_last_day(month_index: str) -> str:
+    """Último dia do mês (SQL) para um índice de mês (ano * 12 + mês - 1)."""
+    return (
+        f"extract(day FROM make_date(({month_index}) / 12, ({month_index}) % 12 + 1, 1)"
+        f" + INTERVAL '1 month - 1 day')::int"
+    )
+
+
+def _sql_min_last_day(m0: str, step: str, cycles: str) -> str:
+    """
+    Menor último dia entre os meses m0 + step * j visitados nos ciclos j = 1..cycles (SQL), ou seja,
+    o limite do dia após avançar ciclo a ciclo (o dia limitado em fevereiro fica
+    limitado nos ciclos seguintes). Os meses visitados se repetem a cada 12 / step
+    ciclos e em 24 / step ciclos cada um aparece em dois anos seguidos (inclui um
+    fevereiro não bissexto), então bastam no máximo 24 meses por despesa.
+    """
+    return (
+        f"(SELECT min({_sql_last_day(f'{m0} + {step} * j')})"
+        f" FROM generate_series(1, least({cycles}, 24 / {step})) AS j)"
+    )
+
+
 def advance_renewal_dates(db: Session) -> int:
     """
     Avança renewal_date para a próxima ocorrência futura baseada na periodicidade.
     Despesas com renewal_date no passado têm a data atualizada (ex: 23/05/2025 -> 23/05/2026 para anual).
     Preserva o dia original do mês (ex: dia 31 em jan -> 28 ou 29 em fev).
+    Forma fechada, em um único UPDATE: o número de ciclos a pular vem da diferença
+    em meses até hoje (sem repetir ciclo a ciclo), com o dia limitado ao fim do mês
+    exatamente como no avanço ciclo a ciclo (_advance_expense_renewal_date_once).
     """
     today = date.today()
+    schema = settings.DATABASE_SCHEMA
+    # first_cycle: primeiro ciclo (j1) que chega ao mês atual ou depois;
+    # cycles: se j1 cai no mês atual com o dia antes de hoje, pula mais um ciclo
+    step = " ".join(
+        f"WHEN '{periodicity.value}' THEN {months_interval}"
+        for periodicity, months_interval in PERIODICITY_MONTHS.items()
+    )
 
-    expenses = db.query(Expense).filter(
-        Expense.status == ExpenseStatus.ACTIVE,
-        Expense.expense_type == ExpenseType.RECURRING,
-        Expense.renewal_date.isnot(None),
-        Expense.renewal_date < today,
-        Expense.periodicity.isnot(None),
-    ).all()
-
-    periodicity_months = {
-        Periodicity.MONTHLY: 1,
-        Periodicity.QUARTERLY: 3,
-        Periodicity.SEMIANNUAL: 6,
-        Periodicity.ANNUAL: 12,
-    }
-
-    count = 0
-    for expense in expenses:
-        interval = periodicity_months.get(expense.periodicity, 1)
-        new_date = expense.renewal_date
-        while new_date < today:
-            month = new_date.month + interval
-            year = new_date.year + (month - 1) // 12
-            month = (month - 1) % 12 + 1
-            day = min(new_date.day, _last_day_of_month(year, month))
-            new_date = date(year, month, day)
-        expense.renewal_date = new_date
-        count += 1
+    result = db.execute(text(f"""
+        WITH due AS (
+            SELECT e.id,
+                   CASE e.periodicity::text {step} ELSE 1 END AS step,
+                   (extract(year FROM e.renewal_date) * 12 + extract(month FROM e.renewal_date) - 1)::int AS m0,
+                   extract(day FROM e.renewal_date)::int AS d0
+            FROM {schema}.expenses e
+            WHERE e.status = 'active'
+              AND e.expense_type = 'recurring'
+              AND e.renewal_date IS NOT NULL
+              AND e.renewal_date < :today
+              AND e.periodicity IS NOT NULL
+            FOR UPDATE
+        ),
+        first_cycle AS (
+            SELECT due.*, greatest(1, ceil((:today_month - m0)::numeric / step))::int AS j1
+            FROM due
+        ),
+        cycles AS (
+            SELECT id, step, m0, d0,
+                   CASE
+                       WHEN m0 + step * j1 = :today_month
+                            AND least(d0, {_sql_min_last_day('m0', 'step', 'j1')}) < :today_day
+                       THEN j1 + 1
+                       ELSE j1
+                   END AS n
+            FROM first_cycle
+        )
+        UPDATE {schema}.expenses e
+        SET renewal_date = make_date(
+                (cycles.m0 + cycles.step * cycles.n) / 12,
+                (cycles.m0 + cycles.step * cycles.n) % 12 + 1,
+                least(cycles.d0, {_sql_min_last_day('cycles.m0', 'cycles.step', 'cycles.n')})
+            ),
+            updated_at = now()
+        FROM cycles
+        WHERE e.id = cycles.id
+    """), {
+        "today": today,
+        "today_month": today.year * 12 + today.month - 1,
+        "today_day": today.day,
+    })
+    count = result.rowcount
 
     db.commit()
+    dashboard_cache.invalidate()
     return count
 
 
@@ -265,22 +370,23 @@ def mark_overdue_validations(db: Session) -> int:
     if today <= deadline:
         return 0
     
-    # Buscar validações pendentes do mês atual que estão atrasadas
-    overdue_validations = db.query(ExpenseValidation).filter(
+    # Marcar em um único UPDATE as validações pendentes do mês atual que estão atrasadas
+    count = db.query(ExpenseValidation).filter(
         and_(
             ExpenseValidation.status == ValidationStatus.PENDING,
             ExpenseValidation.validation_month == first_day_current_month,
             ExpenseValidation.is_overdue == False
         )
-    ).all()
-    
-    count = 0
-    for validation in overdue_validations:
-        validation.is_overdue = True
-        validation.updated_at = datetime.now(timezone.utc)
-        count += 1
+    ).update(
+        {
+            ExpenseValidation.is_overdue: True,
+            ExpenseValidation.updated_at: datetime.now(timezone.utc),
+        },
+        synchronize_session=False,
+    )
     
     db.commit()
+    dashboard_cache.invalidate()
     return count
 
 
@@ -311,31 +417,67 @@ def get_by_id(db: Session, validation_id: UUID) -> ExpenseValidation | None:
     ).first()
 
 
+def get_expense_for_validation(db: Session, validation_id: UUID) -> Expense | None:
+    """Despesa da validação (sem eager loads), para checar permissão antes de aprovar/rejeitar."""
+    return db.query(Expense).join(
+        ExpenseValidation, ExpenseValidation.expense_id == Expense.id
+    ).filter(
+        ExpenseValidation.id == validation_id
+    ).first()
+
+
+def _decide_pending(validation_id: UUID, status: ValidationStatus, validator_id: UUID, now: datetime):
+    """
+    UPDATE condicional da validação (só se ainda estiver pendente), como CTE com RETURNING.
+    Sob concorrência, só um UPDATE encontra a linha pendente: os demais esperam o lock
+    da linha, reavaliam status = 'pending' e não atualizam nada.
+    """
+    return update(ExpenseValidation).where(
+        ExpenseValidation.id == validation_id,
+        ExpenseValidation.status == ValidationStatus.PENDING,
+    ).values(
+        status=status,
+        validator_id=validator_id,
+        validated_at=now,
+        updated_at=now,
+    ).returning(*ExpenseValidation.__table__.c).cte("decided")
+
+
+def _raise_not_pending(db: Session, validation_id: UUID):
+    """Motivo de o UPDATE condicional não ter atualizado nada."""
+    db.rollback()
+    if db.query(ExpenseValidation.id).filter(ExpenseValidation.id == validation_id).first() is None:
+        raise ValueError("Validação não encontrada")
+    raise ValueError("Esta validação já foi processada")
+
+
 def approve(db: Session, validation_id: UUID, validator_id: UUID) -> ExpenseValidation:
     """
     Aprova validação.
     Preenche validator_id com o usuário que está aprovando.
+    Um único statement: UPDATE condicional da validação (WHERE status = 'pending')
+    e, na mesma CTE, avanço da renewal_date da despesa para o próximo ciclo.
     """
-    validation = get_by_id(db, validation_id)
-    
-    if not validation:
-        raise ValueError("Validação não encontrada")
-    
-    if validation.status != ValidationStatus.PENDING:
-        raise ValueError("Esta validação já foi processada")
-    
-    validation.status = ValidationStatus.APPROVED
-    validation.validator_id = validator_id  # Preencher com quem está aprovando
-    validation.validated_at = datetime.now(timezone.utc)
-    validation.updated_at = datetime.now(timezone.utc)
-
+    now = datetime.now(timezone.utc)
+    decided = _decide_pending(validation_id, ValidationStatus.APPROVED, validator_id, now)
     # Avançar data de renovação da despesa para o próximo ciclo
-    if validation.expense:
-        _advance_expense_renewal_date_once(validation.expense)
+    advanced = update(Expense).where(
+        Expense.id == decided.c.expense_id,
+        Expense.renewal_date.isnot(None),
+        Expense.periodicity.isnot(None),
+    ).values(
+        renewal_date=_advanced_renewal_date(),
+    ).returning(Expense.id).cte("advanced")
 
-    db.commit()
-    db.refresh(validation)
+    validation = db.execute(
+        select(aliased(ExpenseValidation, decided)).add_cte(advanced),
+        execution_options={"populate_existing": True},
+    ).scalars().first()
+    if validation is None:
+        _raise_not_pending(db, validation_id)
 
+    db.commit()
+    dashboard_cache.invalidate()
     return validation
 
 
@@ -349,33 +491,152 @@ def reject(
     Rejeita validação.
     Muda o status da despesa para CANCELLED.
     Preenche cancellation_month (mês da validação) e charged_when_cancelled na despesa.
+    Um statement para o UPDATE condicional da validação e o cancelamento da despesa
+    (CTEs; o estado anterior da despesa volta no mesmo statement) e um para o rollup.
     """
-    validation = get_by_id(db, validation_id)
-    if not validation:
-        raise ValueError("Validação não encontrada")
-    if validation.status != ValidationStatus.PENDING:
-        raise ValueError("Esta validação já foi processada")
-
-    expense = db.query(Expense).filter(Expense.id == validation.expense_id).first()
-    if not expense:
-        raise ValueError("Despesa não encontrada")
+    now = datetime.now(timezone.utc)
+    decided = _decide_pending(validation_id, ValidationStatus.REJECTED, validator_id, now)
+    previous = select(
+        Expense.id,
+        Expense.created_at,
+        Expense.company_id,
+        Expense.department_id,
+        Expense.category_id,
+        Expense.status,
+        Expense.expense_type,
+        Expense.value_brl,
+    ).where(
+        Expense.id == decided.c.expense_id
+    ).with_for_update(of=Expense).cte("previous")
+    cancelled = update(Expense).where(
+        Expense.id == previous.c.id,
+        Expense.id == decided.c.expense_id,
+    ).values(
+        status=ExpenseStatus.CANCELLED,
+        cancellation_month=decided.c.validation_month,
+        charged_when_cancelled=charged_this_month,
+        cancelled_at=now,
+        cancelled_by_id=validator_id,
+        updated_at=now,
+    ).returning(Expense.id).cte("cancelled")
+
+    row = db.execute(
+        select(
+            aliased(ExpenseValidation, decided),
+            previous.c.created_at,
+            previous.c.company_id,
+            previous.c.department_id,
+            previous.c.category_id,
+            previous.c.status,
+            previous.c.expense_type,
+            previous.c.value_brl,
+        ).join(previous, previous.c.id == decided.c.expense_id).add_cte(cancelled),
+        execution_options={"populate_existing": True},
+    ).first()
+    if row is None:
+        _raise_not_pending(db, validation_id)
 
-    validation.status = ValidationStatus.REJECTED
-    validation.validator_id = validator_id
-    validation.validated_at = datetime.now(timezone.utc)
-    validation.updated_at = datetime.now(timezone.utc)
+    rollup_service.apply_change(
+        db,
+        rollup_service.snapshot(row),
+        rollup_service.snapshot(row, status=ExpenseStatus.CANCELLED),
+    )
+    db.commit()
+    dashboard_cache.invalidate()
+    return row[0]
 
+def bulk_decide(
+    db: Session,
+    approve_ids: list[UUID],
+    reject_ids: list[UUID],
+    current_user: User,
+    charged_this_month: bool = False,
+) -> list[dict]:
+    """
+    Aprova e rejeita várias validações em uma única transação.
+    Carrega todas as validações (com as despesas) em uma query, com lock das linhas das duas tabelas,
+    verifica can_approve_expense para cada uma e aplica as mesmas mudanças de
+    approve/reject. charged_this_month vale para todas as rejeitadas.
+    Itens inválidos (não encontrada, sem permissão, já processada) não impedem os demais;
+    retorna um resultado por id ({"id", "action", "success", "status", "error"}),
+    aprovações primeiro, na ordem recebida.
+    """
+    from app.core.permissions import can_approve_expense
+
+    requested = [(validation_id, "approve") for validation_id in approve_ids]
+    requested += [(validation_id, "reject") for validation_id in reject_ids]
+    all_ids = {validation_id for validation_id, _ in requested}
+
+    # Trava as validações e as despesas (renewal_date e cancelamento partem do estado gravado,
+    # como em approve()/reject()); populate_existing descarta objetos já carregados na sessão
+    validations = {
+        v.id: v for v in db.query(ExpenseValidation).join(
+            ExpenseValidation.expense
+        ).options(
+            contains_eager(ExpenseValidation.expense)
+        ).filter(
+            ExpenseValidation.id.in_(all_ids)
+        ).order_by(
+            ExpenseValidation.id
+        ).with_for_update(of=[ExpenseValidation, Expense]).populate_existing().all()
+    } if all_ids else {}
+
+    conflicting = set(approve_ids) & set(reject_ids)
+    seen = set()
     now = datetime.now(timezone.utc)
-    expense.status = ExpenseStatus.CANCELLED
-    expense.cancellation_month = validation.validation_month
-    expense.charged_when_cancelled = charged_this_month
-    expense.cancelled_at = now
-    expense.cancelled_by_id = validator_id
-    expense.updated_at = now
+    rollup_changes = []
+    results = []
+    for validation_id, action in requested:
+        result = {"id": validation_id, "action": action, "success": False, "status": None, "error": None}
+        results.append(result)
+        validation = validations.get(validation_id)
+        if validation_id in conflicting:
+            result["error"] = "Validação informada para aprovar e rejeitar"
+            continue
+        if validation_id in seen:
+            result["error"] = "Validação repetida na requisição"
+            continue
+        seen.add(validation_id)
+        if validation is None or validation.expense is None:
+            result["error"] = "Validação não encontrada"
+            continue
+        if not can_approve_expense(current_user, validation.expense):
+            verb = "aprovar" if action == "approve" else "rejeitar"
+            result["error"] = f"Você não tem permissão para {verb} esta validação"
+            continue
+        if validation.status != ValidationStatus.PENDING:
+            result["error"] = "Esta validação já foi processada"
+            result["status"] = validation.status
+            continue
 
-    db.commit()
-    db.refresh(validation)
-    return validation
+        validation.validator_id = current_user.id
+        validation.validated_at = now
+        validation.updated_at = now
+        expense = validation.expense
+        if action == "approve":
+            validation.status = ValidationStatus.APPROVED
+            # Avançar data de renovação da despesa para o próximo ciclo
+            _advance_expense_renewal_date_once(expense)
+        else:
+            validation.status = ValidationStatus.REJECTED
+            before = rollup_service.snapshot(expense)
+            expense.status = ExpenseStatus.CANCELLED
+            expense.cancellation_month = validation.validation_month
+            expense.charged_when_cancelled = charged_this_month
+            expense.cancelled_at = now
+            expense.cancelled_by_id = current_user.id
+            expense.updated_at = now
+            rollup_changes.append((before, rollup_service.snapshot(expense)))
+        result["success"] = True
+        result["status"] = validation.status
+
+    if any(result["success"] for result in results):
+        rollup_service.apply_changes(db, rollup_changes)
+        db.commit()
+        dashboard_cache.invalidate()
+    else:
+        db.rollback()  # Libera os locks
+    return results
 
 
 def get_history(
@@ -415,33 +676,40 @@ def get_all_for_expense(db: Session, expense_id: UUID) -> list[ExpenseValidation
 
 def get_predicted_validations(
     db: Session,
-    target_month: date,
+    from_month: date,
+    to_month: date | None = None,
     current_user: User | None = None
 ) -> list[dict]:
     """
-    Retorna validações previstas para um mês futuro.
+    Retorna validações previstas de from_month até to_month (inclusive; padrão: só from_month).
     Não cria registros no banco, apenas calcula quais despesas teriam validação.
     IMPORTANTE: Apenas despesas com status ACTIVE são consideradas.
     Despesas canceladas (CANCELLED) ou com outros status não aparecem.
     Se current_user for informado, filtra pelo escopo do role.
-    Retorna lista de dicionários com dados da despesa e mês previsto.
+    Uma única consulta: regra de periodicidade em SQL e anti-join (NOT EXISTS) com
+    expense_validations para descartar meses que já têm validação criada.
+    Retorna lista de dicionários com dados da despesa e mês previsto, ordenada por mês.
     """
     from app.core.permissions import get_expense_scope_params
     
-    first_day = target_month.replace(day=1)
+    first_day = from_month.replace(day=1)
+    last_day = (to_month or from_month).replace(day=1)
+    if last_day < first_day:
+        raise ValueError("to_month deve ser posterior ou igual a from_month")
     
-    # Buscar APENAS despesas recorrentes ATIVAS (não canceladas)
-    # Filtro explícito: status == ACTIVE garante que canceladas não aparecem
-    query = db.query(Expense).options(
+    months, due = _due_months(first_day, last_day)
+    already_created = select(ExpenseValidation.id).where(
+        ExpenseValidation.expense_id == Expense.id,
+        ExpenseValidation.validation_month == months.c.validation_month,
+    ).exists()
+    
+    query = db.query(Expense, months.c.validation_month).options(
         joinedload(Expense.category),
         joinedload(Expense.company),
         joinedload(Expense.department),
         joinedload(Expense.owner),
         joinedload(Expense.approver)
-    ).filter(
-        Expense.status == ExpenseStatus.ACTIVE,  # Apenas ativas
-        Expense.expense_type == ExpenseType.RECURRING
-    )
+    ).join(months, true()).filter(*due, ~already_created)
     
     # Aplicar filtros de escopo se current_user for fornecido
     if current_user:
@@ -463,26 +731,13 @@ def get_predicted_validations(
         if scope_department_ids is not None:
             query = query.filter(Expense.department_id.in_(scope_department_ids))
     
-    active_expenses = query.all()
-    
-    predicted = []
-    
-    for expense in active_expenses:
-        # Verificar se deve ter validação para este mês baseado na periodicidade
-        if should_create_validation_for_month(expense, first_day):
-            # Verificar se já existe validação criada (se já foi criada, não é mais "prevista")
-            existing = db.query(ExpenseValidation).filter(
-                and_(
-                    ExpenseValidation.expense_id == expense.id,
-                    ExpenseValidation.validation_month == first_day
-                )
-            ).first()
-            
-            if not existing:
-                predicted.append({
-                    "expense": expense,
-                    "validation_month": first_day,
-                    "is_predicted": True
-                })
+    rows = query.order_by(months.c.validation_month, Expense.service_name, Expense.id).all()
     
-    return predicted
+    return [
+        {
+            "expense": expense,
+            "validation_month": validation_month,
+            "is_predicted": True
+        }
+        for expense, validation_month in rows
+    ]
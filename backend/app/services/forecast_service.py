@@ -0,0 +1,146 @@
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import BigInteger, Date, Integer, and_, case, cast, extract, func
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.models.company import Company
+from app.models.department import Department
+from app.models.expense import Expense, ExpenseStatus, ExpenseType
+from app.schemas.dashboard import ForecastItem, ForecastMonth, ForecastResponse
+from app.services.expense_validation_service import PERIODICITY_MONTHS
+
+
+def _month_index(value: date) -> int:
+    """Mês como inteiro (ano * 12 + mês - 1) para aritmética de periodicidade."""
+    return value.year * 12 + value.month - 1
+
+
+def _month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def _to_brl(cents) -> Decimal:
+    return (Decimal(int(cents)) / 100).quantize(Decimal('0.01'))
+
+
+def _index_expr(value):
+    """Mês como inteiro no SQL (mesma conta de _month_index)."""
+    return cast(extract('year', value) * 12 + extract('month', value) - 1, Integer)
+
+
+def _recurring_groups(db: Session, base_filters: list, start_index: int):
+    """
+    Despesas recorrentes ativas agrupadas no banco por
+    (empresa, setor, categoria, intervalo, fase, mês de criação), com a soma em centavos.
+    A fase é o mês-âncora (renewal_date ou created_at, como em
+    should_create_validation_for_month) módulo o intervalo: despesas com a
+    mesma fase caem nos mesmos meses, então 100k assinaturas viram poucos grupos.
+    O mês de criação (no fuso da sessão, como a regra em Python e create_monthly_validations)
+    só importa se for >= start_index; meses anteriores viram start_index - 1 (um único grupo).
+    """
+    interval = case(
+        {periodicity: months for periodicity, months in PERIODICITY_MONTHS.items()},
+        value=Expense.periodicity,
+        else_=1,
+    )
+    creation_month = cast(func.date_trunc('month', Expense.created_at), Date)
+    anchor = func.coalesce(Expense.renewal_date, creation_month)
+    phase = _index_expr(anchor) % interval
+    created = func.greatest(_index_expr(creation_month), start_index - 1)
+
+    return db.query(
+        Expense.company_id,
+        Company.name.label('company_name'),
+        Expense.department_id,
+        Department.name.label('department_name'),
+        Expense.category_id,
+        Category.name.label('category_name'),
+        interval.label('interval'),
+        phase.label('phase'),
+        created.label('created'),
+        cast(func.sum(Expense.value_brl) * 100, BigInteger).label('cents'),
+    ).join(
+        Company, Expense.company_id == Company.id
+    ).join(
+        Department, Expense.department_id == Department.id
+    ).join(
+        Category, Expense.category_id == Category.id
+    ).filter(
+        and_(
+            *base_filters,
+            Expense.status == ExpenseStatus.ACTIVE,
+            Expense.expense_type == ExpenseType.RECURRING,
+            Expense.periodicity.isnot(None),
+        )
+    ).group_by(
+        Expense.company_id, Company.name,
+        Expense.department_id, Department.name,
+        Expense.category_id, Category.name,
+        interval, phase, created,
+    ).all()
+
+
+def project(db: Session, base_filters: list, start_month: date, months: int) -> ForecastResponse:
+    """
+    Projeta o desembolso em BRL de start_month até start_month + months - 1,
+    por mês e por (empresa, setor, categoria).
+    Vetorizado: matriz grupos x meses com a regra de periodicidade
+    (mês - fase) % intervalo == 0 e mês > mês de criação; valores em centavos
+    inteiros (sem erro de ponto flutuante).
+    """
+    start_index = _month_index(start_month)
+    rows = _recurring_groups(db, base_filters, start_index)
+    targets = np.arange(start_index, start_index + months, dtype=np.int64)
+
+    # Dimensões (empresa, setor, categoria) -> linha da matriz de totais
+    dimensions: dict[tuple, int] = {}
+    labels: list[tuple] = []
+    codes = np.empty(len(rows), dtype=np.int64)
+    for i, row in enumerate(rows):
+        key = (row.company_id, row.department_id, row.category_id)
+        code = dimensions.get(key)
+        if code is None:
+            code = dimensions[key] = len(labels)
+            labels.append(row)
+        codes[i] = code
+
+    intervals = np.fromiter((row.interval for row in rows), dtype=np.int64, count=len(rows))
+    phases = np.fromiter((row.phase for row in rows), dtype=np.int64, count=len(rows))
+    created = np.fromiter((row.created for row in rows), dtype=np.int64, count=len(rows))
+    cents = np.fromiter((row.cents or 0 for row in rows), dtype=np.int64, count=len(rows))
+
+    due = (targets[np.newaxis, :] - phases[:, np.newaxis]) % intervals[:, np.newaxis] == 0
+    due &= targets[np.newaxis, :] > created[:, np.newaxis]
+    totals = np.zeros((len(labels), months), dtype=np.int64)
+    np.add.at(totals, codes, np.where(due, cents[:, np.newaxis], 0))
+    month_totals = totals.sum(axis=0)
+
+    data = []
+    for h, month_index in enumerate(targets.tolist()):
+        column = totals[:, h]
+        order = np.argsort(-column, kind='stable')
+        items = [
+            ForecastItem(
+                company_id=labels[k].company_id,
+                company_name=labels[k].company_name or 'N/A',
+                department_id=labels[k].department_id,
+                department_name=labels[k].department_name or 'N/A',
+                category_id=labels[k].category_id,
+                category_name=labels[k].category_name or 'N/A',
+                total_value=_to_brl(column[k]),
+            )
+            for k in order.tolist() if column[k] > 0
+        ]
+        data.append(ForecastMonth(
+            month=_month_label(month_index),
+            total_value=_to_brl(month_totals[h]),
+            items=items,
+        ))
+
+    return ForecastResponse(
+        months=data,
+        total=_to_brl(month_totals.sum()),
+    )
@@ -0,0 +1,139 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime, timezone, date
+from decimal import Decimal
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import dashboard_cache
+from app.core.config import settings
+from app.models.expense import Expense
+from app.models.expense_monthly_rollup import ExpenseMonthlyRollup
+
+
+def rollup_month(created_at: datetime | date) -> date:
+    """Mês (primeiro dia, UTC) em que a despesa entra no rollup."""
+    if isinstance(created_at, datetime):
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc)
+        return created_at.date().replace(day=1)
+    return created_at.replace(day=1)
+
+
+def snapshot(expense: Expense, status=None) -> tuple | None:
+    """
+    Chave do rollup + valor da despesa no estado atual: (chave, value_brl).
+    Chamar antes e depois de alterar a despesa e passar os dois para apply_change.
+    Aceita qualquer objeto com os mesmos atributos (ex.: linha de um RETURNING);
+    status sobrescreve o status do objeto (estado após um UPDATE feito em SQL).
+    """
+    if expense.created_at is None:
+        return None
+    key = (
+        rollup_month(expense.created_at),
+        expense.company_id,
+        expense.department_id,
+        expense.category_id,
+        status if status is not None else expense.status,
+        expense.expense_type,
+    )
+    return key, Decimal(expense.value_brl or 0)
+
+
+def _upsert(db: Session, deltas: dict[tuple, list]) -> None:
+    """Soma os deltas {chave: [value_brl, count]} no rollup com um único INSERT ... ON CONFLICT."""
+    stmt = insert(ExpenseMonthlyRollup).values([
+        {
+            "month": month,
+            "company_id": company_id,
+            "department_id": department_id,
+            "category_id": category_id,
+            "status": status,
+            "expense_type": expense_type,
+            "total_value_brl": value_brl,
+            "expense_count": count,
+        }
+        for (month, company_id, department_id, category_id, status, expense_type), (value_brl, count)
+        in deltas.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            ExpenseMonthlyRollup.month,
+            ExpenseMonthlyRollup.company_id,
+            ExpenseMonthlyRollup.department_id,
+            ExpenseMonthlyRollup.category_id,
+            ExpenseMonthlyRollup.status,
+            ExpenseMonthlyRollup.expense_type,
+        ],
+        set_={
+            "total_value_brl": ExpenseMonthlyRollup.total_value_brl + stmt.excluded.total_value_brl,
+            "expense_count": ExpenseMonthlyRollup.expense_count + stmt.excluded.expense_count,
+        },
+    )
+    db.execute(stmt)
+
+
+def apply_changes(db: Session, changes: Iterable[tuple[tuple | None, tuple | None]]) -> None:
+    """
+    Aplica no rollup a diferença entre pares (antes, depois) de snapshots
+    (antes=None para criação). Deltas com a mesma chave são somados e todos
+    os grupos vão em um único upsert (uma importação em lote gera um statement).
+    Não faz commit: roda na transação da escrita.
+    """
+    deltas: dict[tuple, list] = defaultdict(lambda: [Decimal(0), 0])
+    for before, after in changes:
+        if before == after:
+            continue
+        if before is not None:
+            deltas[before[0]][0] -= before[1]
+            deltas[before[0]][1] -= 1
+        if after is not None:
+            deltas[after[0]][0] += after[1]
+            deltas[after[0]][1] += 1
+    deltas = {key: delta for key, delta in deltas.items() if delta != [0, 0]}
+    if deltas:
+        _upsert(db, deltas)
+
+
+def apply_change(db: Session, before: tuple | None, after: tuple | None) -> None:
+    """Atalho de apply_changes para uma única despesa."""
+    apply_changes(db, [(before, after)])
+
+
+def rebuild(db: Session) -> int:
+    """Reconstrói o rollup inteiro a partir de expenses (backfill). Retorna o número de grupos."""
+    schema = settings.DATABASE_SCHEMA
+    db.execute(text(f"LOCK TABLE {schema}.expense_monthly_rollup IN EXCLUSIVE MODE"))
+    db.query(ExpenseMonthlyRollup).delete(synchronize_session=False)
+    month = func.date_trunc('month', func.timezone('UTC', Expense.created_at)).cast(ExpenseMonthlyRollup.month.type)
+    groups = db.query(
+        month,
+        Expense.company_id,
+        Expense.department_id,
+        Expense.category_id,
+        Expense.status,
+        Expense.expense_type,
+        func.sum(Expense.value_brl),
+        func.count(Expense.id),
+    ).group_by(
+        month,
+        Expense.company_id,
+        Expense.department_id,
+        Expense.category_id,
+        Expense.status,
+        Expense.expense_type,
+    )
+    result = db.execute(
+        insert(ExpenseMonthlyRollup).from_select(
+            [
+                "month", "company_id", "department_id", "category_id",
+                "status", "expense_type", "total_value_brl", "expense_count",
+            ],
+            groups,
+        )
+    )
+    db.commit()
+    dashboard_cache.invalidate()
+    return result.rowcount
@@ -1,13 +1,16 @@
 from app.tasks.monthly_validation import create_monthly_validations_task
 from app.tasks.alert_tasks import (
-    check_and_create_validation_overdue_alerts,
     check_and_create_renewal_alerts,
+    check_and_create_validation_overdue_alerts,
     process_all_alerts
 )
+from app.tasks.exchange_rate_tasks import record_exchange_rate_task, revalue_expenses_task
 
 __all__ = [
     "create_monthly_validations_task",
-    "check_and_create_validation_overdue_alerts",
     "check_and_create_renewal_alerts",
-    "process_all_alerts"
+    "check_and_create_validation_overdue_alerts",
+    "process_all_alerts",
+    "record_exchange_rate_task",
+    "revalue_expenses_task",
 ]
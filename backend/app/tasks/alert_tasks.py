@@ -1,10 +1,14 @@
 import logging
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Date, cast, func, select
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
-from app.services import alert_service
-from app.models.alert import Alert, AlertType, AlertStatus
+from app.services import alert_service, expense_validation_service
+from app.models.alert import Alert, AlertChannel, AlertType
+from app.models.department import Department
 from app.models.expense import Expense, ExpenseStatus
 from app.models.expense_validation import ExpenseValidation, ValidationStatus
 from app.models.user import User
@@ -14,27 +18,6 @@ logger = logging.getLogger(__name__)
 RENEWAL_ALERT_DAYS = [7, 3, 1]
 
 
-def _has_approved_validation(db: Session, expense_id, renewal_date) -> bool:
-    """Verifica se existe validação aprovada para a despesa no mês da renovação."""
-    validation_month = renewal_date.replace(day=1)
-    return db.query(ExpenseValidation).filter(
-        ExpenseValidation.expense_id == expense_id,
-        ExpenseValidation.status == ValidationStatus.APPROVED,
-        ExpenseValidation.validation_month == validation_month,
-    ).first() is not None
-
-
-def _alert_already_exists(db: Session, expense_id, days_until: int) -> bool:
-    """Verifica se já existe alerta para essa despesa com esse número de dias."""
-    title_pattern = f"Renovação em {days_until} dia"
-    return db.query(Alert).filter(
-        Alert.expense_id == expense_id,
-        Alert.alert_type == AlertType.RENEWAL_UPCOMING,
-        Alert.title.ilike(f"%{title_pattern}%"),
-        Alert.status.in_([AlertStatus.PENDING, AlertStatus.SENT]),
-    ).first() is not None
-
-
 def check_and_create_renewal_alerts_7_3_1() -> dict:
     """
     Verifica despesas ativas com renewal_date nos próximos 7 dias
@@ -43,57 +26,102 @@ def check_and_create_renewal_alerts_7_3_1() -> dict:
     - O alerta é enviado ao owner (responsável) da despesa.
     - Se a despesa já possui validação aprovada para o mês da renovação,
       nenhum alerta é criado.
-    - Alertas duplicados (mesmo expense + mesmo nº de dias) são ignorados.
+    - Alertas duplicados (mesma despesa + mesma renovação + mesmo nº de dias,
+      pela dedup_key) são ignorados.
+
+    Uma consulta traz só as despesas que renovam daqui a 7, 3 ou 1 dia
+    (renewal_date IN (...), no índice), com as marcações de validação aprovada
+    e de alerta existente (EXISTS nos índices de expense_validations e
+    alerts.dedup_key); os alertas novos são inseridos em lote com ON CONFLICT DO NOTHING.
+    expenses_checked conta todas as despesas ativas da janela de 7 dias (COUNT separado).
     """
     db: Session = SessionLocal()
     try:
         today = datetime.now().date()
         max_ahead = today + timedelta(days=max(RENEWAL_ALERT_DAYS))
 
-        expenses = db.query(Expense).filter(
+        days_until = (Expense.renewal_date - today).label("days_until")
+        validated = select(ExpenseValidation.id).where(
+            ExpenseValidation.expense_id == Expense.id,
+            ExpenseValidation.status == ValidationStatus.APPROVED,
+            ExpenseValidation.validation_month == cast(func.date_trunc('month', Expense.renewal_date), Date),
+        ).exists().label("validated")
+        dedup_key = func.concat(
+            'renewal_upcoming:', Expense.id, ':',
+            func.to_char(Expense.renewal_date, 'YYYY-MM-DD'), ':', Expense.renewal_date - today,
+        )
+        duplicate = select(Alert.id).where(Alert.dedup_key == dedup_key).exists().label("duplicate")
+
+        rows = db.query(
+            Expense.id,
+            Expense.service_name,
+            Expense.value_brl,
+            Expense.renewal_date,
+            Expense.contracted_plan,
+            Expense.owner_id,
+            User.name.label("owner_name"),
+            User.is_active.label("owner_active"),
+            days_until,
+            validated,
+            duplicate,
+        ).join(
+            User, User.id == Expense.owner_id
+        ).filter(
+            Expense.status == ExpenseStatus.ACTIVE,
+            Expense.renewal_date.in_([today + timedelta(days=days) for days in RENEWAL_ALERT_DAYS]),
+        ).all()
+        expenses_checked = db.query(func.count(Expense.id)).filter(
             Expense.status == ExpenseStatus.ACTIVE,
-            Expense.renewal_date.isnot(None),
             Expense.renewal_date >= today,
             Expense.renewal_date <= max_ahead,
-        ).all()
+        ).scalar()
 
-        alerts_created = 0
         skipped_validated = 0
         skipped_duplicate = 0
-        errors = []
-
-        for expense in expenses:
-            days_until = (expense.renewal_date - today).days
-
-            if days_until not in RENEWAL_ALERT_DAYS:
+        now = datetime.now(timezone.utc)
+        new_alerts = []
+        for row in rows:
+            if row.validated:
+                skipped_validated += 1
+                continue
+            if row.duplicate:
+                skipped_duplicate += 1
                 continue
 
-            try:
-                if _has_approved_validation(db, expense.id, expense.renewal_date):
-                    skipped_validated += 1
-                    continue
-
-                if _alert_already_exists(db, expense.id, days_until):
-                    skipped_duplicate += 1
-                    continue
-
-                alert_service.create_renewal_upcoming_alert(db, expense, days_until)
-                alerts_created += 1
-                logger.info(
-                    "Alerta de renovação criado: %s em %d dia(s) para owner %s",
-                    expense.service_name, days_until, expense.owner_id,
-                )
-            except Exception as e:
-                errors.append(f"Erro despesa {expense.id}: {e}")
-                logger.exception("Erro ao criar alerta para despesa %s", expense.id)
+            title, message = alert_service.renewal_upcoming_content(
+                row.owner_name,
+                row.service_name,
+                row.value_brl,
+                row.renewal_date,
+                row.contracted_plan,
+                row.days_until,
+            )
+            # Mesmo estado de create_and_send_alert (in-app: enviado; canal externo: pendente no outbox)
+            new_alerts.append({
+                "id": uuid.uuid4(),
+                "alert_type": AlertType.RENEWAL_UPCOMING,
+                "title": title,
+                "message": message,
+                "recipient_id": row.owner_id,
+                "expense_id": row.id,
+                "channel": AlertChannel.EMAIL,
+                **alert_service.delivery_state(AlertChannel.EMAIL, row.owner_active, now),
+                "dedup_key": alert_service.renewal_upcoming_dedup_key(row.id, row.renewal_date, row.days_until),
+                "created_at": now,
+                "updated_at": now,
+            })
+
+        alerts_created = alert_service.bulk_insert_alerts(db, new_alerts)
+        # Criados por outra varredura concorrente entre a consulta e o insert
+        skipped_duplicate += len(new_alerts) - alerts_created
 
         result = {
             "success": True,
-            "expenses_checked": len(expenses),
+            "expenses_checked": expenses_checked,
             "alerts_created": alerts_created,
             "skipped_validated": skipped_validated,
             "skipped_duplicate": skipped_duplicate,
-            "errors": errors,
+            "errors": [],
         }
         logger.info("Verificação de renovação concluída: %s", result)
         return result
@@ -104,6 +132,91 @@ def check_and_create_renewal_alerts_7_3_1() -> dict:
         db.close()
 
 
+def check_and_create_validation_overdue_alerts() -> dict:
+    """
+    Marca as validações pendentes atrasadas e cria um alerta de validação vencida
+    para o owner (responsável) da despesa de cada uma que ainda não tem alerta.
+
+    Uma consulta traz as validações pendentes e atrasadas com despesa, setor e owner,
+    sem as que já têm alerta VALIDATION_OVERDUE (NOT EXISTS); os alertas são
+    inseridos em lote com ON CONFLICT (dedup_key) DO NOTHING.
+    """
+    db: Session = SessionLocal()
+    try:
+        overdue_marked = expense_validation_service.mark_overdue_validations(db)
+
+        already_alerted = select(Alert.id).where(
+            Alert.validation_id == ExpenseValidation.id,
+            Alert.alert_type == AlertType.VALIDATION_OVERDUE,
+        ).exists()
+
+        rows = db.query(
+            ExpenseValidation.id,
+            ExpenseValidation.validation_month,
+            Expense.id.label("expense_id"),
+            Expense.service_name,
+            Expense.value_brl,
+            Department.name.label("department_name"),
+            User.id.label("owner_id"),
+            User.name.label("owner_name"),
+            User.is_active.label("owner_active"),
+        ).join(
+            Expense, Expense.id == ExpenseValidation.expense_id
+        ).join(
+            User, User.id == Expense.owner_id
+        ).outerjoin(
+            Department, Department.id == Expense.department_id
+        ).filter(
+            ExpenseValidation.status == ValidationStatus.PENDING,
+            ExpenseValidation.is_overdue.is_(True),
+            ~already_alerted,
+        ).all()
+
+        now = datetime.now(timezone.utc)
+        new_alerts = []
+        for row in rows:
+            title, message = alert_service.validation_overdue_content(
+                row.owner_name,
+                row.service_name,
+                row.value_brl,
+                row.department_name,
+                row.validation_month,
+            )
+            # Mesmo estado de create_and_send_alert (in-app: enviado; canal externo: pendente no outbox)
+            new_alerts.append({
+                "id": uuid.uuid4(),
+                "alert_type": AlertType.VALIDATION_OVERDUE,
+                "title": title,
+                "message": message,
+                "recipient_id": row.owner_id,
+                "expense_id": row.expense_id,
+                "validation_id": row.id,
+                "channel": AlertChannel.EMAIL,
+                **alert_service.delivery_state(AlertChannel.EMAIL, row.owner_active, now),
+                "dedup_key": alert_service.validation_overdue_dedup_key(row.id),
+                "created_at": now,
+                "updated_at": now,
+            })
+
+        alerts_created = alert_service.bulk_insert_alerts(db, new_alerts)
+
+        result = {
+            "success": True,
+            "overdue_marked": overdue_marked,
+            "validations_without_alert": len(rows),
+            "alerts_created": alerts_created,
+            # Criados por outra varredura concorrente entre a consulta e o insert
+            "skipped_duplicate": len(new_alerts) - alerts_created,
+        }
+        logger.info("Verificação de validações vencidas concluída: %s", result)
+        return result
+    except Exception as e:
+        logger.exception("Erro na verificação de validações vencidas")
+        return {"success": False, "error": str(e)}
+    finally:
+        db.close()
+
+
 def check_and_create_renewal_alerts(days_ahead: int = 7) -> dict:
     """Wrapper mantido para compatibilidade com endpoint existente."""
     return check_and_create_renewal_alerts_7_3_1()
@@ -0,0 +1,44 @@
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.services import exchange_rate_service
+
+
+def record_exchange_rate_task(rate: Decimal, rate_date: date, currency: str = "USD") -> dict:
+    """Grava a cotação obtida pelo rate_provider na tabela diária exchange_rates."""
+    db: Session = SessionLocal()
+    try:
+        exchange_rate_service.record_rate(db, rate, rate_date, source="awesomeapi", currency=currency)
+        return {"success": True, "rate_date": rate_date.isoformat()}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+    finally:
+        db.close()
+
+
+def revalue_expenses_task(currency: str = "USD") -> dict:
+    """Reavalia value_brl das despesas ativas na moeda pela cotação mais recente."""
+    db: Session = SessionLocal()
+    try:
+        result = exchange_rate_service.revalue_expenses(db, currency)
+        return {"success": True, **result}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+    finally:
+        db.close()
+
+
+def load_latest_exchange_rate_task(currency: str = "USD") -> tuple[Decimal, datetime] | None:
+    """Última cotação gravada (rate, data) para semear o rate_provider ao iniciar."""
+    db: Session = SessionLocal()
+    try:
+        latest = exchange_rate_service.get_latest(db, currency)
+        if latest is None:
+            return None
+        return latest.rate, datetime.combine(latest.rate_date, time.min, tzinfo=timezone.utc)
+    except Exception:
+        return None
+    finally:
+        db.close()
@@ -5,10 +5,11 @@ from app.core.database import SessionLocal
 from app.services import expense_validation_service
 
 
-def create_monthly_validations_task(month_date: date | None = None) -> dict:
+def create_monthly_validations_task(month_date: date | None = None, end_month: date | None = None) -> dict:
     """
     Tarefa para criar validações mensais baseado na periodicidade das despesas.
     Se month_date não for fornecido, usa o primeiro dia do mês atual.
+    Com end_month, cria também os meses seguintes até ele (recuperação de meses perdidos).
     Também marca validações atrasadas do mês anterior.
     """
     if month_date is None:
@@ -21,7 +22,7 @@ def create_monthly_validations_task(month_date: date | None = None) -> dict:
     db: Session = SessionLocal()
     try:
         # Criar validações para o mês especificado
-        validations = expense_validation_service.create_monthly_validations(db, month_date)
+        validations = expense_validation_service.create_monthly_validations(db, month_date, end_month)
         
         # Marcar validações atrasadas
         overdue_count = expense_validation_service.mark_overdue_validations(db)
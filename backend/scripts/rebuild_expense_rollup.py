@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Script para reconstruir a tabela expense_monthly_rollup a partir de expenses.
+
+Uso:
+    python scripts/rebuild_expense_rollup.py
+"""
+
+import sys
+from pathlib import Path
+
+# Adicionar path do projeto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import SessionLocal
+from app.services import rollup_service
+
+
+def main():
+    """Reconstrói o rollup mensal de despesas."""
+    db = SessionLocal()
+
+    try:
+        print("📦 Reconstruindo expense_monthly_rollup...")
+        groups = rollup_service.rebuild(db)
+        print(f"✅ Rollup reconstruído: {groups} grupos.")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Erro ao reconstruir rollup: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -31,7 +31,7 @@ from app.services.company_service import get_by_name, create as create_company
 from app.services.department_service import get_by_name_and_company, create as create_department
 from app.services.category_service import get_by_name, create as create_category
 from app.services.user_service import get_by_email, create as create_user
-from app.services.exchange_service import get_usd_to_brl_rate_sync, USD_BRL_FALLBACK_RATE
+from app.services.exchange_service import fetch_usd_to_brl_rate_sync, USD_BRL_FALLBACK_RATE
 from app.schemas.expense import ExpenseCreate
 from app.schemas.company import CompanyCreate
 from app.schemas.department import DepartmentCreate
@@ -172,7 +172,7 @@ def convert_to_brl(value: Decimal, currency: Currency) -> tuple[Decimal, Optiona
         return value, None, None
     
     # Tentar buscar cotação
-    rate_result = get_usd_to_brl_rate_sync()
+    rate_result = fetch_usd_to_brl_rate_sync()
     if rate_result:
         rate = rate_result.rate
         rate_date = rate_result.date
@@ -0,0 +1,262 @@
+"""
+Fixtures dos testes de integração.
+
+Os testes rodam contra um Postgres dedicado, indicado em TEST_DATABASE_URL
+(ex.: postgresql+psycopg2://postgres@localhost/nitro_test). O schema é recriado
+no início da sessão e as tabelas são esvaziadas antes de cada teste: não aponte
+para um banco com dados. Sem TEST_DATABASE_URL, os testes que usam o banco são pulados.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+# As settings são lidas no import de app.*: definir antes de importar a aplicação
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "postgresql+psycopg2://localhost/nitro_test"
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ["ALERT_OUTBOX_ENABLED"] = "false"
+
+from sqlalchemy import event, text  # noqa: E402
+
+from app.core.cache import dashboard_cache  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.models import (  # noqa: E402
+    Alert,
+    AlertChannel,
+    AlertStatus,
+    AlertType,
+    Category,
+    Company,
+    Department,
+    Expense,
+    ExpenseStatus,
+    ExpenseType,
+    PaymentMethod,
+    Periodicity,
+    User,
+    UserRole,
+)
+from app.models.expense import expense_code_seq, format_expense_code  # noqa: E402
+
+
+def _drop_trigram_indexes() -> None:
+    """Sem a extensão pg_trgm, remove do metadata os índices GIN de trigramas."""
+    for table in Base.metadata.tables.values():
+        for index in list(table.indexes):
+            if index.name and index.name.endswith("_trgm"):
+                table.indexes.discard(index)
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Recria o schema do banco de testes (uma vez por sessão)."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL não definida")
+
+    schema = settings.DATABASE_SCHEMA
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except Exception:
+        _drop_trigram_indexes()
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(database):
+    """Sessão com o banco vazio (tabelas truncadas e sequência de códigos reiniciada)."""
+    schema = settings.DATABASE_SCHEMA
+    tables = ", ".join(f"{schema}.{table.name}" for table in Base.metadata.sorted_tables)
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} CASCADE"))
+        conn.execute(text(f"ALTER SEQUENCE {schema}.expense_code_seq RESTART WITH 1"))
+    dashboard_cache.invalidate()
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        dashboard_cache.invalidate()
+
+
+@pytest.fixture
+def seed(db):
+    """Empresa, setor, categoria e um administrador do sistema."""
+    company = Company(name="ACME")
+    db.add(company)
+    db.flush()
+    department = Department(name="TI", company_id=company.id)
+    category = Category(name="SaaS")
+    admin = User(
+        name="Admin",
+        email=f"admin-{uuid.uuid4().hex[:8]}@example.com",
+        password_hash="x",
+        role=UserRole.SYSTEM_ADMIN,
+    )
+    db.add_all([department, category, admin])
+    db.commit()
+    return {"company": company, "department": department, "category": category, "admin": admin}
+
+
+@pytest.fixture
+def make_expense(db, seed):
+    """Cria uma despesa ativa mensal (código da sequência); kwargs sobrescrevem os campos."""
+
+    def make(**fields) -> Expense:
+        values = {
+            "service_name": "Serviço",
+            "expense_type": ExpenseType.RECURRING,
+            "periodicity": Periodicity.MONTHLY,
+            "value": Decimal("100.00"),
+            "currency": "BRL",
+            "value_brl": Decimal("100.00"),
+            "payment_method": PaymentMethod.PIX,
+            "status": ExpenseStatus.ACTIVE,
+            "company_id": seed["company"].id,
+            "department_id": seed["department"].id,
+            "category_id": seed["category"].id,
+            "owner_id": seed["admin"].id,
+            "approver_id": seed["admin"].id,
+            **fields,
+        }
+        if "code" not in values:
+            values["code"] = format_expense_code(db.execute(expense_code_seq.next_value()).scalar_one())
+        expense = Expense(**values)
+        db.add(expense)
+        db.flush()
+        return expense
+
+    return make
+
+
+@pytest.fixture
+def make_alert(db, seed):
+    """Cria um alerta pendente (destinatário: admin do seed); kwargs sobrescrevem os campos."""
+
+    def make(channel=AlertChannel.WHATSAPP, recipient=None, **fields) -> Alert:
+        alert = Alert(**{
+            "alert_type": AlertType.RENEWAL_UPCOMING,
+            "title": "Renovação",
+            "message": "Mensagem",
+            "recipient_id": (recipient or seed["admin"]).id,
+            "channel": channel,
+            "status": AlertStatus.PENDING,
+            **fields,
+        })
+        db.add(alert)
+        db.commit()
+        return alert
+
+    return make
+
+
+def auth_headers(user: User) -> dict:
+    """Header Authorization com um token válido para o usuário."""
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+
+@pytest.fixture
+def client(database):
+    """TestClient da API (sem o lifespan: workers em background não são iniciados)."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    return TestClient(app)
+
+
+class QueryCounter:
+    """Conta as instruções SQL executadas pelo engine (before_cursor_execute)."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            self.count += 1
+
+
+@pytest.fixture
+def query_counter(database):
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine, "before_cursor_execute", counter)
+
+
+class StubHTTPServer:
+    """
+    Servidor HTTP local para testar clientes de APIs externas.
+    Cada requisição consome a próxima resposta de responses (a última se repete):
+    (status, corpo JSON, atraso em segundos). requests guarda (método, path, headers, corpo).
+    """
+
+    def __init__(self):
+        self.responses: list[tuple[int, object, float]] = [(200, {}, 0.0)]
+        self.requests: list[tuple[str, str, dict, bytes]] = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                with stub._lock:
+                    stub.requests.append((self.command, self.path, dict(self.headers), body))
+                    status, payload, delay = stub.responses[0] if len(stub.responses) == 1 else stub.responses.pop(0)
+                if delay:
+                    time.sleep(delay)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = _respond
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}/"
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    @property
+    def hits(self) -> int:
+        with self._lock:
+            return len(self.requests)
+
+    def respond(self, *responses: tuple) -> None:
+        """Define as próximas respostas: (status, corpo) ou (status, corpo, atraso)."""
+        with self._lock:
+            self.responses = [(r[0], r[1], r[2] if len(r) > 2 else 0.0) for r in responses]
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def http_stub():
+    server = StubHTTPServer()
+    yield server
+    server.close()
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from app.core.database import engine
+from app.models import Alert, AlertChannel, AlertStatus, AlertType, ExpenseValidation, User, UserRole, ValidationStatus
+from app.services import alert_service
+from app.services.alert_stream import AlertBroker
+from app.tasks import alert_tasks
+
+
+def _rows(recipient_id, count: int, prefix: str = "k") -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "alert_type": AlertType.RENEWAL_UPCOMING,
+            "title": f"Alerta {i}",
+            "message": "Mensagem",
+            "recipient_id": recipient_id,
+            "channel": AlertChannel.EMAIL,
+            "status": AlertStatus.SENT,
+            "sent_at": now,
+            "error_message": None,
+            "dedup_key": f"{prefix}:{i}",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def test_bulk_insert_batches_rows_and_counts_returned_ids(db, seed):
+    """ON CONFLICT com RETURNING continua em páginas multi-linha; o total vem dos ids retornados."""
+    admin_id = seed["admin"].id
+    existing = _rows(admin_id, 500)
+    assert alert_service.bulk_insert_alerts(db, existing) == 500
+
+    inserts = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT"):
+            inserts.append(statement)
+
+    rows = _rows(admin_id, 2500)  # dedup_key k:0 ... k:499 já existem
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        created = alert_service.bulk_insert_alerts(db, rows)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert created == 2000
+    assert 1 <= len(inserts) <= 5  # Páginas de insertmanyvalues, não um INSERT por linha
+    assert db.query(Alert).count() == 2500
+    assert {a.id for a in db.query(Alert).filter(Alert.dedup_key.in_([f"k:{i}" for i in range(500)]))} == {
+        row["id"] for row in existing
+    }
+
+
+def test_bulk_insert_publishes_only_inserted_rows(db, seed, monkeypatch):
+    broker = AlertBroker(replay_size=100, max_queued=100)
+    monkeypatch.setattr(alert_service, "alert_broker", broker)
+    admin_id = seed["admin"].id
+    alert_service.bulk_insert_alerts(db, _rows(admin_id, 3))
+
+    rows = _rows(admin_id, 10)  # 3 conflitos, 7 novos
+
+    async def scenario():
+        subscription, _ = broker.subscribe(admin_id)
+        created = await asyncio.to_thread(alert_service.bulk_insert_alerts, db, rows)
+        events, resync = await subscription.next(timeout=2)
+        broker.unsubscribe(subscription)
+        return created, events, resync
+
+    created, events, resync = asyncio.run(scenario())
+    assert created == 7
+    assert not resync
+    published = {json.loads(e.encoded.split("data: ", 1)[1])["id"] for e in events}
+    assert published == {str(row["id"]) for row in rows[3:]}
+
+
+def test_renewal_sweep_is_idempotent(db, seed, make_expense):
+    today = datetime.now().date()
+    for days in (1, 3, 7, 5):
+        make_expense(service_name=f"Renova em {days}", renewal_date=today + timedelta(days=days))
+    db.commit()
+
+    first = alert_tasks.check_and_create_renewal_alerts_7_3_1()
+    second = alert_tasks.check_and_create_renewal_alerts_7_3_1()
+
+    assert first["success"] and second["success"]
+    assert first["expenses_checked"] == 4
+    assert first["alerts_created"] == 3
+    assert second["alerts_created"] == 0
+    assert second["skipped_duplicate"] == 3
+    assert db.query(Alert).count() == 3
+
+
+def test_validation_overdue_sweep_alerts_owner_once(db, seed, make_expense):
+    """Um alerta VALIDATION_OVERDUE por validação pendente e atrasada, para o owner; reexecutar não cria nada."""
+    owners = [
+        User(name=f"Responsável {i}", email=f"owner{i}@example.com", password_hash="x", role=UserRole.LEADER)
+        for i in range(3)
+    ]
+    db.add_all(owners)
+    db.flush()
+    # Meses passados: mark_overdue_validations só marca o mês atual, então is_overdue fica como definido aqui
+    cases = [
+        (owners[0], ValidationStatus.PENDING, True),
+        (owners[1], ValidationStatus.PENDING, True),
+        (owners[2], ValidationStatus.APPROVED, True),
+        (owners[2], ValidationStatus.PENDING, False),
+    ]
+    validations = []
+    for i, (owner, status, overdue) in enumerate(cases):
+        expense = make_expense(service_name=f"Serviço {i}", owner_id=owner.id)
+        validation = ExpenseValidation(
+            expense_id=expense.id, validation_month=date(2025, 1, 1), status=status, is_overdue=overdue,
+        )
+        db.add(validation)
+        validations.append((validation, expense, owner))
+    db.commit()
+
+    first = alert_tasks.check_and_create_validation_overdue_alerts()
+    second = alert_tasks.check_and_create_validation_overdue_alerts()
+
+    assert first["success"] and second["success"]
+    assert first["alerts_created"] == 2
+    assert second["alerts_created"] == 0
+    assert second["validations_without_alert"] == 0
+
+    alerts = db.query(Alert).filter(Alert.alert_type == AlertType.VALIDATION_OVERDUE).all()
+    assert sorted((a.validation_id, a.expense_id, a.recipient_id) for a in alerts) == sorted(
+        (validation.id, expense.id, owner.id) for validation, expense, owner in validations[:2]
+    )
+    assert db.query(Alert).count() == 2
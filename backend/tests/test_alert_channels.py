@@ -0,0 +1,173 @@
+import asyncio
+import json
+import socketserver
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.alert_channels import DeliveryError, EmailAdapter, WebhookAdapter
+
+
+def _alert(**fields) -> SimpleNamespace:
+    values = {
+        "id": "a1",
+        "title": "Renovação",
+        "message": "A despesa renova amanhã",
+        "recipient_name": "Ana",
+        "recipient_email": "ana@example.com",
+        "recipient_phone": "+5511999990000",
+        **fields,
+    }
+    return SimpleNamespace(**values)
+
+
+def _send(adapter, alert) -> None:
+    async def scenario():
+        try:
+            await adapter.send(alert)
+        finally:
+            await adapter.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_webhook_posts_payload_with_token(http_stub):
+    http_stub.respond((202, {}))
+    _send(WebhookAdapter("WhatsApp", http_stub.url, token="segredo"), _alert())
+
+    [(method, _, headers, body)] = http_stub.requests
+    assert method == "POST"
+    assert headers["Authorization"] == "Bearer segredo"
+    assert json.loads(body) == {"phone": "+5511999990000", "title": "Renovação", "message": "A despesa renova amanhã"}
+
+
+@pytest.mark.parametrize("status, retryable", [
+    (429, True),
+    (408, True),
+    (500, True),
+    (503, True),
+    (400, False),
+    (401, False),
+    (404, False),
+    (422, False),
+])
+def test_webhook_error_classification(http_stub, status, retryable):
+    http_stub.respond((status, {"erro": "x"}))
+    with pytest.raises(DeliveryError) as error:
+        _send(WebhookAdapter("SMS", http_stub.url), _alert())
+    assert error.value.retryable is retryable
+    assert str(status) in str(error.value)
+
+
+def test_webhook_connection_error_is_retryable():
+    with pytest.raises(DeliveryError) as error:
+        _send(WebhookAdapter("SMS", "http://127.0.0.1:9/", timeout_seconds=1), _alert())
+    assert error.value.retryable
+
+
+def test_webhook_without_phone_fails_permanently_without_request(http_stub):
+    with pytest.raises(DeliveryError) as error:
+        _send(WebhookAdapter("SMS", http_stub.url), _alert(recipient_phone=None))
+    assert not error.value.retryable
+    assert http_stub.hits == 0
+
+
+class StubSMTPServer:
+    """SMTP mínimo (sem TLS/autenticação); reject_rcpt ou data_code simulam recusas."""
+
+    def __init__(self, reject_rcpt: int | None = None, data_code: int = 250):
+        self.messages: list[dict] = []
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line: str) -> None:
+                self.wfile.write(f"{line}\r\n".encode())
+
+            def handle(self):
+                self.reply("220 stub ESMTP")
+                envelope = {"from": None, "to": [], "data": ""}
+                while True:
+                    line = self.rfile.readline().decode().rstrip("\r\n")
+                    if not line:
+                        return
+                    command = line[:4].upper()
+                    if command in ("EHLO", "HELO"):
+                        self.reply("250 stub")
+                    elif command == "MAIL":
+                        envelope["from"] = line.split(":", 1)[1].strip()
+                        self.reply("250 OK")
+                    elif command == "RCPT":
+                        if reject_rcpt:
+                            self.reply(f"{reject_rcpt} Destinatário recusado")
+                        else:
+                            envelope["to"].append(line.split(":", 1)[1].strip())
+                            self.reply("250 OK")
+                    elif command == "DATA":
+                        self.reply("354 Fim com .")
+                        data = []
+                        while (chunk := self.rfile.readline().decode()) not in (".\r\n", ""):
+                            data.append(chunk)
+                        envelope["data"] = "".join(data)
+                        self.reply(f"{data_code} {'OK' if data_code == 250 else 'Falha'}")
+                        if data_code == 250:
+                            stub.messages.append(dict(envelope))
+                    elif command == "QUIT":
+                        self.reply("221 Tchau")
+                        return
+                    else:
+                        self.reply("250 OK")
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def smtp_stub(request):
+    server = StubSMTPServer(**getattr(request, "param", {}))
+    yield server
+    server.close()
+
+
+def _email_adapter(port: int) -> EmailAdapter:
+    return EmailAdapter("127.0.0.1", port, sender="alertas@example.com", starttls=False, timeout_seconds=5)
+
+
+def test_email_is_sent_to_recipient(smtp_stub):
+    _send(_email_adapter(smtp_stub.port), _alert())
+
+    [message] = smtp_stub.messages
+    assert message["from"] == "<alertas@example.com>"
+    assert message["to"] == ["<ana@example.com>"]
+    assert "Subject: =?utf-8?q?Renova=C3=A7=C3=A3o?=" in message["data"]
+
+
+@pytest.mark.parametrize("smtp_stub, retryable", [
+    ({"reject_rcpt": 550}, False),  # Endereço recusado: definitivo
+    ({"reject_rcpt": 450}, False),  # Recusa de todos os destinatários (SMTPRecipientsRefused)
+    ({"data_code": 554}, False),    # 5xx: definitivo
+    ({"data_code": 451}, True),     # 4xx: temporário
+], indirect=["smtp_stub"])
+def test_email_error_classification(smtp_stub, retryable):
+    with pytest.raises(DeliveryError) as error:
+        _send(_email_adapter(smtp_stub.port), _alert())
+    assert error.value.retryable is retryable
+    assert smtp_stub.messages == []
+
+
+def test_email_connection_error_is_retryable():
+    with pytest.raises(DeliveryError) as error:
+        _send(_email_adapter(9), _alert())
+    assert error.value.retryable
+
+
+def test_email_without_address_fails_permanently():
+    with pytest.raises(DeliveryError) as error:
+        _send(_email_adapter(9), _alert(recipient_email=None))
+    assert not error.value.retryable
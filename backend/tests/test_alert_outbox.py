@@ -0,0 +1,151 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.models import Alert, AlertChannel, AlertStatus, User, UserRole
+from app.services import alert_outbox
+from app.services.alert_channels import ChannelAdapter, DeliveryError
+
+MAX_ATTEMPTS = 3
+BACKOFF_BASE, BACKOFF_MAX = 30.0, 3600.0
+
+
+def _complete(db, results):
+    return alert_outbox.complete_batch(db, results, MAX_ATTEMPTS, BACKOFF_BASE, BACKOFF_MAX)
+
+
+def test_claim_batch_leases_alerts_and_skips_them_until_the_lease_expires(db, seed, make_alert):
+    alerts = [make_alert() for _ in range(5)]
+    make_alert(next_attempt_at=datetime.now(timezone.utc) + timedelta(hours=1))  # Em backoff
+    make_alert().status = AlertStatus.SENT
+    db.commit()
+
+    first = alert_outbox.claim_batch(db, limit=3, lease_seconds=300)
+    second = alert_outbox.claim_batch(db, limit=10, lease_seconds=300)
+    assert len(first) == 3 and len(second) == 2
+    assert {r.id for r in first} | {r.id for r in second} == {a.id for a in alerts}
+    assert all(r.attempts == 1 and r.recipient_email == seed["admin"].email for r in first + second)
+    # Todos com lease: nada a reivindicar
+    assert alert_outbox.claim_batch(db, limit=10, lease_seconds=300) == []
+
+    # Lease vencido (worker morreu): volta à fila com mais uma tentativa
+    db.query(Alert).filter(Alert.id == alerts[0].id).update({"next_attempt_at": datetime.now(timezone.utc) - timedelta(seconds=1)})
+    db.commit()
+    [reclaimed] = alert_outbox.claim_batch(db, limit=10, lease_seconds=300)
+    assert reclaimed.id == alerts[0].id and reclaimed.attempts == 2
+
+
+def test_concurrent_claims_are_disjoint(db, make_alert):
+    """SKIP LOCKED: sessões simultâneas pegam lotes disjuntos."""
+    ids = {make_alert().id for _ in range(60)}
+    sessions = [SessionLocal() for _ in range(4)]
+    try:
+        async def claim_all():
+            return await asyncio.gather(*(
+                asyncio.to_thread(alert_outbox.claim_batch, session, 20, 300) for session in sessions
+            ))
+
+        batches = asyncio.run(claim_all())
+    finally:
+        for session in sessions:
+            session.close()
+    claimed = [row.id for batch in batches for row in batch]
+    assert len(claimed) == len(set(claimed)) == 60
+    assert set(claimed) == ids
+
+
+class ScriptedAdapter(ChannelAdapter):
+    """Adapter que responde conforme o título do alerta."""
+
+    async def send(self, alert) -> None:
+        outcome = alert.title
+        if outcome == "temporaria":
+            raise DeliveryError("HTTP 503")
+        if outcome == "definitiva":
+            raise DeliveryError("HTTP 400", retryable=False)
+        if outcome == "lenta":
+            await asyncio.sleep(1)
+        if outcome == "bug":
+            raise RuntimeError("inesperado")
+
+
+def test_deliver_batch_classifies_results(db, seed, make_alert):
+    inactive = User(name="Inativo", email="inativo@example.com", password_hash="x", role=UserRole.LEADER, is_active=False)
+    db.add(inactive)
+    db.commit()
+    for title in ("ok", "temporaria", "definitiva", "lenta", "bug"):
+        make_alert(title=title)
+    make_alert(title="ok", recipient=inactive)
+    make_alert(title="definitiva", channel=AlertChannel.SMS)  # Canal sem adapter: apenas in-app
+
+    rows = alert_outbox.claim_batch(db, limit=10, lease_seconds=300)
+    adapters = {AlertChannel.WHATSAPP: ScriptedAdapter()}
+    results = asyncio.run(alert_outbox.deliver_batch(rows, adapters, concurrency=2, timeout_seconds=0.2))
+
+    outcomes = sorted(
+        (row.title, row.channel.value, row.recipient_active, error is None, retryable)
+        for row, error, retryable in results
+    )
+    assert outcomes == sorted([
+        ("ok", "whatsapp", True, True, False),
+        ("ok", "whatsapp", False, False, False),          # Destinatário inativo: definitiva
+        ("temporaria", "whatsapp", True, False, True),
+        ("definitiva", "whatsapp", True, False, False),
+        ("definitiva", "sms", True, True, False),
+        ("lenta", "whatsapp", True, False, True),         # Tempo excedido: temporária
+        ("bug", "whatsapp", True, False, True),           # Exceção inesperada: temporária
+    ])
+
+
+def test_complete_batch_transitions(db, make_alert):
+    sent, retry, permanent, exhausted = (make_alert() for _ in range(4))
+    db.query(Alert).filter(Alert.id == exhausted.id).update({"attempts": MAX_ATTEMPTS - 1})
+    db.commit()
+    rows = {row.id: row for row in alert_outbox.claim_batch(db, limit=10, lease_seconds=300)}
+
+    before = datetime.now(timezone.utc)
+    stats = _complete(db, [
+        (rows[sent.id], None, False),
+        (rows[retry.id], "HTTP 503", True),
+        (rows[permanent.id], "HTTP 400", False),
+        (rows[exhausted.id], "HTTP 503", True),  # Última tentativa
+    ])
+    assert stats == {"processed": 4, "sent": 1, "failed": 2, "retrying": 1}
+
+    db.expire_all()
+    sent, retry, permanent, exhausted = (db.get(Alert, a.id) for a in (sent, retry, permanent, exhausted))
+    assert sent.status == AlertStatus.SENT and sent.sent_at is not None and sent.next_attempt_at is None
+    assert retry.status == AlertStatus.PENDING and retry.error_message == "HTTP 503"
+    # 1ª falha: backoff base * 2^0 com jitter de 50% a 100%
+    delay = (retry.next_attempt_at - before).total_seconds()
+    assert BACKOFF_BASE * 0.5 - 1 <= delay <= BACKOFF_BASE + 1
+    assert permanent.status == AlertStatus.FAILED and permanent.error_message == "HTTP 400"
+    assert exhausted.status == AlertStatus.FAILED and exhausted.attempts == MAX_ATTEMPTS
+
+
+def test_complete_batch_ignores_stale_results(db, make_alert):
+    """Resultado de um worker cujo lease expirou (outro reivindicou) ou alerta já lido não sobrescreve."""
+    reclaimed, read = make_alert(), make_alert()
+    rows = {row.id: row for row in alert_outbox.claim_batch(db, limit=10, lease_seconds=300)}
+    db.query(Alert).filter(Alert.id == reclaimed.id).update({"attempts": Alert.attempts + 1})
+    db.query(Alert).filter(Alert.id == read.id).update({"status": AlertStatus.READ})
+    db.commit()
+
+    _complete(db, [(rows[reclaimed.id], None, False), (rows[read.id], "HTTP 400", False)])
+
+    db.expire_all()
+    assert db.get(Alert, reclaimed.id).status == AlertStatus.PENDING
+    assert db.get(Alert, read.id).status == AlertStatus.READ
+
+
+@pytest.mark.parametrize("attempts, low, high", [
+    (1, 15, 30),
+    (2, 30, 60),
+    (4, 120, 240),
+    (20, 1800, 3600),  # Limitado a BACKOFF_MAX
+])
+def test_backoff_grows_exponentially_with_jitter(attempts, low, high):
+    for _ in range(50):
+        assert low <= alert_outbox.backoff_seconds(attempts, BACKOFF_BASE, BACKOFF_MAX) <= high
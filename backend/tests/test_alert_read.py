@@ -0,0 +1,70 @@
+from app.models import Alert, AlertStatus, AlertType, User, UserRole
+from app.services import alert_service, dashboard_service
+from tests.conftest import auth_headers
+
+
+def _other_user(db) -> User:
+    user = User(name="Outro", email="other@example.com", password_hash="x", role=UserRole.LEADER)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _statuses(db, alerts: list[Alert]) -> list[AlertStatus]:
+    db.expire_all()
+    return [db.get(Alert, alert.id).status for alert in alerts]
+
+
+def test_mark_many_as_read_only_touches_recipient_alerts(db, seed, make_alert):
+    other = _other_user(db)
+    mine = [make_alert() for _ in range(2)]
+    theirs = make_alert(recipient=other)
+    already_read = make_alert(status=AlertStatus.READ)
+
+    ids = [alert.id for alert in mine + [theirs, already_read]]
+    assert alert_service.mark_many_as_read(db, seed["admin"].id, alert_ids=ids) == 2
+    assert _statuses(db, mine + [theirs]) == [AlertStatus.READ, AlertStatus.READ, AlertStatus.PENDING]
+
+    # Ids de outro usuário não são alterados nem contados, mesmo sem outros filtros
+    assert alert_service.mark_many_as_read(db, seed["admin"].id, alert_ids=[theirs.id]) == 0
+    assert alert_service.mark_many_as_read(db, seed["admin"].id) == 0
+    assert _statuses(db, [theirs]) == [AlertStatus.PENDING]
+
+
+def test_bulk_read_filters_by_type_and_status(db, seed, make_alert, client):
+    headers = auth_headers(seed["admin"])
+    renewal_pending = make_alert()
+    renewal_sent = make_alert(status=AlertStatus.SENT)
+    overdue_pending = make_alert(alert_type=AlertType.VALIDATION_OVERDUE)
+    overdue_failed = make_alert(alert_type=AlertType.VALIDATION_OVERDUE, status=AlertStatus.FAILED)
+
+    response = client.post("/api/v1/alerts/bulk-read", json={"alert_type": "renewal_upcoming"}, headers=headers)
+    assert response.json() == {"updated": 2}
+    assert _statuses(db, [renewal_pending, renewal_sent, overdue_pending, overdue_failed]) == [
+        AlertStatus.READ, AlertStatus.READ, AlertStatus.PENDING, AlertStatus.FAILED,
+    ]
+
+    response = client.post("/api/v1/alerts/bulk-read", json={"status": "failed"}, headers=headers)
+    assert response.json() == {"updated": 1}
+    assert _statuses(db, [overdue_pending, overdue_failed]) == [AlertStatus.PENDING, AlertStatus.READ]
+
+    assert client.post("/api/v1/alerts/bulk-read", json={}, headers=headers).status_code == 400
+    too_many = {"ids": [str(overdue_pending.id)] * 501}
+    assert client.post("/api/v1/alerts/bulk-read", json=too_many, headers=headers).status_code == 400
+
+
+def test_read_all_updates_dashboard_unread_count(db, seed, make_alert, client):
+    """O contador de não lidos do dashboard (em cache) cai já na chamada seguinte a /read-all."""
+    admin = seed["admin"]
+    other = _other_user(db)
+    for _ in range(3):
+        make_alert()
+    theirs = make_alert(recipient=other)
+
+    assert dashboard_service.get_dashboard_stats(db, admin).unread_alerts == 3
+    assert dashboard_service.get_dashboard_stats(db, admin).unread_alerts == 3  # Servido do cache
+
+    response = client.post("/api/v1/alerts/read-all", headers=auth_headers(admin))
+    assert response.json() == {"updated": 3}
+    assert dashboard_service.get_dashboard_stats(db, admin).unread_alerts == 0
+    assert _statuses(db, [theirs]) == [AlertStatus.PENDING]
@@ -0,0 +1,105 @@
+import asyncio
+import uuid
+
+from app.core.config import settings
+from app.services.alert_stream import HEARTBEAT, RESYNC, AlertBroker
+from tests.test_alert_stream_auth import _stream_token
+
+
+def _publish_and_collect(broker: AlertBroker, recipient_id, publish) -> list:
+    """Assina recipient_id, roda publish() e devolve os eventos recebidos pela conexão."""
+
+    async def scenario():
+        subscription, _ = broker.subscribe(recipient_id)
+        publish()
+        events, resync = await subscription.next(timeout=2)
+        broker.unsubscribe(subscription)
+        assert not resync
+        return events
+
+    return asyncio.run(scenario())
+
+
+def test_replay_returns_only_later_events_of_the_recipient():
+    broker = AlertBroker(replay_size=100, max_queued=100)
+    alice, bob = uuid.uuid4(), uuid.uuid4()
+
+    def publish():
+        for count in range(1, 4):
+            broker.publish_read(alice, count)
+            broker.publish_read(bob, count)
+
+    events = _publish_and_collect(broker, alice, publish)
+    assert [event.recipient_id for event in events] == [alice] * 3
+
+    async def reconnect():
+        subscription, backlog = broker.subscribe(alice, events[0].id)
+        broker.unsubscribe(subscription)
+        return backlog
+
+    backlog = asyncio.run(reconnect())
+    assert [event.id for event in backlog] == [event.id for event in events[1:]]
+    assert all('"count": 1' not in event.encoded for event in backlog)
+
+
+def test_replay_outside_buffer_or_from_other_epoch_needs_resync():
+    broker = AlertBroker(replay_size=3, max_queued=100)
+    alice = uuid.uuid4()
+    events = _publish_and_collect(broker, alice, lambda: [broker.publish_read(alice, n) for n in range(5)])
+
+    async def subscribe(last_event_id):
+        subscription, backlog = broker.subscribe(alice, last_event_id)
+        broker.unsubscribe(subscription)
+        return backlog
+
+    # Ainda no buffer (os 3 últimos): repete o que veio depois
+    assert [e.id for e in asyncio.run(subscribe(events[1].id))] == [e.id for e in events[2:]]
+    assert asyncio.run(subscribe(events[-1].id)) == []
+    # Anterior ao buffer, de outro processo ou malformado: resync
+    assert asyncio.run(subscribe(events[0].id)) is None
+    assert asyncio.run(subscribe("deadbeef-5")) is None
+    assert asyncio.run(subscribe("lixo")) is None
+
+    broker.resync_all()
+    assert asyncio.run(subscribe(events[-1].id)) is None
+    assert broker.connections() == 0
+
+
+def test_queue_overflow_keeps_latest_events_and_sets_resync():
+    broker = AlertBroker(replay_size=100, max_queued=2)
+    alice = uuid.uuid4()
+
+    async def scenario():
+        subscription, _ = broker.subscribe(alice)
+        for count in range(5):
+            broker.publish_read(alice, count)
+        await asyncio.sleep(0)  # Entrega agendada com call_soon_threadsafe
+        events, resync = await subscription.next(timeout=2)
+        again = await subscription.next(timeout=0.05)
+        broker.unsubscribe(subscription)
+        return events, resync, again
+
+    events, resync, again = asyncio.run(scenario())
+    assert resync
+    assert len(events) == 2
+    assert '"count": 4' in events[-1].encoded
+    assert again == ([], False)
+
+
+def test_idle_subscription_times_out_and_stream_sends_heartbeat(client, seed, monkeypatch):
+    broker = AlertBroker(replay_size=100, max_queued=100)
+
+    async def idle():
+        subscription, _ = broker.subscribe(uuid.uuid4())
+        result = await subscription.next(timeout=0.05)
+        broker.unsubscribe(subscription)
+        return result
+
+    assert asyncio.run(idle()) == ([], False)
+
+    monkeypatch.setattr(settings, "ALERT_STREAM_HEARTBEAT_SECONDS", 0.1)
+    token = _stream_token(seed["admin"], 2)
+    body = client.get(f"/api/v1/alerts/stream?token={token}").text
+    assert body.startswith("retry: 5000\n\n")
+    assert HEARTBEAT in body
+    assert RESYNC not in body
@@ -0,0 +1,81 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import create_access_token, create_stream_token, decode_access_token
+from app.models import User
+from tests.conftest import auth_headers
+
+
+def _stream_token(user, seconds: float) -> str:
+    return create_stream_token(str(user.id), datetime.now(timezone.utc) + timedelta(seconds=seconds))
+
+
+def _read_until_closed(client, url: str) -> float:
+    """Lê o stream até o servidor fechá-lo; retorna quanto tempo ficou aberto."""
+    started = time.monotonic()
+    with client.stream("GET", url) as response:
+        assert response.status_code == 200
+        for _ in response.iter_lines():
+            pass
+    return time.monotonic() - started
+
+
+def test_stream_token_is_short_lived_and_bound_to_session(client, seed):
+    admin = seed["admin"]
+    headers = auth_headers(admin)
+    response = client.post("/api/v1/alerts/stream-token", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["expires_in"] == settings.ALERT_STREAM_TOKEN_TTL_SECONDS
+
+    payload = decode_access_token(body["token"])
+    session = decode_access_token(headers["Authorization"].split()[1])
+    assert payload["scope"] == "alert_stream"
+    assert payload["session_exp"] == session["exp"]
+    assert payload["exp"] <= time.time() + settings.ALERT_STREAM_TOKEN_TTL_SECONDS + 1
+
+
+def test_stream_rejects_access_token_in_url_and_stream_token_as_bearer(client, seed):
+    admin = seed["admin"]
+    access_token = create_access_token({"sub": str(admin.id)})
+    assert client.get(f"/api/v1/alerts/stream?token={access_token}").status_code == 401
+
+    stream_token = _stream_token(admin, 3600)
+    response = client.get("/api/v1/alerts/me", headers={"Authorization": f"Bearer {stream_token}"})
+    assert response.status_code == 401
+
+
+def test_stream_rejects_expired_stream_token(client, seed):
+    expired = _stream_token(seed["admin"], -1)
+    assert client.get(f"/api/v1/alerts/stream?token={expired}").status_code == 401
+
+
+def test_stream_closes_when_session_expires(client, seed, monkeypatch):
+    monkeypatch.setattr(settings, "ALERT_STREAM_HEARTBEAT_SECONDS", 30.0)
+    token = _stream_token(seed["admin"], 2)
+    assert _read_until_closed(client, f"/api/v1/alerts/stream?token={token}") < 5
+
+
+def test_stream_closes_when_user_is_deactivated(client, seed, monkeypatch):
+    monkeypatch.setattr(settings, "ALERT_STREAM_HEARTBEAT_SECONDS", 0.2)
+    admin_id = seed["admin"].id
+    token = _stream_token(seed["admin"], 30)
+
+    def deactivate():
+        # Outra sessão, com o stream já aberto (o TestClient só devolve o corpo ao fim)
+        session = SessionLocal()
+        try:
+            session.query(User).filter(User.id == admin_id).update({"is_active": False})
+            session.commit()
+        finally:
+            session.close()
+
+    timer = threading.Timer(0.5, deactivate)
+    timer.start()
+    try:
+        assert _read_until_closed(client, f"/api/v1/alerts/stream?token={token}") < 5
+    finally:
+        timer.cancel()
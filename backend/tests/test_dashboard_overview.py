@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.core.cache import dashboard_cache
+from app.models import Company, Department, ExpenseStatus, ExpenseType, User, UserRole
+from app.services import dashboard_service, rollup_service
+
+
+@pytest.fixture
+def dashboard_data(db, seed, make_expense):
+    """Despesas em duas empresas (ativas, canceladas, únicas e com renovação próxima) e um líder da primeira."""
+    other_company = Company(name="Beta")
+    db.add(other_company)
+    db.flush()
+    other_department = Department(name="Ops", company_id=other_company.id)
+    leader = User(name="Líder", email="leader@example.com", password_hash="x", role=UserRole.LEADER)
+    leader.companies = [seed["company"]]
+    db.add_all([other_department, leader])
+    db.flush()
+
+    today = date.today()
+    for i in range(30):
+        make_expense(
+            service_name=f"Serviço {i}",
+            value_brl=Decimal(10 + i),
+            owner_id=leader.id if i % 3 == 0 else seed["admin"].id,
+            renewal_date=today + timedelta(days=i),
+            expense_type=ExpenseType.ONE_TIME if i % 7 == 0 else ExpenseType.RECURRING,
+            status=ExpenseStatus.CANCELLED if i % 5 == 0 else ExpenseStatus.ACTIVE,
+            **({"company_id": other_company.id, "department_id": other_department.id} if i % 2 else {}),
+        )
+    rollup_service.rebuild(db)
+    db.commit()
+    return {"leader": leader, "other_company": other_company}
+
+
+def _widgets_one_by_one(db, user, company_id=None) -> dict:
+    dashboard_cache.invalidate()
+    return {
+        "stats": dashboard_service.get_dashboard_stats(db, user, company_id),
+        "by_category": dashboard_service.get_expenses_by_category(db, user, company_id),
+        "by_company": dashboard_service.get_expenses_by_company(db, user, company_id),
+        "by_department": dashboard_service.get_expenses_by_department(db, user, company_id),
+        "timeline": dashboard_service.get_expenses_timeline(db, user, company_id),
+        "top_expenses": dashboard_service.get_top_expenses(db, user, company_id),
+        "by_status": dashboard_service.get_expenses_by_status(db, user, company_id),
+        "upcoming_renewals": dashboard_service.get_upcoming_renewals(db, user, company_id),
+    }
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+@pytest.mark.parametrize("role", ["admin", "leader", "admin_filtered"])
+def test_overview_matches_individual_widgets(db, seed, dashboard_data, monkeypatch, workers, role):
+    """Com widgets em paralelo (sessões próprias) ou em sequência, o overview é igual aos endpoints individuais."""
+    if workers == 1:
+        monkeypatch.setattr(dashboard_service, "_overview_executor", None)
+    user = dashboard_data["leader"] if role == "leader" else seed["admin"]
+    company_id = dashboard_data["other_company"].id if role == "admin_filtered" else None
+
+    expected = _widgets_one_by_one(db, user, company_id)
+    dashboard_cache.invalidate()
+    overview = dashboard_service.get_overview(db, user, company_id, include_timings=True)
+
+    for name, value in expected.items():
+        assert getattr(overview, name) == value, name
+    assert set(overview.timings_ms) == set(expected)
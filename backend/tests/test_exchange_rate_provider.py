@@ -0,0 +1,129 @@
+import asyncio
+from decimal import Decimal
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.services.exchange_service import UsdBrlRateProvider
+
+
+def _quote(bid: str) -> dict:
+    return {"USDBRL": {"bid": bid}}
+
+
+def _provider(url: str, ttl_seconds: float = 60, latency_budget_seconds: float = 2.0,
+              failure_threshold: int = 3, reset_timeout_seconds: float = 60) -> UsdBrlRateProvider:
+    return UsdBrlRateProvider(
+        url=url,
+        ttl_seconds=ttl_seconds,
+        refresh_seconds=3600,
+        latency_budget_seconds=latency_budget_seconds,
+        breaker=CircuitBreaker("teste", failure_threshold, reset_timeout_seconds),
+    )
+
+
+def test_concurrent_refreshes_share_one_request(http_stub):
+    """Single-flight: 20 refresh() simultâneos fazem uma única requisição e recebem a mesma cotação."""
+    http_stub.respond((200, _quote("5.1234"), 0.2))
+    provider = _provider(http_stub.url)
+
+    async def scenario():
+        try:
+            return await asyncio.gather(*(provider.refresh() for _ in range(20)))
+        finally:
+            await provider.stop()
+
+    results = asyncio.run(scenario())
+    assert http_stub.hits == 1
+    assert {r.rate for r in results} == {Decimal("5.1234")}
+    assert provider.health()["source"] == "live"
+
+
+def test_breaker_opens_after_failures_and_probe_closes_it(http_stub):
+    """Após failure_threshold falhas seguidas, nenhuma requisição sai até o probe (half-open)."""
+    http_stub.respond((500, {"erro": "indisponível"}))
+    provider = _provider(http_stub.url, failure_threshold=3, reset_timeout_seconds=0.3)
+
+    async def scenario():
+        try:
+            for _ in range(3):
+                assert await provider.refresh() is None
+            assert provider.breaker.state == CircuitBreaker.OPEN
+            assert http_stub.hits == 3
+
+            # Circuito aberto: recusa sem I/O
+            assert await provider.refresh() is None
+            assert http_stub.hits == 3
+
+            # Passado o reset, um probe bem-sucedido fecha o circuito
+            await asyncio.sleep(0.35)
+            http_stub.respond((200, _quote("5.2000")))
+            result = await provider.refresh()
+            assert result is not None and result.rate == Decimal("5.2000")
+            assert http_stub.hits == 4
+            assert provider.breaker.state == CircuitBreaker.CLOSED
+        finally:
+            await provider.stop()
+
+    asyncio.run(scenario())
+
+
+def test_failed_probe_reopens_breaker(http_stub):
+    http_stub.respond((503, {}))
+    provider = _provider(http_stub.url, failure_threshold=1, reset_timeout_seconds=0.2)
+
+    async def scenario():
+        try:
+            assert await provider.refresh() is None
+            await asyncio.sleep(0.25)
+            assert await provider.refresh() is None  # Probe falha
+            assert provider.breaker.state == CircuitBreaker.OPEN
+            assert await provider.refresh() is None
+            assert http_stub.hits == 2
+        finally:
+            await provider.stop()
+
+    asyncio.run(scenario())
+
+
+def test_last_good_rate_survives_errors_and_latency_budget(http_stub):
+    """Erro HTTP, resposta sem cotação ou busca acima do orçamento de latência mantêm a última cotação boa."""
+    http_stub.respond((200, _quote("5.3000")))
+    provider = _provider(http_stub.url, ttl_seconds=0, latency_budget_seconds=0.2, failure_threshold=10)
+
+    async def scenario():
+        try:
+            first = await provider.refresh()
+            assert first.rate == Decimal("5.3000")
+
+            http_stub.respond((500, {}), (200, {"outra": "coisa"}), (200, _quote("9.9999"), 0.5))
+            for _ in range(3):
+                assert await provider.refresh() is None
+                assert provider.current().rate == Decimal("5.3000")
+            assert provider.breaker.snapshot()["consecutive_failures"] == 3
+            assert "latência" in provider.breaker.snapshot()["last_error"]
+            assert provider.health()["rate"] == "5.3000"
+        finally:
+            await provider.stop()
+
+    asyncio.run(scenario())
+
+
+def test_stale_current_schedules_background_refresh(http_stub):
+    """current() com cotação vencida devolve a última conhecida e agenda uma busca no event loop."""
+    http_stub.respond((200, _quote("5.0000")))
+    provider = _provider(http_stub.url, ttl_seconds=0.1)
+
+    async def scenario():
+        try:
+            await provider.refresh()
+            await asyncio.sleep(0.15)
+            http_stub.respond((200, _quote("5.5000")))
+            # Chamada de outra thread, como num handler síncrono
+            stale = await asyncio.to_thread(provider.current)
+            assert stale.rate == Decimal("5.0000")
+            await asyncio.sleep(0.2)
+            assert provider.current().rate == Decimal("5.5000")
+            assert http_stub.hits == 2
+        finally:
+            await provider.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,56 @@
+from datetime import date
+from decimal import Decimal
+
+from app.models import Currency, ExchangeRate, ExpenseValidation, ValidationStatus
+from app.services import dashboard_service, exchange_rate_service
+from tests.conftest import auth_headers
+
+
+def test_import_reports_out_of_range_rates_and_bad_currencies_per_line(db, seed, client):
+    content = "\n".join([
+        "date,rate,currency",
+        "2025-01-02,5.1000,USD",
+        "2025-01-03,1000000,USD",   # Acima de Numeric(10, 4)
+        "2025-01-06,NaN,USD",
+        "2025-01-07,5.2000,DOLAR",
+        "2025-01-08,5.3000,U1",
+        "2025-01-09,6.0000,eur",
+    ])
+    response = client.post(
+        "/api/v1/exchange-rates/import",
+        files={"file": ("cotacoes.csv", content.encode(), "text/csv")},
+        headers=auth_headers(seed["admin"]),
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["imported"] == 2
+    assert [e["line"] for e in body["errors"]] == [3, 4, 5, 6]
+    assert "fora do intervalo" in body["errors"][0]["error"]
+    assert "Moeda inválida" in body["errors"][2]["error"]
+    assert {(r.currency, r.rate) for r in db.query(ExchangeRate)} == {
+        ("USD", Decimal("5.1000")), ("EUR", Decimal("6.0000")),
+    }
+
+
+def test_import_and_record_rate_invalidate_dashboard_cache(db, seed, make_expense):
+    """O gasto histórico (cacheado) reflete cotações importadas ou gravadas sem esperar o TTL."""
+    expense = make_expense(currency=Currency.USD, value=Decimal("10.00"), value_brl=Decimal("50.00"))
+    db.add(ExpenseValidation(
+        expense_id=expense.id,
+        validation_month=date(2025, 1, 1),
+        status=ValidationStatus.APPROVED,
+        is_overdue=False,
+    ))
+    db.commit()
+
+    def january_total() -> Decimal:
+        return dashboard_service.get_historical_spend(db, seed["admin"], from_month="2025-01", to_month="2025-01").total_value
+
+    assert january_total() == Decimal("50.00")  # Sem histórico: value_brl atual
+
+    result = exchange_rate_service.import_csv(db, "date,rate\n2025-01-15,5.5000\n")
+    assert result == {"imported": 1, "errors": []}
+    assert january_total() == Decimal("55.00")
+
+    exchange_rate_service.record_rate(db, Decimal("6.0000"), date(2025, 1, 20), source="awesomeapi")
+    assert january_total() == Decimal("60.00")
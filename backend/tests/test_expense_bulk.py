@@ -0,0 +1,57 @@
+import uuid
+
+from app.models import Company, Department, Expense
+from tests.conftest import auth_headers
+
+
+def _row(seed, **fields) -> dict:
+    return {
+        "service_name": "Serviço",
+        "expense_type": "recurring",
+        "category_id": str(seed["category"].id),
+        "company_id": str(seed["company"].id),
+        "department_id": str(seed["department"].id),
+        "owner_id": str(seed["admin"].id),
+        "value": "10.00",
+        "currency": "BRL",
+        "periodicity": "monthly",
+        "payment_method": "pix",
+        **fields,
+    }
+
+
+def test_bulk_reports_unknown_approver_and_foreign_department_per_row(db, seed, client):
+    """Validador inexistente e setor de outra empresa são erros da linha, não um 400 do lote inteiro."""
+    other_company = Company(name="Beta")
+    db.add(other_company)
+    db.flush()
+    other_department = Department(name="Ops", company_id=other_company.id)
+    db.add(other_department)
+    db.commit()
+
+    rows = [
+        _row(seed, service_name="Ok"),
+        _row(seed, approver_id=str(uuid.uuid4())),
+        _row(seed, department_id=str(other_department.id)),
+        _row(seed, service_name="Ok com validador", approver_id=str(seed["admin"].id)),
+    ]
+    response = client.post("/api/v1/expenses/bulk", json=rows, headers=auth_headers(seed["admin"]))
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    assert (body["created"], body["failed"]) == (2, 2)
+    assert [r["success"] for r in body["rows"]] == [True, False, False, True]
+    assert body["rows"][1]["errors"] == ["Validador não encontrado"]
+    assert body["rows"][2]["errors"] == ["O setor selecionado não pertence à empresa escolhida"]
+    assert {e.service_name for e in db.query(Expense)} == {"Ok", "Ok com validador"}
+
+
+def test_bulk_csv_with_invalid_encoding_returns_400(seed, client):
+    content = "service_name,value\nCafé,10\n".encode("latin-1")
+    response = client.post(
+        "/api/v1/expenses/bulk",
+        files={"file": ("despesas.csv", content, "text/csv")},
+        headers=auth_headers(seed["admin"]),
+    )
+    assert response.status_code == 400
+    assert "UTF-8" in response.json()["detail"]
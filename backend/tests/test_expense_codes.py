@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from app.core.database import SessionLocal
+from app.models import Currency, Expense, ExpenseType, PaymentMethod, Periodicity, User
+from app.models.expense import format_expense_code
+from app.schemas.expense import ExpenseCreate
+from app.services import expense_service
+
+
+def _payload(seed, name: str) -> ExpenseCreate:
+    return ExpenseCreate(
+        service_name=name,
+        expense_type=ExpenseType.RECURRING,
+        category_id=seed["category"].id,
+        company_id=seed["company"].id,
+        department_id=seed["department"].id,
+        owner_id=seed["admin"].id,
+        approver_id=seed["admin"].id,
+        value=Decimal("10.00"),
+        currency=Currency.BRL,
+        periodicity=Periodicity.MONTHLY,
+        payment_method=PaymentMethod.PIX,
+    )
+
+
+def test_concurrent_creates_allocate_unique_gap_free_codes(db, seed):
+    """Criações e importações em lote simultâneas recebem códigos DPnn únicos e sem buracos."""
+    single_creates, bulk_creates, bulk_size = 40, 10, 8
+
+    def create_one(i: int) -> list[str]:
+        session = SessionLocal()
+        try:
+            expense = expense_service.create(session, _payload(seed, f"Único {i}"), value_brl=Decimal("10.00"))
+            return [expense.code]
+        finally:
+            session.close()
+
+    def create_bulk(i: int) -> list[str]:
+        session = SessionLocal()
+        try:
+            user = session.get(User, seed["admin"].id)
+            rows = [_payload(seed, f"Lote {i}.{j}") for j in range(bulk_size)]
+            results = expense_service.bulk_create(session, rows, user)
+            assert all(r["success"] for r in results), results
+            return [r["code"] for r in results]
+        finally:
+            session.close()
+
+    # Erros (ex.: IntegrityError por código duplicado) propagam pelo result()
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures = [executor.submit(create_one, i) for i in range(single_creates)]
+        futures += [executor.submit(create_bulk, i) for i in range(bulk_creates)]
+        codes = [code for future in futures for code in future.result()]
+
+    total = single_creates + bulk_creates * bulk_size
+    assert len(codes) == len(set(codes)) == total
+    assert set(codes) == {format_expense_code(n) for n in range(1, total + 1)}
+    assert db.query(Expense).count() == total
+
+
+def test_bulk_create_codes_follow_row_order(db, seed):
+    """No lote, os códigos são atribuídos em ordem crescente seguindo a ordem das linhas."""
+    results = expense_service.bulk_create(db, [_payload(seed, f"Linha {i}") for i in range(12)], seed["admin"])
+    assert [r["code"] for r in results] == [format_expense_code(n) for n in range(1, 13)]
@@ -0,0 +1,63 @@
+import csv
+import io
+
+from openpyxl import load_workbook
+
+from app.models import Company, Department, User, UserRole
+from app.services.expense_export_service import EXPORT_COLUMNS
+from tests.conftest import auth_headers
+
+
+def _leader_with_other_company_expense(db, seed, make_expense):
+    """Líder da empresa do seed; uma despesa de outra empresa fica fora do escopo dele."""
+    leader = User(name="Líder", email="leader@example.com", password_hash="x", role=UserRole.LEADER)
+    leader.companies.append(seed["company"])
+    other = Company(name="Outra")
+    db.add_all([leader, other])
+    db.flush()
+    other_department = Department(name="Fin", company_id=other.id)
+    db.add(other_department)
+    db.flush()
+    make_expense(service_name="Fora do escopo", company_id=other.id, department_id=other_department.id)
+    return leader
+
+
+def test_export_csv_headers_rows_and_scope(db, seed, make_expense, client):
+    leader = _leader_with_other_company_expense(db, seed, make_expense)
+    for i in range(3):
+        make_expense(service_name=f"Serviço {i}")
+    make_expense(service_name="=HYPERLINK(\"http://x\")", description="@SUM(A1)")
+    db.commit()
+
+    response = client.get("/api/v1/expenses/export", params={"format": "csv"}, headers=auth_headers(leader))
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"].endswith('.csv"')
+
+    rows = list(csv.reader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert rows[0] == [header for header, _ in EXPORT_COLUMNS]
+    names = [row[1] for row in rows[1:]]
+    assert len(names) == 4
+    assert "Fora do escopo" not in names
+    # Textos iniciados por =, +, - ou @ não viram fórmula
+    assert "'=HYPERLINK(\"http://x\")" in names
+    injected = next(row for row in rows[1:] if row[1].startswith("'="))
+    assert injected[2] == "'@SUM(A1)"
+
+    admin_rows = client.get("/api/v1/expenses/export", headers=auth_headers(seed["admin"])).content
+    assert len(list(csv.reader(io.StringIO(admin_rows.decode("utf-8-sig"))))) == 6
+
+
+def test_export_xlsx_scope_and_text_cells(db, seed, make_expense, client):
+    leader = _leader_with_other_company_expense(db, seed, make_expense)
+    make_expense(service_name="=1+1")
+    db.commit()
+
+    response = client.get("/api/v1/expenses/export", params={"format": "xlsx"}, headers=auth_headers(leader))
+    assert response.status_code == 200, response.text
+    sheet = load_workbook(io.BytesIO(response.content)).active
+    rows = list(sheet.iter_rows())
+    assert [cell.value for cell in rows[0]] == [header for header, _ in EXPORT_COLUMNS]
+    assert len(rows) == 2
+    assert rows[1][1].value == "=1+1"
+    assert rows[1][1].data_type == "s"
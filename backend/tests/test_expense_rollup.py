@@ -0,0 +1,80 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models import Category, Currency, Expense, ExpenseMonthlyRollup, ExpenseType, PaymentMethod, Periodicity
+from app.schemas.expense import ExpenseCreate, ExpenseUpdate
+from app.services import expense_service, rollup_service
+
+
+def _rollup(db) -> list[tuple]:
+    rows = db.execute(select(
+        ExpenseMonthlyRollup.month,
+        ExpenseMonthlyRollup.company_id,
+        ExpenseMonthlyRollup.department_id,
+        ExpenseMonthlyRollup.category_id,
+        ExpenseMonthlyRollup.status,
+        ExpenseMonthlyRollup.expense_type,
+        ExpenseMonthlyRollup.total_value_brl,
+        ExpenseMonthlyRollup.expense_count,
+    ).where(
+        (ExpenseMonthlyRollup.expense_count != 0) | (ExpenseMonthlyRollup.total_value_brl != 0)
+    )).all()
+    return sorted(tuple(row) for row in rows)
+
+
+def _create(db, seed, name: str) -> Expense:
+    data = ExpenseCreate(
+        service_name=name,
+        expense_type=ExpenseType.RECURRING,
+        category_id=seed["category"].id,
+        company_id=seed["company"].id,
+        department_id=seed["department"].id,
+        owner_id=seed["admin"].id,
+        approver_id=seed["admin"].id,
+        value=Decimal("100.00"),
+        currency=Currency.BRL,
+        periodicity=Periodicity.MONTHLY,
+        renewal_date=date(2025, 1, 10),
+        payment_method=PaymentMethod.PIX,
+    )
+    return expense_service.create(db, data, value_brl=Decimal("100.00"))
+
+
+def _update_elsewhere(expense_id, value: str) -> None:
+    """Outra requisição altera o valor enquanto a despesa já está carregada nesta sessão."""
+    session = SessionLocal()
+    try:
+        expense = session.get(Expense, expense_id)
+        expense_service.update(session, expense, ExpenseUpdate(value=Decimal(value)), value_brl=Decimal(value))
+    finally:
+        session.close()
+
+
+def test_incremental_rollup_matches_rebuild_with_stale_objects(db, seed):
+    """
+    Criação, edição, cancelamento e exclusão pelo caminho incremental, com o objeto da
+    sessão desatualizado por edições concorrentes: o rollup bate com rebuild().
+    """
+    other_category = Category(name="Infra")
+    db.add(other_category)
+    db.commit()
+
+    edited = _create(db, seed, "Editada")
+    deleted = _create(db, seed, "Excluída")
+
+    _update_elsewhere(edited.id, "250.00")
+    expense_service.update(db, edited, ExpenseUpdate(category_id=other_category.id))
+    assert edited.value_brl == Decimal("250.00")
+
+    _update_elsewhere(edited.id, "300.00")
+    expense_service.cancel_with_info(db, edited, charged_this_month=True)
+
+    _update_elsewhere(deleted.id, "80.00")
+    expense_service.delete(db, deleted)
+
+    incremental = _rollup(db)
+    rollup_service.rebuild(db)
+    assert incremental == _rollup(db)
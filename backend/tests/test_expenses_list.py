@@ -0,0 +1,80 @@
+from datetime import date
+
+from app.models import Category, ExpenseValidation, User, UserRole, ValidationStatus
+from tests.conftest import auth_headers
+
+
+def _list_all(client, headers, view: str) -> list[str]:
+    """Percorre todas as páginas de GET /expenses; retorna os ids na ordem recebida."""
+    ids, cursor = [], None
+    while True:
+        params = {"limit": 200, "view": view}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/expenses", params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        ids.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return ids
+
+
+def _queries_for_page(client, headers, query_counter, view: str, count: int) -> int:
+    query_counter.count = 0
+    response = client.get("/api/v1/expenses", params={"limit": 200, "view": view}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert len(response.json()["items"]) == count
+    return query_counter.count
+
+
+def _make_distinct_expenses(db, make_expense, start: int, count: int) -> None:
+    """
+    Despesas com responsável, categoria e validações (com validadores) próprios:
+    relações carregadas uma a uma apareceriam na contagem.
+    """
+    for i in range(start, start + count):
+        owner = User(name=f"Responsável {i}", email=f"owner{i}@example.com", password_hash="x", role=UserRole.LEADER)
+        validators = [
+            User(name=f"Validador {i}-{m}", email=f"validator{i}-{m}@example.com", password_hash="x", role=UserRole.LEADER)
+            for m in (1, 2)
+        ]
+        category = Category(name=f"Categoria {i}")
+        db.add_all([owner, category, *validators])
+        db.flush()
+        expense = make_expense(service_name=f"Serviço {i}", owner_id=owner.id, category_id=category.id)
+        db.add_all([
+            ExpenseValidation(
+                expense_id=expense.id,
+                validator_id=validator.id,
+                validation_month=date(2025, m, 1),
+                status=ValidationStatus.APPROVED,
+            )
+            for m, validator in zip((1, 2), validators)
+        ])
+    db.commit()
+
+
+def test_list_expenses_query_count_independent_of_rows(db, seed, make_expense, client, query_counter):
+    """GET /expenses executa o mesmo número de queries com 5 ou 150 despesas (sem N+1)."""
+    headers = auth_headers(seed["admin"])
+
+    _make_distinct_expenses(db, make_expense, 0, 5)
+    small = {view: _queries_for_page(client, headers, query_counter, view, 5) for view in ("full", "summary")}
+
+    _make_distinct_expenses(db, make_expense, 5, 145)
+    large = {view: _queries_for_page(client, headers, query_counter, view, 150) for view in ("full", "summary")}
+
+    assert small == large
+
+
+def test_list_expenses_cursor_pages_cover_all_rows(db, seed, make_expense, client):
+    """As páginas seguidas por next_cursor trazem todas as despesas, sem repetir."""
+    for i in range(450):
+        make_expense(service_name=f"Serviço {i}")
+    db.commit()
+    headers = auth_headers(seed["admin"])
+    for view in ("full", "summary"):
+        ids = _list_all(client, headers, view)
+        assert len(ids) == 450
+        assert len(set(ids)) == 450
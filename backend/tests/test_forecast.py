@@ -0,0 +1,88 @@
+import random
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+
+from app.models import Category, Company, Department, Expense, ExpenseStatus, ExpenseType, Periodicity
+from app.services import expense_validation_service as evs
+from app.services import forecast_service
+
+
+@pytest.fixture
+def random_expenses(db, seed, make_expense):
+    """
+    300 despesas com periodicidade, âncora, tipo, status, valor e (empresa, setor, categoria)
+    aleatórios; created_at cai perto da virada do mês para variar conforme o fuso.
+    """
+    rng = random.Random(12)
+    dimensions = [(seed["company"], seed["department"])]
+    for i in range(2):
+        company = Company(name=f"Empresa {i}")
+        db.add(company)
+        db.flush()
+        department = Department(name=f"Setor {i}", company_id=company.id)
+        db.add(department)
+        db.flush()
+        dimensions.append((company, department))
+    categories = [seed["category"]] + [Category(name=f"Categoria {i}") for i in range(2)]
+    db.add_all(categories)
+    db.flush()
+
+    for i in range(300):
+        company, department = rng.choice(dimensions)
+        value = Decimal(rng.randint(1, 500000)) / 100
+        make_expense(
+            service_name=f"Serviço {i}",
+            company_id=company.id,
+            department_id=department.id,
+            category_id=rng.choice(categories).id,
+            value=value,
+            value_brl=value,
+            periodicity=rng.choice(list(Periodicity) + [None]),
+            expense_type=rng.choice([ExpenseType.RECURRING] * 4 + [ExpenseType.ONE_TIME]),
+            status=rng.choice([ExpenseStatus.ACTIVE] * 4 + [ExpenseStatus.CANCELLED, ExpenseStatus.SUSPENDED]),
+            created_at=datetime(
+                rng.randint(2022, 2025), rng.randint(1, 12), rng.choice([1, 2, 15, 28]), rng.randint(0, 23),
+                tzinfo=timezone.utc,
+            ),
+            renewal_date=(
+                date(rng.randint(2021, 2026), rng.randint(1, 12), rng.randint(1, 28))
+                if rng.random() < 0.6 else None
+            ),
+        )
+    db.commit()
+
+
+@pytest.mark.parametrize("time_zone", ["UTC", "America/Sao_Paulo"])
+@pytest.mark.parametrize("start_month", [date(2024, 3, 1), date(2026, 1, 1)])
+def test_project_matches_python_rule(db, random_expenses, time_zone, start_month):
+    """
+    Para cada mês e (empresa, setor, categoria): project() == soma de value_brl das despesas
+    ativas em que should_create_validation_for_month (no mesmo fuso da sessão).
+    """
+    db.execute(text(f"SET LOCAL TIME ZONE '{time_zone}'"))
+    expenses = db.query(Expense).populate_existing().all()
+    months = 24
+    forecast = forecast_service.project(db, [], start_month, months)
+
+    expected = defaultdict(Decimal)
+    for h in range(months):
+        index = start_month.year * 12 + start_month.month - 1 + h
+        month = date(index // 12, index % 12 + 1, 1)
+        for expense in expenses:
+            if expense.status == ExpenseStatus.ACTIVE and evs.should_create_validation_for_month(expense, month):
+                expected[(month.isoformat()[:7], expense.company_id, expense.department_id, expense.category_id)] += \
+                    expense.value_brl
+    assert expected  # Conjunto de teste cobre casos positivos
+
+    actual = {
+        (item_month.month, item.company_id, item.department_id, item.category_id): item.total_value
+        for item_month in forecast.months
+        for item in item_month.items
+    }
+    assert actual == dict(expected)
+    assert [m.month for m in forecast.months][0] == start_month.isoformat()[:7]
+    assert forecast.total == sum(expected.values(), Decimal("0"))
@@ -0,0 +1,150 @@
+import random
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.models import Expense, ExpenseStatus, ExpenseType, ExpenseValidation, Periodicity, ValidationStatus
+from app.services import expense_validation_service as evs
+from tests.conftest import auth_headers
+
+
+def _months(first: date, last: date) -> list[date]:
+    months = []
+    current = first
+    while current <= last:
+        months.append(current)
+        current = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+    return months
+
+
+@pytest.fixture
+def random_expenses(db, make_expense):
+    """300 despesas com periodicidade, âncora (renewal_date ou created_at), tipo e status aleatórios."""
+    rng = random.Random(16)
+    for i in range(300):
+        make_expense(
+            service_name=f"Serviço {i}",
+            periodicity=rng.choice(list(Periodicity) + [None]),
+            expense_type=rng.choice([ExpenseType.RECURRING] * 4 + [ExpenseType.ONE_TIME]),
+            status=rng.choice([ExpenseStatus.ACTIVE] * 4 + [ExpenseStatus.CANCELLED, ExpenseStatus.SUSPENDED]),
+            created_at=datetime(
+                rng.randint(2022, 2025), rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 23),
+                tzinfo=timezone.utc,
+            ),
+            renewal_date=(
+                date(rng.randint(2021, 2026), rng.randint(1, 12), rng.randint(1, 28))
+                if rng.random() < 0.6 else None
+            ),
+        )
+    db.commit()
+    db.expire_all()
+    return db.query(Expense).all()
+
+
+def _expected(expenses: list[Expense], months: list[date]) -> set[tuple]:
+    """Regra original em Python: despesas ativas × meses em que should_create_validation_for_month."""
+    return {
+        (expense.id, month)
+        for expense in expenses
+        if expense.status == ExpenseStatus.ACTIVE
+        for month in months
+        if evs.should_create_validation_for_month(expense, month)
+    }
+
+
+def test_backfill_range_matches_python_rule(db, random_expenses):
+    first, last = date(2024, 1, 1), date(2025, 12, 1)
+    created = evs.create_monthly_validations(db, first, last)
+
+    expected = _expected(random_expenses, _months(first, last))
+    assert expected  # Conjunto de teste cobre casos positivos
+    assert {(v.expense_id, v.validation_month) for v in created} == expected
+    assert all(v.status == ValidationStatus.PENDING and v.validator_id is None for v in created)
+
+    # Reexecutar (ou um mês já coberto) não cria nada
+    assert evs.create_monthly_validations(db, first, last) == []
+    assert evs.create_monthly_validations(db, date(2025, 6, 1)) == []
+
+
+@pytest.mark.parametrize("month", [date(2024, 2, 1), date(2025, 7, 1), date(2026, 1, 1)])
+def test_single_month_matches_python_rule(db, random_expenses, month):
+    created = evs.create_monthly_validations(db, month)
+    assert {(v.expense_id, v.validation_month) for v in created} == _expected(random_expenses, [month])
+
+
+def test_backfill_skips_existing_validations(db, random_expenses):
+    """Meses com validação já existente (ex.: do mês de criação) são pulados pelo ON CONFLICT."""
+    first, last = date(2025, 1, 1), date(2025, 6, 1)
+    expected = _expected(random_expenses, _months(first, last))
+    existing = sorted(expected)[:20]
+    db.add_all(
+        ExpenseValidation(expense_id=expense_id, validation_month=month, status=ValidationStatus.APPROVED, is_overdue=False)
+        for expense_id, month in existing
+    )
+    db.commit()
+
+    created = evs.create_monthly_validations(db, first, last)
+    assert {(v.expense_id, v.validation_month) for v in created} == expected - set(existing)
+
+
+def test_end_month_before_month_is_rejected(db):
+    with pytest.raises(ValueError):
+        evs.create_monthly_validations(db, date(2026, 1, 1), date(2025, 12, 1))
+
+
+def test_predicted_matches_python_rule_minus_existing(db, random_expenses):
+    """get_predicted_validations == regra em Python menos os meses que já têm validação."""
+    first, last = date(2025, 1, 1), date(2025, 12, 1)
+    expected = _expected(random_expenses, _months(first, last))
+    existing = sorted(expected)[::7]
+    db.add_all(
+        ExpenseValidation(expense_id=expense_id, validation_month=month, status=ValidationStatus.PENDING, is_overdue=False)
+        for expense_id, month in existing
+    )
+    db.commit()
+
+    predicted = evs.get_predicted_validations(db, first, last)
+    pairs = [(item["expense"].id, item["validation_month"]) for item in predicted]
+    assert len(pairs) == len(set(pairs))
+    assert set(pairs) == expected - set(existing)
+    assert [month for _, month in pairs] == sorted(month for _, month in pairs)
+
+    single = evs.get_predicted_validations(db, date(2025, 6, 1))
+    assert {(item["expense"].id, item["validation_month"]) for item in single} == \
+        _expected(random_expenses, [date(2025, 6, 1)]) - set(existing)
+
+
+def test_predicted_by_month_groups_every_month(db, seed, random_expenses, client):
+    """GET /predicted/by-month: um grupo por mês (inclusive vazios), com count e total das previstas."""
+    today = date.today()
+    first = date(today.year + today.month // 12, today.month % 12 + 1, 1)
+    months = _months(first, date(first.year + 1, first.month, 1))[:12]
+    expected = _expected(random_expenses, months)
+    assert expected
+    value_by_id = {expense.id: expense.value_brl for expense in random_expenses}
+
+    response = client.get(
+        "/api/v1/expense-validations/predicted/by-month",
+        params={"from_month": months[0].isoformat(), "to_month": months[-1].isoformat()},
+        headers=auth_headers(seed["admin"]),
+    )
+    assert response.status_code == 200, response.text
+    groups = response.json()
+    assert [group["month"] for group in groups] == [month.isoformat() for month in months]
+    for group, month in zip(groups, months):
+        ids = {(v["expense_id"], month) for v in group["validations"]}
+        month_expected = {(str(expense_id), m) for expense_id, m in expected if m == month}
+        assert ids == month_expected
+        assert group["count"] == len(month_expected)
+        assert Decimal(str(group["total_value_brl"])) == sum(
+            (value_by_id[uuid.UUID(expense_id)] for expense_id, _ in month_expected), Decimal("0")
+        )
+
+    too_long = client.get(
+        "/api/v1/expense-validations/predicted/by-month",
+        params={"from_month": months[0].isoformat(), "to_month": date(first.year + 2, first.month, 1).isoformat()},
+        headers=auth_headers(seed["admin"]),
+    )
+    assert too_long.status_code == 400
@@ -0,0 +1,98 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.models import Expense, ExpenseStatus, ExpenseType, Periodicity
+from app.services import expense_validation_service as evs
+
+
+def _advance_loop(renewal_date: date, periodicity: Periodicity, today: date) -> date:
+    """Regra original: avança ciclo a ciclo até a data não estar mais no passado."""
+    expense = Expense(renewal_date=renewal_date, periodicity=periodicity)
+    while expense.renewal_date < today:
+        evs._advance_expense_renewal_date_once(expense)
+    return expense.renewal_date
+
+
+def _freeze_today(monkeypatch, today: date) -> None:
+    class FrozenDate(date):
+        @classmethod
+        def today(cls):
+            return today
+
+    monkeypatch.setattr(evs, "date", FrozenDate)
+
+
+def _random_date(rng: random.Random) -> date:
+    # Metade nos últimos dias do mês (29, 30, 31) para exercitar o limite ao fim do mês
+    year, month = rng.randint(2015, 2027), rng.randint(1, 12)
+    last_day = evs._last_day_of_month(year, month)
+    day = rng.randint(last_day - 3, last_day) if rng.random() < 0.5 else rng.randint(1, last_day)
+    return date(year, month, day)
+
+
+TODAYS = [
+    date(2026, 10, 17),
+    date(2024, 2, 29),   # Bissexto
+    date(2025, 2, 28),
+    date(2025, 3, 1),
+    date(2025, 1, 31),
+    date(2025, 12, 31),
+    date(2026, 1, 1),
+]
+# Mais alguns dias quaisquer entre 2020 e 2029
+TODAYS += [date(2020, 1, 1) + timedelta(days=d) for d in random.Random(20).sample(range(3650), 5)]
+
+
+@pytest.mark.parametrize("today", TODAYS)
+def test_closed_form_update_matches_cycle_by_cycle_loop(db, make_expense, monkeypatch, today):
+    rng = random.Random(today.toordinal())
+    periodicities = list(Periodicity)
+    expenses = [
+        make_expense(
+            service_name=f"Serviço {i}",
+            periodicity=periodicities[i % len(periodicities)],
+            renewal_date=_random_date(rng),
+        )
+        for i in range(200)
+    ]
+    # Fim de janeiro em todas as periodicidades (31/01 -> 28 ou 29/02 e o dia limitado depois)
+    expenses += [
+        make_expense(service_name=f"Janeiro {p.value} {year}", periodicity=p, renewal_date=date(year, 1, 31))
+        for p in periodicities
+        for year in (2019, 2020, 2023, 2024)
+    ]
+    db.commit()
+    original = {e.id: (e.renewal_date, e.periodicity) for e in expenses}
+
+    _freeze_today(monkeypatch, today)
+    updated = evs.advance_renewal_dates(db)
+
+    db.expire_all()
+    mismatches = []
+    for expense in db.query(Expense).filter(Expense.id.in_(original)):
+        renewal_date, periodicity = original[expense.id]
+        expected = _advance_loop(renewal_date, periodicity, today)
+        if expense.renewal_date != expected:
+            mismatches.append((periodicity.value, renewal_date, expected, expense.renewal_date))
+    assert not mismatches, mismatches[:10]
+    assert updated == sum(1 for renewal_date, _ in original.values() if renewal_date < today)
+
+
+def test_only_active_recurring_expenses_are_advanced(db, make_expense, monkeypatch):
+    _freeze_today(monkeypatch, date(2026, 1, 15))
+    past = date(2025, 1, 31)
+    skipped = [
+        make_expense(renewal_date=past, status=ExpenseStatus.CANCELLED),
+        make_expense(renewal_date=past, expense_type=ExpenseType.ONE_TIME),
+        make_expense(renewal_date=past, periodicity=None),
+    ]
+    advanced = make_expense(renewal_date=past, periodicity=Periodicity.MONTHLY)
+    db.commit()
+
+    assert evs.advance_renewal_dates(db) == 1
+    db.expire_all()
+    assert all(db.get(Expense, e.id).renewal_date == past for e in skipped)
+    # 31/01 -> 28/02 limita o dia nos ciclos seguintes
+    assert db.get(Expense, advanced.id).renewal_date == date(2026, 1, 28)
@@ -0,0 +1,246 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models import (
+    Expense,
+    ExpenseMonthlyRollup,
+    ExpenseStatus,
+    ExpenseValidation,
+    Periodicity,
+    User,
+    UserRole,
+    ValidationStatus,
+)
+from app.services import expense_validation_service as evs
+from app.services import rollup_service
+from tests.conftest import auth_headers
+
+CONTENDERS = 6
+
+
+def _rollup(db) -> list[tuple]:
+    rows = db.execute(select(
+        ExpenseMonthlyRollup.month,
+        ExpenseMonthlyRollup.company_id,
+        ExpenseMonthlyRollup.department_id,
+        ExpenseMonthlyRollup.category_id,
+        ExpenseMonthlyRollup.status,
+        ExpenseMonthlyRollup.expense_type,
+        ExpenseMonthlyRollup.total_value_brl,
+        ExpenseMonthlyRollup.expense_count,
+    ).where(
+        (ExpenseMonthlyRollup.expense_count != 0) | (ExpenseMonthlyRollup.total_value_brl != 0)
+    )).all()
+    return sorted(tuple(row) for row in rows)
+
+
+def _decide(action: str, validation_id, admin_id, barrier: threading.Barrier) -> str:
+    """Uma decisão em sessão própria; retorna "ok" ou a mensagem de erro."""
+    session = SessionLocal()
+    try:
+        barrier.wait()
+        if action == "approve":
+            evs.approve(session, validation_id, admin_id)
+        elif action == "reject":
+            evs.reject(session, validation_id, admin_id, True)
+        else:
+            user = session.get(User, admin_id)
+            approve_ids, reject_ids = ([validation_id], []) if action == "bulk_approve" else ([], [validation_id])
+            [result] = evs.bulk_decide(session, approve_ids, reject_ids, user, True)
+            return "ok" if result["success"] else result["error"]
+        return "ok"
+    except ValueError as e:
+        return str(e)
+    finally:
+        session.close()
+
+
+def test_concurrent_approve_and_reject_have_one_winner(db, seed, make_expense):
+    """
+    Aprovações e rejeições simultâneas (individuais e em lote) da mesma validação:
+    exatamente uma vence, a renewal_date avança uma vez e o cancelamento entra no rollup uma vez.
+    """
+    periodicities = list(Periodicity)
+    validations = []
+    for i in range(24):
+        expense = make_expense(
+            service_name=f"Serviço {i}",
+            periodicity=periodicities[i % len(periodicities)],
+            renewal_date=date(2025, 1, 31),
+        )
+        validation = ExpenseValidation(
+            expense_id=expense.id, validation_month=date(2025, 1, 1), status=ValidationStatus.PENDING, is_overdue=False,
+        )
+        db.add(validation)
+        validations.append((validation, expense))
+    db.flush()
+    rollup_service.rebuild(db)
+    db.commit()
+
+    expected_renewal = {}
+    for _, expense in validations:
+        advanced = Expense(renewal_date=expense.renewal_date, periodicity=expense.periodicity)
+        evs._advance_expense_renewal_date_once(advanced)
+        expected_renewal[expense.id] = advanced.renewal_date
+
+    actions = ["approve", "reject", "bulk_approve", "bulk_reject"]
+    admin_id = seed["admin"].id
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=CONTENDERS) as executor:
+        for n, (validation, _) in enumerate(validations):
+            barrier = threading.Barrier(CONTENDERS)
+            # Ação de quem sai na frente muda a cada validação: os dois desfechos ocorrem
+            futures = [
+                executor.submit(_decide, actions[(n + i) % len(actions)], validation.id, admin_id, barrier)
+                for i in range(CONTENDERS)
+            ]
+            outcomes[validation.id] = [future.result() for future in futures]
+
+    db.expire_all()
+    statuses = set()
+    for validation, expense in validations:
+        results = outcomes[validation.id]
+        assert results.count("ok") == 1, results
+        assert set(results) - {"ok"} <= {"Esta validação já foi processada"}, results
+
+        validation = db.get(ExpenseValidation, validation.id)
+        expense = db.get(Expense, expense.id)
+        statuses.add(validation.status)
+        if validation.status == ValidationStatus.APPROVED:
+            assert expense.status == ExpenseStatus.ACTIVE
+            assert expense.renewal_date == expected_renewal[expense.id]
+        else:
+            assert validation.status == ValidationStatus.REJECTED
+            assert expense.status == ExpenseStatus.CANCELLED
+            assert expense.cancellation_month == date(2025, 1, 1)
+            assert expense.renewal_date == date(2025, 1, 31)
+
+    # Os dois desfechos ocorreram, e o rollup incremental bate com a reconstrução a partir de expenses
+    assert statuses == {ValidationStatus.APPROVED, ValidationStatus.REJECTED}
+    incremental = _rollup(db)
+    rollup_service.rebuild(db)
+    db.commit()
+    assert incremental == _rollup(db)
+
+
+def _advanced(expense: Expense, times: int):
+    advanced = Expense(renewal_date=expense.renewal_date, periodicity=expense.periodicity)
+    for _ in range(times):
+        evs._advance_expense_renewal_date_once(advanced)
+    return advanced.renewal_date
+
+
+def _pending(db, expense: Expense, month: date) -> ExpenseValidation:
+    validation = ExpenseValidation(
+        expense_id=expense.id, validation_month=month, status=ValidationStatus.PENDING, is_overdue=False,
+    )
+    db.add(validation)
+    return validation
+
+
+def test_bulk_approve_uses_current_expense_state(db, seed, make_expense):
+    """
+    A despesa já carregada na sessão fica desatualizada quando outra requisição aprova
+    outra validação dela: o lote relê a despesa travada e os dois avanços valem.
+    """
+    expense = make_expense(periodicity=Periodicity.MONTHLY, renewal_date=date(2025, 1, 31))
+    first = _pending(db, expense, date(2025, 1, 1))
+    second = _pending(db, expense, date(2025, 2, 1))
+    db.commit()
+    expected = _advanced(expense, 2)
+    assert expense.renewal_date == date(2025, 1, 31)  # Carregada nesta sessão
+
+    other = SessionLocal()
+    try:
+        evs.approve(other, second.id, seed["admin"].id)
+    finally:
+        other.close()
+
+    [result] = evs.bulk_decide(db, [first.id], [], seed["admin"])
+    assert result["success"]
+    db.expire_all()
+    assert db.get(Expense, expense.id).renewal_date == expected
+
+
+def test_concurrent_bulk_and_single_approve_of_same_expense_both_advance(db, seed, make_expense):
+    """approve() e bulk_decide() simultâneos de validações diferentes da mesma despesa: a data avança duas vezes."""
+    periodicities = list(Periodicity)
+    pairs = []
+    for i in range(24):
+        expense = make_expense(
+            service_name=f"Serviço {i}",
+            periodicity=periodicities[i % len(periodicities)],
+            renewal_date=date(2025, 1, 31),
+        )
+        pairs.append((_pending(db, expense, date(2025, 1, 1)), _pending(db, expense, date(2025, 2, 1)), expense))
+    db.commit()
+    expected = {expense.id: _advanced(expense, 2) for _, _, expense in pairs}
+
+    admin_id = seed["admin"].id
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for first, second, _ in pairs:
+            barrier = threading.Barrier(2)
+            futures = [
+                executor.submit(_decide, "bulk_approve", first.id, admin_id, barrier),
+                executor.submit(_decide, "approve", second.id, admin_id, barrier),
+            ]
+            assert [future.result() for future in futures] == ["ok", "ok"]
+
+    db.expire_all()
+    for _, _, expense in pairs:
+        assert db.get(Expense, expense.id).renewal_date == expected[expense.id]
+
+
+def test_bulk_endpoint_reports_outcome_per_id(db, seed, make_expense, client):
+    """POST /expense-validations/bulk: resultado por id e limite de ids por requisição."""
+    leader = User(name="Líder", email="leader@example.com", password_hash="x", role=UserRole.LEADER)
+    leader.companies.append(seed["company"])
+    db.add(leader)
+    db.flush()
+
+    own = [make_expense(service_name=f"Própria {i}", owner_id=leader.id) for i in range(4)]
+    foreign = make_expense(service_name="De outro responsável")
+    approved, rejected, both, repeated = (_pending(db, expense, date(2025, 1, 1)) for expense in own)
+    forbidden = _pending(db, foreign, date(2025, 1, 1))
+    processed = ExpenseValidation(
+        expense_id=own[0].id, validation_month=date(2024, 12, 1), status=ValidationStatus.APPROVED, is_overdue=False,
+    )
+    db.add(processed)
+    db.commit()
+    missing = "00000000-0000-0000-0000-000000000000"
+
+    body = {
+        "approve": [str(approved.id), str(both.id), str(repeated.id), str(repeated.id), str(forbidden.id),
+                    str(processed.id), missing],
+        "reject": [str(rejected.id), str(both.id)],
+        "charged_this_month": True,
+    }
+    response = client.post("/api/v1/expense-validations/bulk", json=body, headers=auth_headers(leader))
+    assert response.status_code == 200, response.text
+    report = response.json()
+    outcomes = [(r["id"], r["action"], r["success"], r["status"], r["error"]) for r in report["results"]]
+    assert outcomes == [
+        (str(approved.id), "approve", True, "approved", None),
+        (str(both.id), "approve", False, None, "Validação informada para aprovar e rejeitar"),
+        (str(repeated.id), "approve", True, "approved", None),
+        (str(repeated.id), "approve", False, None, "Validação repetida na requisição"),
+        (str(forbidden.id), "approve", False, None, "Você não tem permissão para aprovar esta validação"),
+        (str(processed.id), "approve", False, "approved", "Esta validação já foi processada"),
+        (missing, "approve", False, None, "Validação não encontrada"),
+        (str(rejected.id), "reject", True, "rejected", None),
+        (str(both.id), "reject", False, None, "Validação informada para aprovar e rejeitar"),
+    ]
+    assert (report["approved"], report["rejected"], report["failed"]) == (2, 1, 6)
+
+    db.expire_all()
+    assert db.get(ExpenseValidation, both.id).status == ValidationStatus.PENDING
+    assert db.get(ExpenseValidation, forbidden.id).status == ValidationStatus.PENDING
+    assert db.get(Expense, own[1].id).status == ExpenseStatus.CANCELLED
+
+    too_many = {"approve": [missing] * 300, "reject": [missing] * 201}
+    response = client.post("/api/v1/expense-validations/bulk", json=too_many, headers=auth_headers(leader))
+    assert response.status_code == 400
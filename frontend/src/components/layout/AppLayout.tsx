@@ -2,8 +2,11 @@ import { Outlet } from 'react-router-dom';
 import { AppSidebar } from './AppSidebar';
 import { AppHeader } from './AppHeader';
 import { Footer } from './Footer';
+import { useAlertStream } from '@/hooks/use-alert-stream';
 
 export function AppLayout() {
+  useAlertStream();
+
   return (
     <div className="min-h-screen flex flex-col w-full bg-background">
       <div className="flex flex-1">
@@ -0,0 +1,71 @@
+import { useEffect } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
+import { API_BASE, USE_MOCK } from '@/lib/api-client';
+import { useAuth } from '@/contexts/AuthContext';
+import { alertsApi } from '@/services/api';
+
+const RECONNECT_DELAY_MS = 5000;
+
+/**
+ * Mantém os alertas atualizados via GET /alerts/stream (Server-Sent Events),
+ * sem polling em /alerts/me: cada evento invalida as queries de alertas.
+ * Cada conexão usa um token curto de /alerts/stream-token (o token de acesso não vai na URL).
+ * O servidor fecha o stream quando a sessão expira: a reconexão pede um token novo e
+ * envia o último id recebido para repetir eventos perdidos. Reabre ao trocar de usuário.
+ */
+export function useAlertStream() {
+  const queryClient = useQueryClient();
+  const { user } = useAuth();
+  const userId = user?.id;
+
+  useEffect(() => {
+    if (USE_MOCK || !userId || typeof EventSource === 'undefined') return;
+
+    let source: EventSource | null = null;
+    let reconnectTimer: ReturnType<typeof setTimeout> | undefined;
+    let lastEventId = '';
+    let closed = false;
+
+    const refresh = (event: MessageEvent) => {
+      if (event.lastEventId) lastEventId = event.lastEventId;
+      queryClient.invalidateQueries({ queryKey: ['alerts'] });
+      queryClient.invalidateQueries({ queryKey: ['recent-alerts'] });
+    };
+
+    const scheduleReconnect = () => {
+      if (!closed) reconnectTimer = setTimeout(connect, RECONNECT_DELAY_MS);
+    };
+
+    async function connect() {
+      let token: string;
+      try {
+        ({ token } = await alertsApi.getStreamToken());
+      } catch {
+        scheduleReconnect();
+        return;
+      }
+      if (closed) return;
+
+      const params = new URLSearchParams({ token });
+      if (lastEventId) params.append('last_event_id', lastEventId);
+      source = new EventSource(`${API_BASE}/alerts/stream?${params.toString()}`);
+      source.addEventListener('alert', refresh);
+      source.addEventListener('read', refresh);
+      source.addEventListener('resync', refresh);
+      // Stream fechado (sessão expirada, usuário desativado, rede): o token usado já não
+      // serve para reconectar, então a reconexão automática do EventSource é substituída
+      source.onerror = () => {
+        source?.close();
+        source = null;
+        scheduleReconnect();
+      };
+    }
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(reconnectTimer);
+      source?.close();
+    };
+  }, [queryClient, userId]);
+}
@@ -38,5 +38,5 @@ apiClient.interceptors.response.use(
   }
 );
 
-export { USE_MOCK };
+export { API_BASE, USE_MOCK };
 export default apiClient;
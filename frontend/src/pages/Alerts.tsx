@@ -37,10 +37,24 @@ export default function AlertsPage() {
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['alerts'] });
       queryClient.invalidateQueries({ queryKey: ['dashboard-stats'] });
+      queryClient.invalidateQueries({ queryKey: ['dashboard-overview'] });
       toast({ title: 'Alerta marcado como lido' });
     },
   });
 
+  const markAllAsReadMutation = useMutation({
+    mutationFn: alertsApi.markAllAsRead,
+    onSuccess: ({ updated }) => {
+      queryClient.invalidateQueries({ queryKey: ['alerts'] });
+      queryClient.invalidateQueries({ queryKey: ['recent-alerts'] });
+      queryClient.invalidateQueries({ queryKey: ['dashboard-stats'] });
+      queryClient.invalidateQueries({ queryKey: ['dashboard-overview'] });
+      toast({
+        title: updated > 0 ? `${updated} alerta(s) marcado(s) como lido(s)` : 'Nenhum alerta não lido',
+      });
+    },
+  });
+
   const handleMarkAsRead = (id: string) => {
     markAsReadMutation.mutate(id);
   };
@@ -71,19 +85,34 @@ export default function AlertsPage() {
           </p>
         </div>
 
-        <Select
-          value={statusFilter ?? 'all'}
-          onValueChange={(v) => setStatusFilter(v as AlertStatus | 'all')}
-        >
-          <SelectTrigger className="w-[180px]">
-            <SelectValue placeholder="Status" />
-          </SelectTrigger>
-          <SelectContent>
-            <SelectItem value="all">Todos</SelectItem>
-            <SelectItem value="pending">Pendentes</SelectItem>
-            <SelectItem value="read">Lidos</SelectItem>
-          </SelectContent>
-        </Select>
+        <div className="flex items-center gap-2">
+          <Button
+            variant="outline"
+            onClick={() => markAllAsReadMutation.mutate()}
+            disabled={markAllAsReadMutation.isPending}
+          >
+            {markAllAsReadMutation.isPending ? (
+              <Loader2 className="h-4 w-4 mr-2 animate-spin" />
+            ) : (
+              <CheckCircle className="h-4 w-4 mr-2" />
+            )}
+            Marcar todos como lidos
+          </Button>
+
+          <Select
+            value={statusFilter ?? 'all'}
+            onValueChange={(v) => setStatusFilter(v as AlertStatus | 'all')}
+          >
+            <SelectTrigger className="w-[180px]">
+              <SelectValue placeholder="Status" />
+            </SelectTrigger>
+            <SelectContent>
+              <SelectItem value="all">Todos</SelectItem>
+              <SelectItem value="pending">Pendentes</SelectItem>
+              <SelectItem value="read">Lidos</SelectItem>
+            </SelectContent>
+          </Select>
+        </div>
       </div>
 
       {/* Content */}
@@ -109,35 +109,23 @@ export default function DashboardPage() {
 
   const monthOptions = getMonthOptions();
 
-  const { data: stats, isLoading: statsLoading } = useQuery({
-    queryKey: ['dashboard-stats', filters],
-    queryFn: () => dashboardApi.getStats(filters),
-  });
-
-  const { data: expensesByCategory, isLoading: categoryLoading } = useQuery({
-    queryKey: ['expenses-by-category', filters],
-    queryFn: () => dashboardApi.getExpensesByCategory(filters, 10),
-  });
-
-  const { data: expensesByCompany, isLoading: companyLoading } = useQuery({
-    queryKey: ['expenses-by-company', filters],
-    queryFn: () => dashboardApi.getExpensesByCompany(filters, 10),
-  });
-
-  const { data: expensesByDepartment, isLoading: departmentLoading } = useQuery({
-    queryKey: ['expenses-by-department', filters],
-    queryFn: () => dashboardApi.getExpensesByDepartment(filters, 10),
-  });
-
-  const { data: timelineData, isLoading: timelineLoading } = useQuery({
-    queryKey: ['expenses-timeline', filters],
-    queryFn: () => dashboardApi.getExpensesTimeline(filters, 6),
-  });
-
-  const { data: topExpenses, isLoading: topExpensesLoading } = useQuery({
-    queryKey: ['top-expenses', filters],
-    queryFn: () => dashboardApi.getTopExpenses(filters, 10),
+  // Todos os widgets agregados em uma única requisição
+  const { data: overview, isLoading: overviewLoading } = useQuery({
+    queryKey: ['dashboard-overview', filters],
+    queryFn: () => dashboardApi.getOverview(filters, 10, 6),
   });
+  const stats = overview?.stats;
+  const expensesByCategory = overview?.by_category;
+  const expensesByCompany = overview?.by_company;
+  const expensesByDepartment = overview?.by_department;
+  const timelineData = overview?.timeline;
+  const topExpenses = overview?.top_expenses;
+  const statsLoading = overviewLoading;
+  const categoryLoading = overviewLoading;
+  const companyLoading = overviewLoading;
+  const departmentLoading = overviewLoading;
+  const timelineLoading = overviewLoading;
+  const topExpensesLoading = overviewLoading;
 
   const { data: recentExpenses, isLoading: expensesLoading } = useQuery({
     queryKey: ['recent-expenses', filters],
@@ -1,5 +1,5 @@
-import { useState, useMemo, useEffect } from 'react';
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useState, useEffect } from 'react';
+import { useQuery, useMutation, useQueryClient, keepPreviousData } from '@tanstack/react-query';
 import { Plus, Search, Filter, MoreHorizontal, Eye, Pencil, XCircle, Loader2 } from 'lucide-react';
 import { expensesApi, companiesApi, usersApi, categoriesApi } from '@/services/api';
 import { useAuth } from '@/contexts/AuthContext';
@@ -51,9 +51,7 @@ import {
 import {
   Pagination,
   PaginationContent,
-  PaginationEllipsis,
   PaginationItem,
-  PaginationLink,
   PaginationNext,
   PaginationPrevious,
 } from '@/components/ui/pagination';
@@ -74,58 +72,36 @@ const expenseTypeOptions: { value: ExpenseType; label: string }[] = [
 
 const PAGE_SIZE = 10;
 
-function getPageNumbers(total: number, current: number): (number | 'ellipsis')[] {
-  if (total <= 1) return [];
-  const show = new Set<number>([1, total]);
-  for (let d = -2; d <= 2; d++) {
-    const p = current + d;
-    if (p >= 1 && p <= total) show.add(p);
-  }
-  const sorted = Array.from(show).sort((a, b) => a - b);
-  const result: (number | 'ellipsis')[] = [];
-  for (let i = 0; i < sorted.length; i++) {
-    if (i > 0 && sorted[i] - sorted[i - 1] > 1) result.push('ellipsis');
-    result.push(sorted[i]);
-  }
-  return result;
-}
-
 export default function ExpensesPage() {
   const { isAdmin, isLeader, user } = useAuth();
   const { toast } = useToast();
   const queryClient = useQueryClient();
   
   const [filters, setFilters] = useState<ExpenseFilters>({});
-  const [currentPage, setCurrentPage] = useState(1);
+  // Cursores das páginas visitadas: cursors[i] abre a página i + 1 (null = primeira)
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
   const [isFormOpen, setIsFormOpen] = useState(false);
   const [editingExpense, setEditingExpense] = useState<Expense | null>(null);
   const [viewingExpense, setViewingExpense] = useState<Expense | null>(null);
   const [showPassword, setShowPassword] = useState(false);
   const [cancelExpense, setCancelExpense] = useState<Expense | null>(null);
 
-  const { data: expenses, isLoading } = useQuery({
-    queryKey: ['expenses', filters],
-    queryFn: () => expensesApi.getAll(filters),
+  const currentPage = cursors.length;
+  const cursor = cursors[cursors.length - 1];
+
+  const { data: page, isLoading, isFetching } = useQuery({
+    queryKey: ['expenses', filters, cursor],
+    queryFn: () => expensesApi.getPage(filters, cursor, PAGE_SIZE),
+    placeholderData: keepPreviousData,
   });
 
-  const sortedExpenses = useMemo(() => {
-    if (!expenses?.length) return expenses ?? [];
-    return [...expenses].sort(
-      (a, b) => new Date(b.created_at).getTime() - new Date(a.created_at).getTime()
-    );
-  }, [expenses]);
+  const expenses = page?.items ?? [];
+  const nextCursor = page?.next_cursor ?? null;
 
   useEffect(() => {
-    setCurrentPage(1);
+    setCursors([null]);
   }, [filters]);
 
-  const totalPages = Math.ceil((sortedExpenses?.length ?? 0) / PAGE_SIZE);
-
-  const paginatedExpenses = useMemo(() => {
-    const start = (currentPage - 1) * PAGE_SIZE;
-    return sortedExpenses?.slice(start, start + PAGE_SIZE) ?? [];
-  }, [sortedExpenses, currentPage]);
-
   const { data: companies } = useQuery({
     queryKey: ['companies'],
     queryFn: companiesApi.getAll,
@@ -158,6 +134,7 @@ export default function ExpensesPage() {
       queryClient.invalidateQueries({ queryKey: ['validations-pending'], exact: false });
       queryClient.invalidateQueries({ queryKey: ['validations-predicted'], exact: false });
       queryClient.invalidateQueries({ queryKey: ['dashboard-stats'], exact: false });
+      queryClient.invalidateQueries({ queryKey: ['dashboard-overview'], exact: false });
       queryClient.invalidateQueries({ queryKey: ['dashboard'], exact: false });
       toast({
         title: 'Despesa cancelada',
@@ -205,6 +182,7 @@ export default function ExpensesPage() {
     queryClient.invalidateQueries({ queryKey: ['validations-pending'], exact: false });
     queryClient.invalidateQueries({ queryKey: ['validations-predicted'], exact: false });
     queryClient.invalidateQueries({ queryKey: ['dashboard-stats'], exact: false });
+    queryClient.invalidateQueries({ queryKey: ['dashboard-overview'], exact: false });
     queryClient.invalidateQueries({ queryKey: ['dashboard'], exact: false });
     toast({
       title: editingExpense ? 'Despesa atualizada!' : 'Despesa criada!',
@@ -309,7 +287,7 @@ export default function ExpensesPage() {
                 <Skeleton key={i} className="h-16 w-full" />
               ))}
             </div>
-          ) : sortedExpenses?.length === 0 ? (
+          ) : expenses.length === 0 ? (
             <div className="p-12 text-center">
               <div className="mx-auto w-12 h-12 rounded-full bg-muted flex items-center justify-center mb-4">
                 <Search className="h-6 w-6 text-muted-foreground" />
@@ -343,7 +321,7 @@ export default function ExpensesPage() {
                 </TableRow>
               </TableHeader>
               <TableBody>
-                {paginatedExpenses.map((expense) => (
+                {expenses.map((expense) => (
                   <TableRow 
                     key={expense.id} 
                     className={`hover:bg-muted/50 transition-colors ${
@@ -471,12 +449,11 @@ export default function ExpensesPage() {
         </CardContent>
       </Card>
 
-      {totalPages > 1 && (
+      {(currentPage > 1 || nextCursor) && (
         <div className="flex items-center justify-between mt-4">
           <p className="text-sm text-muted-foreground">
-            Exibindo {Math.min((currentPage - 1) * PAGE_SIZE + 1, sortedExpenses?.length ?? 0)}–
-            {Math.min(currentPage * PAGE_SIZE, sortedExpenses?.length ?? 0)} de{' '}
-            {sortedExpenses?.length ?? 0} registros
+            Página {currentPage}
+            {isFetching && <Loader2 className="inline h-3 w-3 ml-2 animate-spin" />}
           </p>
           <Pagination className="w-auto mx-0">
             <PaginationContent>
@@ -485,41 +462,21 @@ export default function ExpensesPage() {
                   href="#"
                   onClick={(e) => {
                     e.preventDefault();
-                    setCurrentPage((p) => Math.max(1, p - 1));
+                    setCursors((c) => (c.length > 1 ? c.slice(0, -1) : c));
                   }}
                   aria-disabled={currentPage === 1}
                   className={currentPage === 1 ? 'pointer-events-none opacity-50' : ''}
                 />
               </PaginationItem>
-              {getPageNumbers(totalPages, currentPage).map((item, i) =>
-                item === 'ellipsis' ? (
-                  <PaginationItem key={`ellipsis-${i}`}>
-                    <PaginationEllipsis />
-                  </PaginationItem>
-                ) : (
-                  <PaginationItem key={item}>
-                    <PaginationLink
-                      href="#"
-                      onClick={(e) => {
-                        e.preventDefault();
-                        setCurrentPage(item);
-                      }}
-                      isActive={currentPage === item}
-                    >
-                      {item}
-                    </PaginationLink>
-                  </PaginationItem>
-                )
-              )}
               <PaginationItem>
                 <PaginationNext
                   href="#"
                   onClick={(e) => {
                     e.preventDefault();
-                    setCurrentPage((p) => Math.min(totalPages, p + 1));
+                    if (nextCursor && !isFetching) setCursors((c) => [...c, nextCursor]);
                   }}
-                  aria-disabled={currentPage === totalPages}
-                  className={currentPage === totalPages ? 'pointer-events-none opacity-50' : ''}
+                  aria-disabled={!nextCursor || isFetching}
+                  className={!nextCursor || isFetching ? 'pointer-events-none opacity-50' : ''}
                 />
               </PaginationItem>
             </PaginationContent>
@@ -69,6 +69,26 @@ function getMonthOptions() {
   return options;
 }
 
+// Previsões são buscadas por trimestre (/predicted/by-month): trocar para outro
+// mês do mesmo bloco usa o cache da query, sem nova requisição
+const PREDICTED_BLOCK_MONTHS = 3;
+
+function monthValue(date: Date): string {
+  return `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`;
+}
+
+function getPredictedBlock(selectedMonth: string): { from: string; to: string } {
+  const now = new Date();
+  const [year, month] = selectedMonth.split('-').map(Number);
+  // 0 = próximo mês
+  const offset = (year - now.getFullYear()) * 12 + (month - 1 - now.getMonth()) - 1;
+  const start = offset - (offset % PREDICTED_BLOCK_MONTHS);
+  return {
+    from: monthValue(new Date(now.getFullYear(), now.getMonth() + 1 + start, 1)),
+    to: monthValue(new Date(now.getFullYear(), now.getMonth() + start + PREDICTED_BLOCK_MONTHS, 1)),
+  };
+}
+
 function escapeCsvCell(value: string): string {
   const s = String(value ?? '');
   if (s.includes(';') || s.includes('"')) {
@@ -166,12 +186,14 @@ export default function ValidationsPage() {
     return selected > currentMonthStart;
   })();
 
-  // Query para validações previstas (meses futuros)
-  const { data: predictedValidations, isLoading: isLoadingPredicted } = useQuery({
-    queryKey: ['validations-predicted', selectedMonth],
-    queryFn: () => validationsApi.getPredicted(selectedMonth),
+  // Query para validações previstas (meses futuros): o trimestre do mês selecionado
+  const predictedBlock = isFutureMonth ? getPredictedBlock(selectedMonth) : null;
+  const { data: predictedMonths, isLoading: isLoadingPredicted } = useQuery({
+    queryKey: ['validations-predicted', predictedBlock?.from, predictedBlock?.to],
+    queryFn: () => validationsApi.getPredictedByMonth(predictedBlock!.from, predictedBlock!.to),
     enabled: isFutureMonth, // Só busca se for mês futuro
   });
+  const predictedValidations = predictedMonths?.find((m) => m.month.startsWith(selectedMonth))?.validations;
 
   // Query para histórico completo (meses passados/atuais)
   const { data: historyValidations, isLoading: isLoadingHistory } = useQuery({
@@ -265,6 +287,7 @@ export default function ValidationsPage() {
       queryClient.invalidateQueries({ queryKey: ['validations-predicted'], exact: false });
       queryClient.invalidateQueries({ queryKey: ['expenses'], exact: false });
       queryClient.invalidateQueries({ queryKey: ['dashboard-stats'], exact: false });
+      queryClient.invalidateQueries({ queryKey: ['dashboard-overview'], exact: false });
       queryClient.invalidateQueries({ queryKey: ['dashboard'], exact: false });
       toast({
         title: 'Despesa aprovada!',
@@ -290,6 +313,7 @@ export default function ValidationsPage() {
       queryClient.invalidateQueries({ queryKey: ['validations-predicted'], exact: false });
       queryClient.invalidateQueries({ queryKey: ['expenses'], exact: false });
       queryClient.invalidateQueries({ queryKey: ['dashboard-stats'], exact: false });
+      queryClient.invalidateQueries({ queryKey: ['dashboard-overview'], exact: false });
       queryClient.invalidateQueries({ queryKey: ['dashboard'], exact: false });
       setRejectingId(null);
       setRejectChargedChoice(null);
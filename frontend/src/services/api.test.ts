@@ -49,8 +49,8 @@ describe('API services', () => {
     expect(typeof categoriesApi.delete).toBe('function');
   });
 
-  it('expensesApi expõe CRUD e getAll com filtros', () => {
-    expect(typeof expensesApi.getAll).toBe('function');
+  it('expensesApi expõe CRUD e getPage com filtros e cursor', () => {
+    expect(typeof expensesApi.getPage).toBe('function');
     expect(typeof expensesApi.getById).toBe('function');
     expect(typeof expensesApi.create).toBe('function');
     expect(typeof expensesApi.update).toBe('function');
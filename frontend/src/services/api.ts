@@ -16,15 +16,22 @@ import type {
   Department,
   Category,
   Expense,
+  ExpensePage,
   ExpenseFormData,
   ExpenseUpdatePayload,
   ExpenseValidation,
+  PredictedValidationsMonth,
+  ValidationBulkRequest,
+  ValidationBulkResponse,
   Alert,
   DashboardStats,
   AuthResponse,
   LoginCredentials,
   ExpenseFilters,
   AlertFilters,
+  AlertBulkReadRequest,
+  AlertBulkReadResponse,
+  AlertStreamTokenResponse,
   DashboardFilters,
   CategoryExpenseResponse,
   CompanyExpenseResponse,
@@ -33,6 +40,7 @@ import type {
   TopExpenseResponse,
   StatusDistributionResponse,
   UpcomingRenewalsResponse,
+  DashboardOverview,
 } from '@/types';
 
 // Auth API
@@ -355,40 +363,50 @@ export const categoriesApi = {
   },
 };
 
+function filterMockExpenses(filters?: ExpenseFilters): Expense[] {
+  let expenses = [...mockExpenses];
+  if (filters?.company_ids?.length) {
+    expenses = expenses.filter(e => filters.company_ids!.includes(e.company_id));
+  }
+  if (filters?.department_ids?.length) {
+    expenses = expenses.filter(e => filters.department_ids!.includes(e.department_id));
+  }
+  if (filters?.owner_ids?.length) {
+    expenses = expenses.filter(e => filters.owner_ids!.includes(e.owner_id));
+  }
+  if (filters?.category_ids?.length) {
+    expenses = expenses.filter(e => filters.category_ids!.includes(e.category_id));
+  }
+  if (filters?.status?.length) {
+    expenses = expenses.filter(e => filters.status!.includes(e.status));
+  }
+  if (filters?.expense_type?.length) {
+    expenses = expenses.filter(e => filters.expense_type!.includes(e.expense_type));
+  }
+  if (filters?.service_name) {
+    const term = filters.service_name.toLowerCase();
+    expenses = expenses.filter(e =>
+      e.service_name.toLowerCase().includes(term)
+    );
+  }
+  expenses.sort((a, b) =>
+    new Date(b.created_at ?? 0).getTime() - new Date(a.created_at ?? 0).getTime()
+  );
+  return expenses;
+}
+
 // Expenses API
 export const expensesApi = {
-  getAll: async (filters?: ExpenseFilters): Promise<Expense[]> => {
+  getPage: async (filters?: ExpenseFilters, cursor?: string | null, limit: number = 50): Promise<ExpensePage> => {
     if (USE_MOCK) {
       await delay();
-      let expenses = [...mockExpenses];
-      if (filters?.company_ids?.length) {
-        expenses = expenses.filter(e => filters.company_ids!.includes(e.company_id));
-      }
-      if (filters?.department_ids?.length) {
-        expenses = expenses.filter(e => filters.department_ids!.includes(e.department_id));
-      }
-      if (filters?.owner_ids?.length) {
-        expenses = expenses.filter(e => filters.owner_ids!.includes(e.owner_id));
-      }
-      if (filters?.category_ids?.length) {
-        expenses = expenses.filter(e => filters.category_ids!.includes(e.category_id));
-      }
-      if (filters?.status?.length) {
-        expenses = expenses.filter(e => filters.status!.includes(e.status));
-      }
-      if (filters?.expense_type?.length) {
-        expenses = expenses.filter(e => filters.expense_type!.includes(e.expense_type));
-      }
-      if (filters?.service_name) {
-        const term = filters.service_name.toLowerCase();
-        expenses = expenses.filter(e =>
-          e.service_name.toLowerCase().includes(term)
-        );
-      }
-      expenses.sort((a, b) =>
-        new Date(b.created_at ?? 0).getTime() - new Date(a.created_at ?? 0).getTime()
-      );
-      return expenses;
+      const expenses = filterMockExpenses(filters);
+      const start = cursor ? Number(cursor) : 0;
+      const end = start + limit;
+      return {
+        items: expenses.slice(start, end),
+        next_cursor: end < expenses.length ? String(end) : null,
+      };
     }
     const params = new URLSearchParams();
     filters?.company_ids?.forEach((id) => params.append('company_ids', id));
@@ -398,7 +416,9 @@ export const expensesApi = {
     filters?.status?.forEach((s) => params.append('status', s));
     filters?.expense_type?.forEach((t) => params.append('expense_type', t));
     if (filters?.service_name) params.append('service_name', filters.service_name);
-    const { data } = await apiClient.get<Expense[]>(`/expenses?${params.toString()}`);
+    params.append('limit', limit.toString());
+    if (cursor) params.append('cursor', cursor);
+    const { data } = await apiClient.get<ExpensePage>(`/expenses?${params.toString()}`);
     return data;
   },
 
@@ -520,6 +540,18 @@ export const validationsApi = {
     return data;
   },
 
+  getPredictedByMonth: async (fromMonth: string, toMonth: string): Promise<PredictedValidationsMonth[]> => {
+    if (USE_MOCK) {
+      await delay();
+      return [];
+    }
+    const { data } = await apiClient.get<PredictedValidationsMonth[]>(
+      '/expense-validations/predicted/by-month',
+      { params: { from_month: `${fromMonth}-01`, to_month: `${toMonth}-01` } }
+    );
+    return data;
+  },
+
   approve: async (id: string): Promise<ExpenseValidation> => {
     if (USE_MOCK) {
       await delay();
@@ -557,6 +589,11 @@ export const validationsApi = {
     const { data } = await apiClient.post<ExpenseValidation>(`/expense-validations/${id}/reject`, body ?? { charged_this_month: false });
     return data;
   },
+
+  bulk: async (body: ValidationBulkRequest): Promise<ValidationBulkResponse> => {
+    const { data } = await apiClient.post<ValidationBulkResponse>('/expense-validations/bulk', body);
+    return data;
+  },
 };
 
 // Alerts API
@@ -594,10 +631,62 @@ export const alertsApi = {
     const { data } = await apiClient.post<Alert>(`/alerts/${id}/read`, {});
     return data;
   },
+
+  markAllAsRead: async (): Promise<AlertBulkReadResponse> => {
+    if (USE_MOCK) {
+      await delay();
+      let updated = 0;
+      mockAlerts.forEach((alert, index) => {
+        if (alert.status !== 'read') {
+          mockAlerts[index] = { ...alert, status: 'read', read_at: new Date().toISOString() };
+          updated += 1;
+        }
+      });
+      return { updated };
+    }
+    const { data } = await apiClient.post<AlertBulkReadResponse>('/alerts/read-all', {});
+    return data;
+  },
+
+  bulkRead: async (body: AlertBulkReadRequest): Promise<AlertBulkReadResponse> => {
+    const { data } = await apiClient.post<AlertBulkReadResponse>('/alerts/bulk-read', body);
+    return data;
+  },
+
+  // Token curto para abrir GET /alerts/stream (EventSource não envia o cabeçalho Authorization)
+  getStreamToken: async (): Promise<AlertStreamTokenResponse> => {
+    const { data } = await apiClient.post<AlertStreamTokenResponse>('/alerts/stream-token', {});
+    return data;
+  },
 };
 
 // Dashboard API
 export const dashboardApi = {
+  getOverview: async (filters?: DashboardFilters, limit: number = 10, months: number = 6): Promise<DashboardOverview> => {
+    if (USE_MOCK) {
+      const [stats, by_category, by_company, by_department, timeline, top_expenses, by_status, upcoming_renewals] =
+        await Promise.all([
+          dashboardApi.getStats(filters),
+          dashboardApi.getExpensesByCategory(filters, limit),
+          dashboardApi.getExpensesByCompany(filters, limit),
+          dashboardApi.getExpensesByDepartment(filters, limit),
+          dashboardApi.getExpensesTimeline(filters, months),
+          dashboardApi.getTopExpenses(filters, limit),
+          dashboardApi.getExpensesByStatus(filters),
+          dashboardApi.getUpcomingRenewals(filters, 30, limit),
+        ]);
+      return { stats, by_category, by_company, by_department, timeline, top_expenses, by_status, upcoming_renewals };
+    }
+    const params = new URLSearchParams();
+    if (filters?.company_id) params.append('company_id', filters.company_id);
+    if (filters?.department_id) params.append('department_id', filters.department_id);
+    if (filters?.month) params.append('month', filters.month);
+    params.append('limit', limit.toString());
+    params.append('months', months.toString());
+    const { data } = await apiClient.get<DashboardOverview>(`/dashboard/overview?${params.toString()}`);
+    return data;
+  },
+
   getStats: async (filters?: DashboardFilters): Promise<DashboardStats> => {
     if (USE_MOCK) {
       await delay();
@@ -743,8 +832,8 @@ export const dashboardApi = {
     const expenseFilters: ExpenseFilters = {};
     if (filters?.company_id) expenseFilters.company_ids = [filters.company_id];
     if (filters?.department_id) expenseFilters.department_ids = [filters.department_id];
-    const expenses = await expensesApi.getAll(expenseFilters);
-    return expenses.slice(0, limit);
+    const page = await expensesApi.getPage(expenseFilters, null, limit);
+    return page.items;
   },
 
   getRecentAlerts: async (limit: number = 5): Promise<Alert[]> => {
@@ -152,6 +152,36 @@ export interface ExpenseValidation {
   validator?: User; // Usuário que validou (se validator_id estiver preenchido)
 }
 
+// Validações previstas agrupadas por mês (GET /expense-validations/predicted/by-month)
+export interface PredictedValidationsMonth {
+  month: string; // YYYY-MM-DD (primeiro dia do mês)
+  count: number;
+  total_value_brl: number;
+  validations: ExpenseValidation[];
+}
+
+// Aprovação/rejeição em lote (POST /expense-validations/bulk)
+export interface ValidationBulkRequest {
+  approve: string[];
+  reject: string[];
+  charged_this_month?: boolean; // Vale para todas as rejeitadas
+}
+
+export interface ValidationBulkResult {
+  id: string;
+  action: 'approve' | 'reject';
+  success: boolean;
+  status?: ValidationStatus;
+  error?: string;
+}
+
+export interface ValidationBulkResponse {
+  approved: number;
+  rejected: number;
+  failed: number;
+  results: ValidationBulkResult[];
+}
+
 // Alert Types (backend)
 export type AlertType = 'validation_pending' | 'validation_overdue' | 'renewal_upcoming' | 'renewal_due' | 'expense_cancellation';
 export type AlertStatus = 'pending' | 'sent' | 'failed' | 'read';
@@ -283,6 +313,18 @@ export interface UpcomingRenewalsResponse {
   count: number;
 }
 
+export interface DashboardOverview {
+  stats: DashboardStats;
+  by_category: CategoryExpenseResponse;
+  by_company: CompanyExpenseResponse;
+  by_department: DepartmentExpenseResponse;
+  timeline: TimelineDataResponse;
+  top_expenses: TopExpenseResponse;
+  by_status: StatusDistributionResponse;
+  upcoming_renewals: UpcomingRenewalsResponse;
+  timings_ms?: Record<string, number> | null;
+}
+
 // API Response Types
 export interface PaginatedResponse<T> {
   items: T[];
@@ -303,11 +345,31 @@ export interface ExpenseFilters {
   service_name?: string;
 }
 
+export interface ExpensePage {
+  items: Expense[];
+  next_cursor: string | null;
+}
+
 export interface AlertFilters {
   status?: AlertStatus;
   limit?: number;
 }
 
+export interface AlertBulkReadRequest {
+  ids?: string[];
+  alert_type?: AlertType;
+  status?: AlertStatus;
+}
+
+export interface AlertBulkReadResponse {
+  updated: number;
+}
+
+export interface AlertStreamTokenResponse {
+  token: string;
+  expires_in: number;
+}
+
 export interface DashboardFilters {
   company_id?: string;
   department_id?: string;